@@ -0,0 +1,130 @@
+// Dolly Robot - docs search
+// Searches the parts, assemblies and guide sections from search-index.json,
+// which hardware/cad/search_index.py prebuilds. Every prefix of every word
+// is a key in the index, so a keystroke costs one lookup per query word and
+// an intersection of short posting lists - no scanning of the documents.
+// Words that start mid-word fall back to the index's trigrams.
+
+const SEARCH_INDEX_VERSION = 1;
+
+const DocsSearch = {
+    documents: [],
+    prefixes: new Map(),
+    grams: new Map(),
+    stopwords: new Set(),
+    minPrefix: 2,
+
+    async load(url = 'search-index.json') {
+        const response = await fetch(url);
+        if (!response.ok) throw new Error(`${url}: HTTP ${response.status}`);
+        this.use(await response.json());
+    },
+
+    use(index) {
+        if (index.version !== SEARCH_INDEX_VERSION) {
+            throw new Error('search-index.json is out of date - rerun hardware/cad/search_index.py');
+        }
+        this.documents = index.documents;
+        this.prefixes = new Map(Object.entries(index.prefixes));
+        this.grams = new Map(Object.entries(index.grams));
+        this.stopwords = new Set(index.stopwords);
+        this.minPrefix = index.min_prefix;
+    },
+
+    // Same split as search_index.tokens()
+    tokens(text) {
+        return text.toLowerCase().match(/[a-z]+|\d+(?:\.\d+)?/g) || [];
+    },
+
+    // Doc -> score for one query word, or null while it is too short to tell
+    match(word) {
+        const postings = this.prefixes.get(word);
+        if (postings) {
+            const scores = new Map();
+            for (let i = 0; i < postings.length; i += 2) scores.set(postings[i], postings[i + 1]);
+            return scores;
+        }
+        if (word.length < 3) return word.length < this.minPrefix ? null : new Map();
+
+        // Inside a word: documents having every trigram of it
+        let found = null;
+        for (let i = 0; i + 3 <= word.length; i++) {
+            const ids = this.grams.get(word.slice(i, i + 3));
+            if (!ids) return new Map();
+            found = found === null ? new Set(ids) : new Set(ids.filter(id => found.has(id)));
+        }
+        return new Map([...found].map(id => [id, 1]));
+    },
+
+    // Documents matching every word of the query, best first
+    search(query, limit = 8) {
+        let scores = null;
+        for (const word of this.tokens(query)) {
+            if (this.stopwords.has(word)) continue;
+            const matched = this.match(word);
+            if (matched === null) continue;
+            if (scores === null) {
+                scores = matched;
+                continue;
+            }
+            const both = new Map();
+            for (const [id, score] of scores) {
+                if (matched.has(id)) both.set(id, score + matched.get(id));
+            }
+            scores = both;
+        }
+        if (scores === null) return [];
+        return [...scores]
+            .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+            .slice(0, limit)
+            .map(([id, score]) => ({ ...this.documents[id], score }));
+    },
+
+    escape(text) {
+        return String(text).replace(/[&<>"]/g, c => ({ '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;' })[c]);
+    },
+
+    resultHtml(doc) {
+        const size = doc.size || (doc.dimensions && doc.dimensions.length ? doc.dimensions : null);
+        const meta = [doc.category, doc.section]
+            .concat(size ? [`${size.join(' × ')} mm`] : [])
+            .concat(doc.materials && doc.materials.length ? [doc.materials.join(', ')] : [])
+            .concat(doc.exported && doc.exported.length ? [`exported: ${doc.exported.join(', ')}`] : []);
+        const text = (doc.text || '').split('\n')[0].slice(0, 140);
+        const title = doc.url
+            ? `<a href="${this.escape(doc.url)}" target="_blank">${this.escape(doc.title)}</a>`
+            : this.escape(doc.title);
+        return `<li>${title}<div class="search-meta">${meta.map(m => this.escape(m)).join(' · ')}</div>`
+            + (text ? `<div class="search-text">${this.escape(text)}</div>` : '') + '</li>';
+    },
+
+    // Search as the user types into input, listing results in list
+    attach(input, list) {
+        const show = () => {
+            const query = input.value.trim();
+            if (!query) {
+                list.innerHTML = '';
+                list.hidden = true;
+                return;
+            }
+            const start = performance.now();
+            const results = this.search(query);
+            const elapsed = performance.now() - start;
+            list.innerHTML = results.map(doc => this.resultHtml(doc)).join('')
+                + `<li class="search-stats">${results.length ? results.length : 'No'} results in ${elapsed.toFixed(2)} ms</li>`;
+            list.hidden = false;
+        };
+        this.load().then(show, error => {
+            input.placeholder = 'Search unavailable';
+            input.disabled = true;
+            console.warn('Docs search:', error);
+        });
+        input.addEventListener('input', show);
+        input.addEventListener('keydown', event => {
+            if (event.key === 'Escape') {
+                input.value = '';
+                show();
+            }
+        });
+    }
+};
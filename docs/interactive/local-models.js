@@ -0,0 +1,58 @@
+// Dolly Robot - offline model previews
+// When these pages are served by hardware/cad/model_server.py, the online
+// 3D viewers (3dviewer.net + GitHub) are replaced with the locally exported
+// previews and files, so the docs work without an internet connection.
+
+const LocalModels = {
+    files: null,
+
+    // Resolves to true when the local model server answered
+    async detect() {
+        if (this.files !== null) return this.files.length > 0;
+        try {
+            const response = await fetch('/api/index.json', { cache: 'no-cache' });
+            this.files = response.ok ? (await response.json()).files : [];
+        } catch (error) {
+            this.files = [];  // opened from disk or GitHub Pages
+        }
+        return this.files.length > 0;
+    },
+
+    // Exported files of a part: every format whose name starts with its stem
+    related(stepFile) {
+        const stem = stepFile.split('/').pop().replace(/\.(step|stp)$/i, '');
+        return this.files.filter(f => f.path.split('/').pop().startsWith(stem));
+    },
+
+    viewerHtml(stepFile) {
+        const related = this.related(stepFile);
+        const preview = related.find(f => f.format === 'png' && f.path.endsWith('_iso.png'))
+            || related.find(f => f.format === 'png' && !f.path.includes('_thumb'))
+            || related.find(f => f.format === 'svg');
+        const image = preview
+            ? `<img src="${preview.url}" alt="${stepFile}" style="max-width: 100%; max-height: 100%; object-fit: contain;">`
+            : `<div class="fallback-3d">🤖</div><p style="font-size: 1rem;">No preview exported for ${stepFile} yet</p>`;
+        const links = related
+            .filter(f => !f.path.includes('_thumb'))
+            .map(f => `<a href="${f.url}" class="viewer-link" download>${f.path.split('/').pop()} (${Math.max(1, Math.round(f.size / 1024))} KB)</a>`)
+            .join(' ');
+        return `
+            <div style="display: flex; flex-direction: column; align-items: center; justify-content: center; width: 100%; height: 100%; gap: 0.5rem;">
+                <div style="flex: 1; min-height: 0; display: flex; align-items: center; justify-content: center;">${image}</div>
+                <div style="font-size: 0.85rem;">${links || 'Run the CadQuery scripts to export this part'}</div>
+            </div>
+        `;
+    },
+
+    // Swap every embedded online viewer on the page for a local preview
+    replaceIframes() {
+        document.querySelectorAll('iframe[src*="3dviewer.net"]').forEach(frame => {
+            const match = frame.src.match(/\/hardware\/step\/(.+)$/);
+            if (!match) return;
+            const holder = document.createElement('div');
+            holder.style.cssText = 'width: 100%; height: 100%;';
+            holder.innerHTML = this.viewerHtml(match[1]);
+            frame.replaceWith(holder);
+        });
+    }
+};
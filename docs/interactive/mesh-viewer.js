@@ -0,0 +1,443 @@
+// Dolly Robot - progressive mesh viewer
+// Reads hardware/manifest.json and the memory-mappable mesh store that the
+// exporter writes (hardware/mesh/<part>/header.json + lod<N>.*.npy), and
+// draws it with plain WebGL2 - no 3D library, so it also works offline.
+// The coarsest level of every part is drawn first; finer levels stream in
+// afterwards and replace it. Array data is fetched with Range requests
+// straight from the offsets in each part's header. Under watch mode
+// (hardware/cad/watch_parts.py) rebuilt parts are announced over a
+// WebSocket and swapped into the open viewers.
+
+const MODEL_BASES = [
+    '../../hardware/',
+    'https://raw.githubusercontent.com/MikeyBeez/dolly-robot/master/hardware/'
+];
+
+const PART_COLORS = [
+    [0.62, 0.66, 0.72], [0.20, 0.55, 0.80], [0.85, 0.55, 0.20],
+    [0.35, 0.70, 0.45], [0.75, 0.35, 0.40], [0.55, 0.45, 0.75]
+];
+
+class MeshLoader {
+    constructor() {
+        this.base = null;
+        this.manifest = null;
+        this.headers = new Map();
+        this.levels = new Map();
+        // Part -> version of its files, after watch mode rebuilt it
+        this.versions = new Map();
+    }
+
+    // The export manifest from the first location that has one, or null
+    async open() {
+        for (const base of MODEL_BASES) {
+            try {
+                const response = await fetch(base + 'manifest.json', { cache: 'no-cache' });
+                if (!response.ok) continue;
+                this.manifest = await response.json();
+                this.base = base;
+                return this.manifest;
+            } catch (error) {
+                // not served from here (file://, offline, or missing)
+            }
+        }
+        return null;
+    }
+
+    url(path, version) {
+        const url = this.base + path.replace(/^hardware\//, '');
+        return version ? `${url}?v=${version}` : url;
+    }
+
+    // Re-read the manifest and forget the cached data of rebuilt parts ({part: version})
+    async refresh(versions) {
+        const response = await fetch(this.base + 'manifest.json', { cache: 'no-cache' });
+        if (response.ok) this.manifest = await response.json();
+        for (const [part, version] of Object.entries(versions)) {
+            this.versions.set(part, version);
+            this.headers.delete(part);
+            for (const key of [...this.levels.keys()]) {
+                if (key.startsWith(`${part}/`)) this.levels.delete(key);
+            }
+        }
+    }
+
+    // {part: header path} for every part exported to the mesh store
+    parts() {
+        const parts = {};
+        for (const [path, entry] of Object.entries(this.manifest.outputs || {})) {
+            if (entry.format === 'meshstore' && path.endsWith('/header.json')) {
+                parts[entry.part] = path;
+            }
+        }
+        return parts;
+    }
+
+    assemblies() {
+        const parts = this.parts();
+        const assemblies = {};
+        for (const [name, components] of Object.entries(this.manifest.assemblies || {})) {
+            if (components.every(c => c.part in parts)) assemblies[name] = components;
+        }
+        return assemblies;
+    }
+
+    header(part) {
+        if (!this.headers.has(part)) {
+            const path = this.parts()[part];
+            this.headers.set(part, fetch(this.url(path, this.versions.get(part)), { cache: 'no-cache' })
+                .then(response => {
+                    if (!response.ok) throw new Error(`${path}: ${response.status}`);
+                    return response.json();
+                })
+                .then(header => Object.assign(header, { path })));
+        }
+        return this.headers.get(part);
+    }
+
+    // {positions, normals, indices} typed arrays for one LOD level
+    level(part, index) {
+        const key = `${part}/${index}`;
+        if (!this.levels.has(key)) {
+            this.levels.set(key, this.header(part).then(async header => {
+                const directory = header.path.slice(0, header.path.lastIndexOf('/') + 1);
+                const entry = header.levels[index];
+                const names = Object.keys(entry.arrays);
+                const version = this.versions.get(part);
+                const arrays = await Promise.all(names.map(name =>
+                    this.fetchArray(this.url(directory + entry.arrays[name].file, version), entry.arrays[name])));
+                return Object.fromEntries(names.map((name, k) => [name, arrays[k]]));
+            }));
+        }
+        return this.levels.get(key);
+    }
+
+    async fetchArray(url, spec) {
+        const end = spec.offset + spec.nbytes - 1;
+        const response = await fetch(url, { headers: { Range: `bytes=${spec.offset}-${end}` } });
+        if (!response.ok) throw new Error(`${url}: ${response.status}`);
+        let buffer = await response.arrayBuffer();
+        // Servers without range support send the whole .npy file
+        if (response.status !== 206) buffer = buffer.slice(spec.offset, end + 1);
+        return spec.dtype === '<u4' ? new Uint32Array(buffer) : new Float32Array(buffer);
+    }
+}
+
+// Column-major 4x4 matrices, as WebGL expects
+const Mat4 = {
+    multiply(a, b) {
+        const out = new Float32Array(16);
+        for (let col = 0; col < 4; col++) {
+            for (let row = 0; row < 4; row++) {
+                let sum = 0;
+                for (let k = 0; k < 4; k++) sum += a[k * 4 + row] * b[col * 4 + k];
+                out[col * 4 + row] = sum;
+            }
+        }
+        return out;
+    },
+
+    perspective(fovy, aspect, near, far) {
+        const f = 1 / Math.tan(fovy / 2);
+        const out = new Float32Array(16);
+        out[0] = f / aspect;
+        out[5] = f;
+        out[10] = (far + near) / (near - far);
+        out[11] = -1;
+        out[14] = 2 * far * near / (near - far);
+        return out;
+    },
+
+    lookAt(eye, target, up) {
+        const sub = (a, b) => a.map((v, i) => v - b[i]);
+        const norm = v => { const l = Math.hypot(...v) || 1; return v.map(x => x / l); };
+        const cross = (a, b) => [a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0]];
+        const dot = (a, b) => a[0] * b[0] + a[1] * b[1] + a[2] * b[2];
+        const z = norm(sub(eye, target));
+        const x = norm(cross(up, z));
+        const y = cross(z, x);
+        return new Float32Array([
+            x[0], y[0], z[0], 0,
+            x[1], y[1], z[1], 0,
+            x[2], y[2], z[2], 0,
+            -dot(x, eye), -dot(y, eye), -dot(z, eye), 1
+        ]);
+    }
+};
+
+const VERTEX_SHADER = `#version 300 es
+in vec3 position;
+in vec3 normal;
+uniform mat4 viewProjection;
+uniform vec3 offset;
+out vec3 vNormal;
+void main() {
+    vNormal = normal;
+    gl_Position = viewProjection * vec4(position + offset, 1.0);
+}`;
+
+const FRAGMENT_SHADER = `#version 300 es
+precision mediump float;
+in vec3 vNormal;
+uniform vec3 color;
+uniform vec3 lightDirection;
+out vec4 fragColor;
+void main() {
+    vec3 n = normalize(vNormal);
+    float key = abs(dot(n, lightDirection));
+    float fill = 0.5 + 0.5 * n.z;
+    fragColor = vec4(color * (0.25 + 0.6 * key + 0.2 * fill), 1.0);
+}`;
+
+class MeshViewer {
+    constructor(container) {
+        this.canvas = document.createElement('canvas');
+        this.canvas.style.cssText = 'width: 100%; height: 100%; display: block; border-radius: 8px; touch-action: none;';
+        this.gl = this.canvas.getContext('webgl2', { antialias: true });
+        if (!this.gl) throw new Error('WebGL2 is not available');
+        container.replaceChildren(this.canvas);
+
+        this.meshes = new Map();
+        this.camera = { target: [0, 0, 0], distance: 1000, yaw: -Math.PI / 3, pitch: 0.45, radius: 500 };
+        this.program = this.createProgram();
+        this.bindControls();
+        new ResizeObserver(() => this.requestRender()).observe(this.canvas);
+    }
+
+    createProgram() {
+        const gl = this.gl;
+        const compile = (type, source) => {
+            const shader = gl.createShader(type);
+            gl.shaderSource(shader, source);
+            gl.compileShader(shader);
+            if (!gl.getShaderParameter(shader, gl.COMPILE_STATUS)) throw new Error(gl.getShaderInfoLog(shader));
+            return shader;
+        };
+        const program = gl.createProgram();
+        gl.attachShader(program, compile(gl.VERTEX_SHADER, VERTEX_SHADER));
+        gl.attachShader(program, compile(gl.FRAGMENT_SHADER, FRAGMENT_SHADER));
+        gl.bindAttribLocation(program, 0, 'position');
+        gl.bindAttribLocation(program, 1, 'normal');
+        gl.linkProgram(program);
+        if (!gl.getProgramParameter(program, gl.LINK_STATUS)) throw new Error(gl.getProgramInfoLog(program));
+        this.uniforms = {};
+        for (const name of ['viewProjection', 'offset', 'color', 'lightDirection']) {
+            this.uniforms[name] = gl.getUniformLocation(program, name);
+        }
+        return program;
+    }
+
+    // Add or replace a part's mesh; instances are [x, y, z] offsets (null = one copy)
+    setMesh(name, arrays, instances, color) {
+        const gl = this.gl;
+        const vao = gl.createVertexArray();
+        gl.bindVertexArray(vao);
+        const buffers = [arrays.positions, arrays.normals].map((data, location) => {
+            const buffer = gl.createBuffer();
+            gl.bindBuffer(gl.ARRAY_BUFFER, buffer);
+            gl.bufferData(gl.ARRAY_BUFFER, data, gl.STATIC_DRAW);
+            gl.enableVertexAttribArray(location);
+            gl.vertexAttribPointer(location, 3, gl.FLOAT, false, 0, 0);
+            return buffer;
+        });
+        const indexBuffer = gl.createBuffer();
+        gl.bindBuffer(gl.ELEMENT_ARRAY_BUFFER, indexBuffer);
+        gl.bufferData(gl.ELEMENT_ARRAY_BUFFER, arrays.indices, gl.STATIC_DRAW);
+        buffers.push(indexBuffer);
+        gl.bindVertexArray(null);
+
+        this.removeMesh(name);
+        this.meshes.set(name, {
+            vao, buffers, count: arrays.indices.length,
+            instances: instances || [[0, 0, 0]],
+            color: color || PART_COLORS[this.meshes.size % PART_COLORS.length]
+        });
+        this.requestRender();
+    }
+
+    removeMesh(name) {
+        const mesh = this.meshes.get(name);
+        if (!mesh) return;
+        mesh.buffers.forEach(buffer => this.gl.deleteBuffer(buffer));
+        this.gl.deleteVertexArray(mesh.vao);
+        this.meshes.delete(name);
+    }
+
+    clear() {
+        [...this.meshes.keys()].forEach(name => this.removeMesh(name));
+        this.requestRender();
+    }
+
+    // Aim the camera at a bounding box {min, max}
+    frame(bounds) {
+        this.camera.target = bounds.min.map((v, i) => (v + bounds.max[i]) / 2);
+        this.camera.radius = Math.max(Math.hypot(...bounds.max.map((v, i) => v - bounds.min[i])) / 2, 1);
+        this.camera.distance = this.camera.radius * 2.6;
+        this.requestRender();
+    }
+
+    bindControls() {
+        let drag = null;
+        this.canvas.addEventListener('contextmenu', event => event.preventDefault());
+        this.canvas.addEventListener('pointerdown', event => {
+            drag = { x: event.clientX, y: event.clientY, pan: event.button !== 0 || event.shiftKey };
+            this.canvas.setPointerCapture(event.pointerId);
+        });
+        this.canvas.addEventListener('pointerup', () => { drag = null; });
+        this.canvas.addEventListener('pointermove', event => {
+            if (!drag) return;
+            const dx = event.clientX - drag.x, dy = event.clientY - drag.y;
+            drag.x = event.clientX;
+            drag.y = event.clientY;
+            const camera = this.camera;
+            if (drag.pan) {
+                const scale = camera.distance / this.canvas.clientHeight;
+                const right = [-Math.sin(camera.yaw), Math.cos(camera.yaw), 0];
+                camera.target = camera.target.map((v, i) => v - right[i] * dx * scale);
+                camera.target[2] += dy * scale;
+            } else {
+                camera.yaw -= dx * 0.008;
+                camera.pitch = Math.max(-1.5, Math.min(1.5, camera.pitch + dy * 0.008));
+            }
+            this.requestRender();
+        });
+        this.canvas.addEventListener('wheel', event => {
+            event.preventDefault();
+            this.camera.distance *= Math.exp(event.deltaY * 0.001);
+            this.requestRender();
+        }, { passive: false });
+    }
+
+    requestRender() {
+        if (this.pending) return;
+        this.pending = true;
+        requestAnimationFrame(() => {
+            this.pending = false;
+            this.render();
+        });
+    }
+
+    render() {
+        const gl = this.gl, canvas = this.canvas, camera = this.camera;
+        const ratio = window.devicePixelRatio || 1;
+        const width = Math.round(canvas.clientWidth * ratio), height = Math.round(canvas.clientHeight * ratio);
+        if (canvas.width !== width || canvas.height !== height) {
+            canvas.width = width;
+            canvas.height = height;
+        }
+        gl.viewport(0, 0, width, height);
+        gl.clearColor(0.06, 0.06, 0.12, 1);
+        gl.clear(gl.COLOR_BUFFER_BIT | gl.DEPTH_BUFFER_BIT);
+        gl.enable(gl.DEPTH_TEST);
+
+        // Z is up in the CAD models
+        const direction = [
+            Math.cos(camera.pitch) * Math.cos(camera.yaw),
+            Math.cos(camera.pitch) * Math.sin(camera.yaw),
+            Math.sin(camera.pitch)
+        ];
+        const eye = camera.target.map((v, i) => v + direction[i] * camera.distance);
+        const near = Math.max(camera.distance - camera.radius * 4, camera.distance / 100);
+        const far = camera.distance + camera.radius * 4;
+        const viewProjection = Mat4.multiply(
+            Mat4.perspective(Math.PI / 4, width / Math.max(height, 1), near, far),
+            Mat4.lookAt(eye, camera.target, [0, 0, 1])
+        );
+
+        gl.useProgram(this.program);
+        gl.uniformMatrix4fv(this.uniforms.viewProjection, false, viewProjection);
+        gl.uniform3fv(this.uniforms.lightDirection, direction);
+        for (const mesh of this.meshes.values()) {
+            gl.bindVertexArray(mesh.vao);
+            gl.uniform3fv(this.uniforms.color, mesh.color);
+            for (const offset of mesh.instances) {
+                gl.uniform3fv(this.uniforms.offset, offset);
+                gl.drawElements(gl.TRIANGLES, mesh.count, gl.UNSIGNED_INT, 0);
+            }
+        }
+        gl.bindVertexArray(null);
+    }
+}
+
+// Bounding box of parts placed at their instance offsets
+function placedBounds(entries) {
+    const min = [Infinity, Infinity, Infinity], max = [-Infinity, -Infinity, -Infinity];
+    for (const { header, instances } of entries) {
+        const bounds = header.levels[0].bounds;
+        for (const offset of instances || [[0, 0, 0]]) {
+            for (let i = 0; i < 3; i++) {
+                min[i] = Math.min(min[i], bounds.min[i] + offset[i]);
+                max[i] = Math.max(max[i], bounds.max[i] + offset[i]);
+            }
+        }
+    }
+    return { min, max };
+}
+
+// Show parts coarsest-first in a viewer, then stream in finer levels.
+// onProgress(message) reports each step; returns false if superseded.
+async function loadProgressively(loader, viewer, components, onProgress) {
+    const token = viewer.loadToken = (viewer.loadToken || 0) + 1;
+    const current = () => viewer.loadToken === token;
+    const start = performance.now();
+
+    const headers = await Promise.all(components.map(c => loader.header(c.part)));
+    if (!current()) return false;
+    const entries = components.map((c, k) => ({ ...c, header: headers[k], color: PART_COLORS[k % PART_COLORS.length] }));
+    viewer.clear();
+    viewer.frame(placedBounds(entries));
+
+    // Coarsest level of every part at once
+    await Promise.all(entries.map(async entry => {
+        const coarsest = entry.header.levels.length - 1;
+        const arrays = await loader.level(entry.part, coarsest);
+        if (current()) viewer.setMesh(entry.part, arrays, entry.instances, entry.color);
+    }));
+    if (!current()) return false;
+    const triangles = levelIndex => entries.reduce((sum, e) =>
+        sum + e.header.levels[Math.min(levelIndex, e.header.levels.length - 1)].triangle_count
+            * (e.instances ? e.instances.length : 1), 0);
+    const depth = Math.max(...entries.map(e => e.header.levels.length));
+    onProgress(`Interactive in ${Math.round(performance.now() - start)} ms ` +
+               `(${triangles(depth - 1).toLocaleString()} triangles) - refining...`);
+
+    // Then every finer level, one level at a time across all parts
+    for (let level = depth - 2; level >= 0; level--) {
+        // (skipping levels decimation couldn't reduce further)
+        const refined = entries.filter(e => level < e.header.levels.length - 1 &&
+            e.header.levels[level].triangle_count !== e.header.levels[level + 1].triangle_count);
+        await Promise.all(refined.map(async entry => {
+            const arrays = await loader.level(entry.part, level);
+            if (current()) viewer.setMesh(entry.part, arrays, entry.instances, entry.color);
+        }));
+        if (!current()) return false;
+    }
+    onProgress(`Full detail in ${Math.round(performance.now() - start)} ms ` +
+               `(${triangles(0).toLocaleString()} triangles)`);
+    return true;
+}
+
+// Replace parts shown in a viewer with their finest level, keeping the camera
+// and colours; parts the viewer doesn't show yet are added
+async function swapParts(loader, viewer, components) {
+    await Promise.all(components.map(async c => {
+        const arrays = await loader.level(c.part, 0);
+        const shown = viewer.meshes.get(c.part);
+        viewer.setMesh(c.part, arrays, c.instances, shown ? shown.color : undefined);
+    }));
+}
+
+// Call onMessage with every notification on the model server's /api/live
+// WebSocket. Pages not served by the model server give up after one try.
+function connectLive(onMessage) {
+    if (!location.protocol.startsWith('http')) return;
+    let opened = false;
+    const connect = () => {
+        const socket = new WebSocket(`${location.protocol === 'https:' ? 'wss' : 'ws'}://${location.host}/api/live`);
+        socket.onopen = () => { opened = true; };
+        socket.onmessage = event => onMessage(JSON.parse(event.data));
+        // Keep reconnecting to a server that answered once (watch mode restarts)
+        socket.onclose = () => { if (opened) setTimeout(connect, 2000); };
+    };
+    connect();
+}
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Dolly Robot - Arm Workspace
+Samples the arms' joint space to find everywhere the grippers can reach.
+The kinematic model takes its dimensions from DollyRobotAssembly
+(shoulder offset and height, upper arm, lower arm and gripper lengths):
+each arm is a shoulder that pitches forward and rolls outward and an
+elbow, with the gripper fixed to the lower arm - the 3 joints per arm of
+the bill of materials. Millions of joint configurations are evaluated in
+NumPy batches and binned into a voxel grid, which gives the reach
+statistics to compare with the README's "12-16 inches from center" and
+the share of breadboard holes in front of the robot that a gripper can
+touch (to within a voxel).
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+from dolly_assembly import DollyRobotAssembly
+
+WORKSPACE_FILE = 'hardware/arm_workspace.npz'
+
+# Joint ranges in degrees. The CAD has no joint stops yet, so these are
+# what the printed joints should allow: pitch swings the arm forward
+# (negative: back), roll lifts it out to the side (negative: across the
+# front) and the elbow only bends forward.
+JOINT_LIMITS = {
+    'shoulder_pitch': (-45, 180),
+    'shoulder_roll': (-20, 100),
+    'elbow': (0, 150),
+}
+
+SAMPLES = 16_000_000
+BATCH_SIZE = 1 << 20
+# Finer voxels need many more samples to fill (5 mm settles by ~16M)
+VOXEL_MM = 5.0
+
+# README: "Reach: 12-16 inches from center"
+REACH_SPEC_MM = (12 * 25.4, 16 * 25.4)
+
+# Full-size breadboard (830 tie points) lying in front of the robot, long
+# side across: 63 columns of two 5-hole strips split by the center
+# channel, and two 50-hole power rails along each long edge
+BREADBOARD_SIZE = (165.1, 54.6)
+BREADBOARD_PITCH = 2.54
+BREADBOARD_COLUMNS = 63
+BREADBOARD_STRIP = 5
+BREADBOARD_CHANNEL = 7.62  # between the two inner rows of a column
+BREADBOARD_RAIL_HOLES = 50
+BREADBOARD_RAIL_OFFSET = 7.62  # from the outer terminal row to the nearest rail
+BREADBOARD_GAP = 10  # from the front edge of the base plate
+# On the surface the robot stands on - where a board in front of it would
+# lie. Pass a height to check a board raised on a stand or shelf.
+BREADBOARD_HEIGHT = 0
+
+
+class ArmModel:
+    """Gripper tip positions of the right arm (the left arm mirrors it in X)
+
+    Front is -Y (where the cameras face), up is +Z; all lengths in mm.
+    """
+
+    def __init__(self, assembly=None, limits=None):
+        assembly = assembly or DollyRobotAssembly()
+        self.shoulder = np.array([assembly.shoulder_offset, 0.0, assembly.shoulder_height])
+        self.upper = assembly.upper_arm_length
+        self.lower = assembly.lower_arm_length + assembly.gripper_length
+        self.limits = {name: np.radians(limit) for name, limit in (limits or JOINT_LIMITS).items()}
+        self.reach = self.upper + self.lower
+        self.base_depth = assembly.base_depth
+
+    def tips(self, pitch, roll, elbow):
+        """(N, 3) float32 gripper tips for arrays of joint angles (radians)"""
+        # Arm plane: hanging straight down is (0, 0, -1), pitch turns it forward
+        forward = self.upper * np.sin(pitch) + self.lower * np.sin(pitch + elbow)
+        down = self.upper * np.cos(pitch) + self.lower * np.cos(pitch + elbow)
+        tips = np.empty((len(pitch), 3), dtype=np.float32)
+        tips[:, 0] = self.shoulder[0] + down * np.sin(roll)
+        tips[:, 1] = self.shoulder[1] - forward
+        tips[:, 2] = self.shoulder[2] - down * np.cos(roll)
+        return tips
+
+    def sample(self, count, rng):
+        """Tips of count joint configurations drawn uniformly within the limits"""
+        angles = [rng.uniform(low, high, count) for low, high in
+                  (self.limits['shoulder_pitch'], self.limits['shoulder_roll'], self.limits['elbow'])]
+        return self.tips(*angles)
+
+
+class VoxelGrid:
+    """Occupancy of a box of space, symmetric about X = 0"""
+
+    def __init__(self, lower, upper, voxel=VOXEL_MM):
+        half_width = max(abs(lower[0]), abs(upper[0]))
+        counts = np.ceil((np.array(upper) - np.array(lower)) / voxel).astype(int)
+        counts[0] = 2 * int(np.ceil(half_width / voxel))
+        self.voxel = voxel
+        self.origin = np.array([-counts[0] * voxel / 2, lower[1], lower[2]])
+        self.occupied = np.zeros(counts, dtype=bool)
+
+    def indices(self, points):
+        """Voxel indices of points and whether they lie in the grid"""
+        index = np.floor((points - self.origin) / self.voxel).astype(np.int64)
+        inside = np.all((index >= 0) & (index < self.occupied.shape), axis=1)
+        return index, inside
+
+    def add(self, points):
+        index, inside = self.indices(points)
+        index = index[inside]
+        self.occupied[index[:, 0], index[:, 1], index[:, 2]] = True
+
+    def mirrored(self):
+        """The grid reflected in X (the other arm's workspace)"""
+        mirror = VoxelGrid.__new__(VoxelGrid)
+        mirror.voxel, mirror.origin = self.voxel, self.origin
+        mirror.occupied = self.occupied[::-1]
+        return mirror
+
+    def contains(self, points):
+        index, inside = self.indices(points)
+        found = np.zeros(len(points), dtype=bool)
+        index = index[inside]
+        found[inside] = self.occupied[index[:, 0], index[:, 1], index[:, 2]]
+        return found
+
+    def centers(self):
+        return (np.argwhere(self.occupied) + 0.5) * self.voxel + self.origin
+
+
+def breadboard_holes(base_depth, height=BREADBOARD_HEIGHT):
+    """(N, 3) tie point positions of the breadboard in front of the robot
+
+    Each of the 63 columns has two 5-hole terminal strips either side of
+    the center channel; a pair of power rails runs along each long edge,
+    in groups of 5 holes with a one-hole gap between groups.
+    """
+    columns = BREADBOARD_COLUMNS
+    x = (np.arange(columns) - (columns - 1) / 2) * BREADBOARD_PITCH
+    strip = BREADBOARD_CHANNEL / 2 + np.arange(BREADBOARD_STRIP) * BREADBOARD_PITCH
+    rows = [(x, side * strip) for side in (-1, 1)]
+
+    groups = BREADBOARD_RAIL_HOLES // BREADBOARD_STRIP
+    positions = np.arange(groups * (BREADBOARD_STRIP + 1) - 1)
+    rail_x = (positions[positions % (BREADBOARD_STRIP + 1) < BREADBOARD_STRIP]
+              - (len(positions) - 1) / 2) * BREADBOARD_PITCH
+    rail = strip[-1] + BREADBOARD_RAIL_OFFSET + np.arange(2) * BREADBOARD_PITCH
+    rows += [(rail_x, side * rail) for side in (-1, 1)]
+
+    center = -(base_depth / 2 + BREADBOARD_GAP + BREADBOARD_SIZE[1] / 2)
+    points = []
+    for xs, ys in rows:
+        xx, yy = np.meshgrid(xs, ys)
+        points.append(np.column_stack([xx.ravel(), center + yy.ravel(), np.full(xx.size, height)]))
+    return np.concatenate(points)
+
+
+def sample_workspace(samples=SAMPLES, batch_size=BATCH_SIZE, voxel=VOXEL_MM, seed=0, model=None):
+    """(model, right arm grid) after sampling the right arm's joint space"""
+    model = model or ArmModel()
+    reach = model.reach
+    grid = VoxelGrid(model.shoulder - reach, model.shoulder + reach, voxel)
+    rng = np.random.default_rng(seed)
+    for start in range(0, samples, batch_size):
+        grid.add(model.sample(min(batch_size, samples - start), rng))
+    return model, grid
+
+
+def workspace_stats(model, right, height=BREADBOARD_HEIGHT):
+    """Reach statistics of both arms and breadboard coverage at a height"""
+    left = right.mirrored()
+    points = np.concatenate([right.centers(), left.centers()])
+    radial = np.hypot(points[:, 0], points[:, 1])
+    ahead = points[np.abs(points[:, 0]) <= right.voxel]  # straight in front of the center
+
+    holes = breadboard_holes(model.base_depth, height)
+    by_right, by_left = right.contains(holes), left.contains(holes)
+    return {
+        'voxels': int(right.occupied.sum()),
+        'volume_l': float(right.occupied.sum() * right.voxel ** 3 / 1e6),
+        'max_reach_mm': float(radial.max()),
+        'front_reach_mm': float(-ahead[:, 1].min()) if len(ahead) else 0.0,
+        'lowest_mm': float(points[:, 2].min()),
+        'highest_mm': float(points[:, 2].max()),
+        'holes': len(holes),
+        'either_arm': float((by_right | by_left).mean()),
+        'both_arms': float((by_right & by_left).mean()),
+    }
+
+
+def save_workspace(grid, path=WORKSPACE_FILE):
+    """Store the right arm's voxel grid (bit-packed)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.savez_compressed(path, occupied=np.packbits(grid.occupied), shape=grid.occupied.shape,
+                        origin=grid.origin, voxel=grid.voxel)
+
+
+# python hardware/cad/arm_workspace.py [samples] [breadboard height mm], from the repository root
+if __name__ == "__main__":
+    samples = int(float(sys.argv[1])) if len(sys.argv) > 1 else SAMPLES
+    height = float(sys.argv[2]) if len(sys.argv) > 2 else BREADBOARD_HEIGHT
+
+    start = time.perf_counter()
+    model, grid = sample_workspace(samples)
+    elapsed = time.perf_counter() - start
+    stats = workspace_stats(model, grid, height)
+    save_workspace(grid)
+
+    inches = lambda mm: mm / 25.4
+    low, high = REACH_SPEC_MM
+    print(f"🦾 {samples:,} arm poses in {elapsed:.1f}s "
+          f"({samples / elapsed / 1e6:.1f} M/s) -> {WORKSPACE_FILE}")
+    print(f"   Workspace per arm: {stats['volume_l']:.1f} L "
+          f"({stats['voxels']:,} voxels of {VOXEL_MM} mm)")
+    print(f"   Gripper height: {stats['lowest_mm']:.0f} to {stats['highest_mm']:.0f} mm")
+
+    max_reach, front_reach = stats['max_reach_mm'], stats['front_reach_mm']
+    verdict = ('within' if low <= max_reach <= high
+               else 'beyond' if max_reach > high else 'short of')
+    print(f"\n📏 Reach from center: {max_reach:.0f} mm ({inches(max_reach):.1f}\") to the side, "
+          f"{front_reach:.0f} mm ({inches(front_reach):.1f}\") straight ahead")
+    print(f"   README spec: {inches(low):.0f}-{inches(high):.0f}\" - "
+          f"maximum reach is {verdict} the spec")
+
+    print(f"\n🔌 Breadboard ({BREADBOARD_SIZE[0]} × {BREADBOARD_SIZE[1]} mm, "
+          f"{stats['holes']} holes) at {height:g} mm height:")
+    print(f"   Either gripper reaches {stats['either_arm']:.0%} of the holes, "
+          f"both reach {stats['both_arms']:.0%}")
+    if stats['lowest_mm'] > height:
+        print(f"   ⚠️  The grippers get no lower than {stats['lowest_mm']:.0f} mm - "
+              f"the board must be raised or the arms lengthened")
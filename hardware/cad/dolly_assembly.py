@@ -7,9 +7,19 @@ Individual components are simplified - see component files for details.
 
 import cadquery as cq
 
+from tessellation import tessellate_for
+from step_writer import write_step
+from stl_writer import write_stl
+from svg_views import ViewProjector
+from svg_compact import COMPACT_OPTIONS
+from multi_format_export import DollyExporter
+
 class DollyRobotAssembly:
     """Complete Dolly robot assembly"""
     
+    # Name of the assembly in the export manifest (and the web viewer)
+    assembly_name = "dolly_complete_assembly"
+    
     def __init__(self):
         # Overall dimensions
         self.total_height = 610  # 24 inches
@@ -25,62 +35,88 @@ class DollyRobotAssembly:
         self.shoulder_height = 420
         self.head_bottom = 480
         
-    def create_simplified_base(self):
-        """Simplified base with wheels"""
-        # Base plate
-        base = (
+        # Arms (see create_arms)
+        self.shoulder_offset = 100  # from the center line to each shoulder
+        self.upper_arm_length = 150
+        self.lower_arm_length = 120
+        self.gripper_length = 60
+        self.upper_arm_angle = 30  # degrees, as drawn
+        self.lower_arm_angle = 45
+        
+    def wheel_positions(self):
+        """Drive wheel positions (each wheel extrudes +X from here)"""
+        wheel_spacing = 200
+        return [(x, 0, self.wheel_height)
+                for x in [-wheel_spacing/2, wheel_spacing/2]]
+    
+    def caster_positions(self):
+        """Caster positions under the base plate"""
+        return [(x, y, 10) for x, y in [(80, 80), (-80, 80), (80, -80), (-80, -80)]]
+    
+    def post_positions(self):
+        """Centers of the four vertical frame posts"""
+        return [
+            (self.base_width/2 - 30, self.base_depth/2 - 30, self.torso_top/2 + self.base_plate_height),
+            (-self.base_width/2 + 30, self.base_depth/2 - 30, self.torso_top/2 + self.base_plate_height),
+            (self.base_width/2 - 30, -self.base_depth/2 + 30, self.torso_top/2 + self.base_plate_height),
+            (-self.base_width/2 + 30, -self.base_depth/2 + 30, self.torso_top/2 + self.base_plate_height)
+        ]
+    
+    def create_base_plate(self):
+        """Base plate only"""
+        return (
             cq.Workplane("XY")
             .box(self.base_width, self.base_depth, 5)
             .translate((0, 0, self.base_plate_height))
         )
-        
-        # Drive wheels (simplified as cylinders)
+    
+    def create_wheel(self):
+        """Drive wheel (simplified as a cylinder) at the origin"""
         wheel_diameter = 70
         wheel_width = 25
-        wheel_spacing = 200
+        return (
+            cq.Workplane("YZ")
+            .circle(wheel_diameter/2)
+            .extrude(wheel_width)
+        )
+    
+    def create_caster(self):
+        """Caster (simplified) at the origin"""
+        return (
+            cq.Workplane("XY")
+            .circle(15)
+            .extrude(30)
+        )
+    
+    def create_post(self):
+        """Vertical 2020 extrusion post centered on the origin"""
+        extrusion_size = 20
+        return (
+            cq.Workplane("XY")
+            .box(extrusion_size, extrusion_size, self.torso_top)
+        )
+    
+    def create_simplified_base(self):
+        """Simplified base with wheels"""
+        # Base plate
+        base = self.create_base_plate()
         
-        for x in [-wheel_spacing/2, wheel_spacing/2]:
-            wheel = (
-                cq.Workplane("YZ")
-                .circle(wheel_diameter/2)
-                .extrude(wheel_width)
-                .translate((x, 0, self.wheel_height))
-            )
-            base = base.union(wheel)
+        # Drive wheels
+        for position in self.wheel_positions():
+            base = base.union(self.create_wheel().translate(position))
         
-        # Casters (simplified)
-        caster_positions = [(80, 80), (-80, 80), (80, -80), (-80, -80)]
-        for x, y in caster_positions:
-            caster = (
-                cq.Workplane("XY")
-                .circle(15)
-                .extrude(30)
-                .translate((x, y, 10))
-            )
-            base = base.union(caster)
+        # Casters
+        for position in self.caster_positions():
+            base = base.union(self.create_caster().translate(position))
             
         return base
     
     def create_frame_structure(self):
         """Aluminum extrusion frame (simplified)"""
-        extrusion_size = 20
-        
         # Vertical posts
-        posts = []
-        post_positions = [
-            (self.base_width/2 - 30, self.base_depth/2 - 30),
-            (-self.base_width/2 + 30, self.base_depth/2 - 30),
-            (self.base_width/2 - 30, -self.base_depth/2 + 30),
-            (-self.base_width/2 + 30, -self.base_depth/2 + 30)
-        ]
-        
         frame = None
-        for x, y in post_positions:
-            post = (
-                cq.Workplane("XY")
-                .box(extrusion_size, extrusion_size, self.torso_top)
-                .translate((x, y, self.torso_top/2 + self.base_plate_height))
-            )
+        for position in self.post_positions():
+            post = self.create_post().translate(position)
             frame = post if frame is None else frame.union(post)
             
         return frame
@@ -123,32 +159,32 @@ class DollyRobotAssembly:
         """Simplified robot arms"""
         # Shoulder joint
         shoulder_width = 60
-        shoulder_offset = 100
+        shoulder_offset = self.shoulder_offset
         
         arms = None
         for side in [-1, 1]:  # Left and right arms
             # Upper arm
             upper_arm = (
                 cq.Workplane("XY")
-                .box(30, 30, 150)
+                .box(30, 30, self.upper_arm_length)
                 .translate((side * shoulder_offset, 0, 
-                           self.shoulder_height - 75))
-                .rotate((0, 0, 0), (1, 0, 0), side * 30)
+                           self.shoulder_height - self.upper_arm_length/2))
+                .rotate((0, 0, 0), (1, 0, 0), side * self.upper_arm_angle)
             )
             
             # Lower arm  
             lower_arm = (
                 cq.Workplane("XY")
-                .box(25, 25, 120)
+                .box(25, 25, self.lower_arm_length)
                 .translate((side * (shoulder_offset + 40), 0,
                            self.shoulder_height - 180))
-                .rotate((0, 0, 0), (1, 0, 0), side * 45)
+                .rotate((0, 0, 0), (1, 0, 0), side * self.lower_arm_angle)
             )
             
             # Gripper (simplified)
             gripper = (
                 cq.Workplane("XY")
-                .box(40, 15, 60)
+                .box(40, 15, self.gripper_length)
                 .translate((side * (shoulder_offset + 60), 0,
                            self.shoulder_height - 280))
             )
@@ -220,6 +256,22 @@ class DollyRobotAssembly:
         robot = robot.union(head)
         
         return robot
+    
+    def web_components(self):
+        """Components for the web (GLB) model as (name, part, instances)
+        
+        Repeated parts are returned once with their positions so the
+        exporter can GPU-instance them instead of storing every copy.
+        """
+        return [
+            ("base_plate", self.create_base_plate(), None),
+            ("drive_wheel", self.create_wheel(), self.wheel_positions()),
+            ("caster", self.create_caster(), self.caster_positions()),
+            ("frame_post", self.create_post(), self.post_positions()),
+            ("torso", self.create_torso_components(), None),
+            ("arms", self.create_arms(), None),
+            ("head", self.create_head(), None)
+        ]
 
 # Generate all parts
 if __name__ == "__main__":
@@ -234,12 +286,14 @@ if __name__ == "__main__":
     # Export in multiple formats
     print("Generating Dolly robot complete assembly...")
     
-    # STEP for CAD
-    cq.exporters.export(complete_robot, "hardware/step/dolly_complete_assembly.step")
+    # STEP for CAD (byte-identical when the geometry hasn't changed)
+    write_step("hardware/step/dolly_complete_assembly.step", complete_robot)
     print("  ✓ STEP file (CAD exchange)")
     
-    # STL for 3D printing
-    cq.exporters.export(complete_robot, "hardware/stl/dolly_complete_assembly.stl")
+    # STL for 3D printing, facets in a stable order
+    vertices, triangles, _ = tessellate_for(complete_robot, 'print')
+    write_stl("hardware/stl/dolly_complete_assembly.stl", vertices, triangles,
+              name="dolly_complete_assembly", canonical=True)
     print("  ✓ STL file (3D printing)")
     
     # SVG views for documentation
@@ -250,24 +304,40 @@ if __name__ == "__main__":
         ('iso', (1, 1, 1))
     ]
     
-    for view_name, direction in views:
-        cq.exporters.export(
+    with ViewProjector() as projector:
+        projector.export_views(
             complete_robot,
-            f"hardware/svg/dolly_assembly_{view_name}.svg",
-            opt={
-                "projectionDir": direction,
+            views,
+            lambda view_name: f"hardware/svg/dolly_assembly_{view_name}.svg",
+            {
                 "width": 1000,
                 "height": 800,
                 "marginLeft": 100,
                 "marginTop": 100,
                 "showAxes": True,
                 "showHidden": False
-            }
+            },
+            COMPACT_OPTIONS
         )
-        print(f"  ✓ SVG {view_name} view")
+    for view_name, _ in views:
+        path = f"hardware/svg/dolly_assembly_{view_name}.svg"
+        before = projector.uncompacted_sizes[path] / 1024
+        after = os.path.getsize(path) / 1024
+        print(f"  ✓ SVG {view_name} view ({before:.0f} KB -> {after:.0f} KB)")
+    
+    with DollyExporter() as exporter:
+        # GLB for the browser viewer (posts, wheels and casters are instanced)
+        exporter.export_glb_assembly(dolly.web_components(), "dolly_complete_assembly")
+        print("  ✓ GLB file (web viewer)")
+        
+        # LOD mesh arrays + manifest for the progressive viewer (docs/interactive/3d-viewer.html)
+        exporter.export_mesh_assembly(dolly.web_components(), dolly.assembly_name)
+        exporter.write_manifest()
+    print("  ✓ Mesh store (progressive web viewer)")
     
     print("\nAll files generated!")
     print("\nViewing options:")
     print("  - STEP: Use FreeCAD or online viewers")
     print("  - STL: Use any 3D printing slicer")
-    print("  - SVG: Open directly in your web browser!")
\ No newline at end of file
+    print("  - SVG: Open directly in your web browser!")
+    print("  - GLB: Any glTF viewer (three.js, Blender, 3dviewer.net)")
\ No newline at end of file
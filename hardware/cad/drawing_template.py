@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+Dolly Robot - Drawing Template
+The A3 landscape sheet (border and title block) that technical drawings
+are laid out on. It is shared by pdf_drawing and by step_to_pdf's
+FreeCAD pipeline, and has no imports so FreeCAD's bundled Python, which
+usually lacks CadQuery and OCP, can load it too.
+"""
+
+A3_TEMPLATE = '''<?xml version="1.0" encoding="UTF-8"?>
+<svg width="420mm" height="297mm" viewBox="0 0 420 297">
+  <rect x="10" y="10" width="400" height="277" fill="none" stroke="black" stroke-width="0.5"/>
+  <rect x="290" y="247" width="120" height="40" fill="none" stroke="black" stroke-width="0.5"/>
+  <text x="295" y="257" font-family="Arial" font-size="3">Title:</text>
+  <text x="295" y="267" font-family="Arial" font-size="3">Part:</text>
+  <text x="295" y="277" font-family="Arial" font-size="3">Date:</text>
+  <text x="295" y="287" font-family="Arial" font-size="3">Scale:</text>
+</svg>'''
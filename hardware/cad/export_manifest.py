@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Dolly Robot - Export Manifest
+Tracks every exported file with the shape fingerprint and options that
+produced it, so unchanged parts can be skipped on the next run.
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+
+from OCP.BRepTools import BRepTools
+from OCP.TopTools import TopTools_FormatVersion
+
+from file_index import file_hash
+from tessellation import to_shape
+
+MANIFEST_VERSION = 1
+
+# Flags line of each shape in a B-rep file: free, modified, checked,
+# orientable, closed, infinite, convex. OCC sets the first three as it
+# meshes and checks a shape, so they are not part of the geometry.
+_SHAPE_FLAGS = re.compile(rb'^[01]{3}([01]{4})$', re.MULTILINE)
+
+
+def shape_fingerprint(obj):
+    """SHA-256 of the part's B-rep geometry
+
+    Ignores any cached mesh and the state flags that meshing changes, so
+    a shape fingerprints the same before and after it is exported.
+    """
+    stream = io.BytesIO()
+    BRepTools.Write_s(
+        to_shape(obj).wrapped, stream, False, False,
+        TopTools_FormatVersion.TopTools_FormatVersion_VERSION_1
+    )
+    data = stream.getvalue()
+    start = data.find(b'\nTShapes ')
+    if start >= 0:
+        data = data[:start] + _SHAPE_FLAGS.sub(rb'000\1', data[start:])
+    return hashlib.sha256(data).hexdigest()
+
+
+def options_hash(options):
+    """Stable hash of a JSON-serializable options dict"""
+    text = json.dumps(options, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+class ExportManifest:
+    """manifest.json: one entry per output file, plus per-part mesh stats"""
+
+    def __init__(self, path='hardware/manifest.json'):
+        self.path = path
+        self.outputs = {}
+        self.parts = {}
+        # Assemblies as lists of their component parts and placements
+        self.assemblies = {}
+        self.touched = set()
+
+        if os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                self.outputs = data.get('outputs', {})
+                self.parts = data.get('parts', {})
+                self.assemblies = data.get('assemblies', {})
+
+    def outputs_for(self, part, fmt):
+        """Paths previously exported for a part in a format"""
+        return [
+            path for path, entry in self.outputs.items()
+            if entry['part'] == part and entry['format'] == fmt
+        ]
+
+    def current_outputs(self, part, fmt, fingerprint, options):
+        """Return the recorded paths if they are still up to date, else None"""
+        self.touched.add((part, fmt))
+        paths = self.outputs_for(part, fmt)
+        if not paths:
+            return None
+
+        wanted = options_hash(options)
+        for path in paths:
+            entry = self.outputs[path]
+            if entry['fingerprint'] != fingerprint or entry['options_hash'] != wanted:
+                return None
+            if not os.path.exists(path) or os.path.getsize(path) != entry['bytes']:
+                return None
+        return paths
+
+    def record(self, part, fmt, paths, fingerprint, options, duration, details=None):
+        """Record freshly exported files and delete ones no longer produced
+
+        details optionally maps a path to extra fields for its entry.
+        """
+        self.touched.add((part, fmt))
+        for path in self.outputs_for(part, fmt):
+            if path not in paths:
+                self._remove(path)
+
+        for path in paths:
+            self.outputs[path] = {
+                'part': part,
+                'format': fmt,
+                'fingerprint': fingerprint,
+                'options': options,
+                'options_hash': options_hash(options),
+                'sha256': file_hash(path),
+                'bytes': os.path.getsize(path),
+                'export_seconds': round(duration, 4),
+            }
+            if details and path in details:
+                self.outputs[path].update(details[path])
+
+    def record_assembly(self, name, components):
+        """Record an assembly's components: [{'part': ..., 'instances': ...}]"""
+        self.assemblies[name] = components
+
+    def prune(self):
+        """Delete outputs of parts/formats not exported in this session"""
+        stale = [
+            path for path, entry in self.outputs.items()
+            if (entry['part'], entry['format']) not in self.touched
+        ]
+        for path in stale:
+            self._remove(path)
+
+        exported_parts = {part for part, _ in self.touched}
+        for part in list(self.parts):
+            if part not in exported_parts:
+                del self.parts[part]
+        for name, components in list(self.assemblies.items()):
+            if any(component['part'] not in exported_parts for component in components):
+                del self.assemblies[name]
+        return stale
+
+    def _remove(self, path):
+        self.outputs.pop(path, None)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def save(self):
+        """Write the manifest to disk"""
+        data = {
+            'version': MANIFEST_VERSION,
+            'outputs': dict(sorted(self.outputs.items())),
+            'parts': self.parts,
+            'assemblies': self.assemblies,
+        }
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump(data, f, indent=2)
+        return self.path
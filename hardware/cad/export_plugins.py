@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Dolly Robot - Exporter Plugins
+Every output format is a plugin in a registry. A plugin declares the
+intermediate data it needs (B-rep, mesh or 2D projection), whether its
+writer can run on a worker thread, its default options and its file
+extension. plan() groups formats by shared intermediates so each mesh
+profile is tessellated once per part, whatever formats use it.
+"""
+
+import io
+import os
+import threading
+
+import cadquery as cq
+import numpy as np
+from cadquery.occ_impl.shapes import compound
+from cadquery.occ_impl.exporters.amf import AmfWriter
+from cadquery.occ_impl.exporters.dxf import DxfDocument
+from cadquery.occ_impl.exporters.json import JsonMesh
+from ezdxf import zoom
+
+from tessellation import clear_mesh
+from step_writer import step_bytes
+from stl_writer import iter_stl
+from glb_export import GlbWriter
+from mesh_lod import build_lod_chain, flat_shaded, LOD_RATIOS, LOD_MAX_ERROR
+from svg_compact import COMPACT_OPTIONS, gzip_svg, svgz_path
+from png_render import iter_part_images, PNG_VIEWS, PNG_SIZES
+from export_stream import DirectorySink, write_stream
+from mesh_store import iter_store_files, STORE_DIR
+
+# Intermediate data a plugin works from
+BREP = 'brep'
+MESH = 'mesh'
+PROJECTION = 'projection'
+
+# Where a plugin's writer may run
+THREAD = 'thread'    # pure Python/NumPy on prepared data: any worker thread
+MAIN = 'main'        # uses OCC state that isn't thread-safe: the calling thread
+PROCESS = 'process'  # CPU-bound OCC work it fans out to worker processes itself
+
+SVG_VIEWS = [
+    ('top', (0, 0, 1)),
+    ('front', (1, 0, 0)),
+    ('side', (0, 1, 0))
+]
+
+SVG_OPTIONS = {
+    "width": 800,
+    "height": 600,
+    "marginLeft": 50,
+    "marginTop": 50,
+    "showAxes": False,
+    "showHidden": False
+}
+
+# Rounded, merged and de-duplicated paths; set 'gzip' to add .svgz copies
+SVG_COMPACT = dict(COMPACT_OPTIONS)
+
+EXPORTERS = {}
+
+
+class ExportError(Exception):
+    """A part can't be exported to a format; it is skipped with a warning"""
+
+
+def register_exporter(cls):
+    """Class decorator adding an exporter plugin to the registry"""
+    plugin = cls()
+    EXPORTERS[plugin.name] = plugin
+    return cls
+
+
+def get_exporter(fmt):
+    """The registered plugin for a format name"""
+    try:
+        return EXPORTERS[fmt]
+    except KeyError:
+        raise ValueError(f"Unknown export format '{fmt}' "
+                         f"(available: {', '.join(EXPORTERS)})") from None
+
+
+def plan(formats):
+    """Group formats by the intermediate data they share
+
+    Returns [((needs, profile), [plugins])] in first-use order, so each
+    group's B-rep, mesh or projection input is prepared once.
+    """
+    groups = {}
+    for fmt in formats:
+        plugin = get_exporter(fmt)
+        groups.setdefault((plugin.needs, plugin.profile), []).append(plugin)
+    return list(groups.items())
+
+
+def _export_shape(obj):
+    """The shape cq.exporters.export would write for obj"""
+    return obj if isinstance(obj, cq.Shape) else compound(*obj)
+
+
+class ExportJob:
+    """One part being exported, with the intermediates its formats share"""
+
+    def __init__(self, exporter, obj, name):
+        self.exporter = exporter
+        self.obj = obj
+        self.name = name
+        # Extra manifest fields by relative output path
+        self.details = {}
+        self._shape = None
+        self._lod_chains = {}
+        # Formats in one group run on several threads; one builds each chain
+        self._lod_locks = {}
+        self._lock = threading.Lock()
+
+    @property
+    def shape(self):
+        if self._shape is None:
+            self._shape = _export_shape(self.obj)
+        return self._shape
+
+    def prepare(self, needs, profile):
+        """Build a group's shared input before its writers run"""
+        if needs == MESH:
+            self.exporter.mesh(self.obj, self.name, profile)
+
+    def mesh(self, plugin):
+        """The part's mesh for a plugin's profile (vertices, triangles)"""
+        return self.exporter.tessellate(self.obj, self.name, plugin.profile, plugin.name)
+
+    def lod_chain(self, plugin, ratios, max_error):
+        """The LOD chain of the part's mesh, shared by formats that need it
+
+        max_error is relative to the part's size (see build_lod_chain).
+        """
+        vertices, triangles = self.mesh(plugin)
+        key = (plugin.profile, tuple(ratios), max_error)
+        with self._lock:
+            lock = self._lod_locks.setdefault(key, threading.Lock())
+        with lock:
+            if key not in self._lod_chains:
+                size = float(np.linalg.norm(np.ptp(vertices, axis=0)))
+                self._lod_chains[key] = build_lod_chain(vertices, triangles, ratios,
+                                                        max_error * size)
+        return self._lod_chains[key]
+
+
+class ExporterPlugin:
+    """Base class: subclass, fill in the attributes and implement export()"""
+
+    name = None
+    description = ''
+    extension = None
+    directory = None        # output subdirectory, defaults to the name
+    needs = BREP
+    profile = None          # tessellation profile, for MESH plugins
+    concurrency = THREAD
+    streamable = True
+    default_options = {}
+
+    @property
+    def output_dir(self):
+        return self.directory or self.name
+
+    def path(self, name, suffix=''):
+        """Output path for a part, relative to the export root"""
+        return f'{self.output_dir}/{name}{suffix}.{self.extension}'
+
+    def export(self, job, options):
+        """Yield (relative_path, bytes or chunk iterator) for each output file"""
+        raise NotImplementedError
+
+    def write(self, job, options, sink):
+        """Send the outputs to a sink; returns the paths/names written"""
+        return write_stream(self.export(job, options), sink)
+
+
+@register_exporter
+class StepExporter(ExporterPlugin):
+    name = 'step'
+    description = 'STEP files for CAD software'
+    extension = 'step'
+    # STEP settings are process-wide Interface_Static values
+    concurrency = MAIN
+    # Fixed header fields and canonical entity order (step_writer.py)
+    default_options = {'reproducible': True}
+
+    def export(self, job, options):
+        yield self.path(job.name), step_bytes(job.shape, job.name, options['reproducible'])
+
+
+@register_exporter
+class StlExporter(ExporterPlugin):
+    name = 'stl'
+    description = 'STL files for 3D printing'
+    extension = 'stl'
+    needs = MESH
+    profile = 'print'
+    # reproducible: facets in a stable, geometry-defined order
+    default_options = {'ascii': False, 'reproducible': True}
+
+    def export(self, job, options):
+        vertices, triangles = job.mesh(self)
+        yield self.path(job.name), iter_stl(
+            vertices, triangles, name=job.name, ascii=options['ascii'],
+            canonical=options['reproducible']
+        )
+
+
+@register_exporter
+class SvgExporter(ExporterPlugin):
+    name = 'svg'
+    description = 'SVG drawings for documentation'
+    extension = 'svg'
+    needs = PROJECTION
+    concurrency = PROCESS
+    default_options = {'views': SVG_VIEWS, 'svg': SVG_OPTIONS, 'compact': SVG_COMPACT}
+
+    def export(self, job, options):
+        # All views are projected together
+        compact = options['compact']
+        rendered = job.exporter.view_projector.render_views(
+            job.obj, options['views'], options['svg'], compact
+        )
+        # The part's real size, for the drawing gallery
+        box = job.shape.BoundingBox()
+        part_size = [round(box.xlen, 2), round(box.ylen, 2), round(box.zlen, 2)]
+        for view_name, svg, full_size in rendered:
+            path = self.path(job.name, f'_{view_name}')
+            data = svg.encode('utf-8')
+            entries = [(path, data)]
+            if compact and compact.get('gzip'):
+                entries.append((svgz_path(path), gzip_svg(data)))
+            for entry_path, entry_data in entries:
+                job.details[entry_path] = {'part_size': part_size}
+                if full_size is not None:
+                    job.details[entry_path]['uncompacted_bytes'] = full_size
+                yield entry_path, entry_data
+
+
+@register_exporter
+class DxfExporter(ExporterPlugin):
+    name = 'dxf'
+    description = 'DXF files for laser cutting'
+    extension = 'dxf'
+    concurrency = MAIN
+    default_options = {'face': '>Z'}
+
+    def export(self, job, options):
+        # A 2D profile of one planar face (the top face by default)
+        faces = cq.Workplane().add(job.shape).faces(options['face']).vals()
+        if not faces:
+            raise ExportError(f"no face matches '{options['face']}'")
+        face = faces[0]
+        if face.geomType() != 'PLANE':
+            raise ExportError(f"the '{options['face']}' face is not planar")
+
+        dxf = DxfDocument()
+        dxf.add_shape(face)
+        zoom.extents(dxf.msp)
+        stream = io.StringIO()
+        dxf.document.write(stream)
+        yield self.path(job.name), dxf.document.encode(stream.getvalue())
+
+
+@register_exporter
+class VrmlExporter(ExporterPlugin):
+    name = 'vrml'
+    description = 'VRML for 3D visualization'
+    extension = 'wrl'
+    concurrency = MAIN
+    # OCC's VRML writer only writes to a named file
+    streamable = False
+
+    def export(self, job, options):
+        raise ExportError("VRML can only be exported to a file, not streamed")
+
+    def write(self, job, options, sink):
+        if not isinstance(sink, DirectorySink):
+            raise ExportError("VRML can only be exported to a directory")
+        path = os.path.join(sink.root, self.path(job.name))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        clear_mesh(job.shape)
+        cq.exporters.export(job.shape, path, exportType='VRML')
+        return [path]
+
+
+class _CadQueryMeshExporter(ExporterPlugin):
+    """Formats written from CadQuery's own tessellation of the shape"""
+
+    # Meshes the shared B-rep in place
+    concurrency = MAIN
+    default_options = {'tolerance': 0.1, 'angular_tolerance': 0.1}
+
+    def _tessellate(self, job, options):
+        # Drop any finer mesh left on the shape by other formats
+        clear_mesh(job.shape)
+        return job.shape.tessellate(options['tolerance'], options['angular_tolerance'])
+
+
+@register_exporter
+class AmfExporter(_CadQueryMeshExporter):
+    name = 'amf'
+    description = 'AMF for advanced 3D printing'
+    extension = 'amf'
+
+    def export(self, job, options):
+        stream = io.BytesIO()
+        AmfWriter(self._tessellate(job, options)).writeAmf(stream)
+        yield self.path(job.name), stream.getvalue()
+
+
+@register_exporter
+class ThreeJsonExporter(_CadQueryMeshExporter):
+    name = 'json'
+    description = 'Three.js JSON format'
+    extension = 'json'
+
+    def export(self, job, options):
+        points, faces = self._tessellate(job, options)
+        mesher = JsonMesh()
+        for v in points:
+            mesher.addVertex(v.x, v.y, v.z)
+        for face in faces:
+            mesher.addTriangleFace(*face)
+        yield self.path(job.name), mesher.toJson().encode('utf-8')
+
+
+@register_exporter
+class GlbExporter(ExporterPlugin):
+    name = 'glb'
+    description = 'Binary glTF for the web viewer'
+    extension = 'glb'
+    needs = MESH
+    profile = 'web'
+
+    def export(self, job, options):
+        # Quantized binary glTF for the browser viewer
+        vertices, triangles = job.mesh(self)
+        writer = GlbWriter()
+        writer.add_mesh(job.name, vertices, triangles)
+        yield self.path(job.name), writer.to_bytes()
+
+
+@register_exporter
+class LodExporter(ExporterPlugin):
+    name = 'lod'
+    description = 'GLB level-of-detail chains for progressive loading'
+    extension = 'glb'
+    needs = MESH
+    profile = 'web'
+    default_options = {'ratios': LOD_RATIOS, 'max_error': LOD_MAX_ERROR}
+
+    def export(self, job, options):
+        # Coarsest levels load first in the viewer, then refine
+        levels = job.lod_chain(self, options['ratios'], options['max_error'])
+        stats = job.exporter.mesh_stats[job.name][self.name]
+        stats['levels'] = []
+        for i, level in enumerate(levels):
+            path = self.path(job.name, f'_lod{i}')
+            mesh = (level['vertices'], level['triangles'])
+            if i > 0:
+                mesh = flat_shaded(*mesh)
+            writer = GlbWriter()
+            writer.add_mesh(job.name, *mesh)
+            stats['levels'].append({
+                'level': i,
+                'ratio': level['ratio'],
+                'triangles': level['triangle_count'],
+                'error': round(level['error'], 4),
+                'path': os.path.join(job.exporter.output_root, path)
+            })
+            yield path, writer.to_bytes()
+
+
+@register_exporter
+class MeshStoreExporter(ExporterPlugin):
+    name = 'meshstore'
+    description = 'Memory-mappable .npy mesh arrays for analysis and serving'
+    extension = 'npy'
+    directory = STORE_DIR
+    needs = MESH
+    profile = 'web'
+    default_options = {'ratios': LOD_RATIOS, 'max_error': LOD_MAX_ERROR}
+
+    def export(self, job, options):
+        # Same LOD chain as the GLB levels, as raw arrays plus a JSON header
+        levels = []
+        for i, level in enumerate(job.lod_chain(self, options['ratios'], options['max_error'])):
+            if i > 0:
+                vertices, triangles = flat_shaded(level['vertices'], level['triangles'])
+                level = dict(level, vertices=vertices, triangles=triangles)
+            levels.append(level)
+        yield from iter_store_files(job.name, levels, self.output_dir)
+
+
+@register_exporter
+class PngExporter(ExporterPlugin):
+    name = 'png'
+    description = 'PNG images for documentation'
+    extension = 'png'
+    needs = MESH
+    profile = 'preview'
+    default_options = {'views': PNG_VIEWS, 'sizes': PNG_SIZES}
+
+    def export(self, job, options):
+        # Shaded preview images and thumbnails, rendered on the CPU
+        vertices, triangles = job.mesh(self)
+        images = iter_part_images(job.name, vertices, triangles,
+                                  options['views'], options['sizes'])
+        for file_name, data in images:
+            yield f'{self.output_dir}/{file_name}', data
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Dolly Robot - Streaming Export Sinks
+DollyExporter.stream_format() yields (relative_path, data) pairs, where
+data is bytes or an iterator of byte chunks. A sink writes them straight
+to their destination - a directory, a zip or a tar archive - so release
+bundles are built in one pass, with no intermediate files on disk.
+"""
+
+import gzip
+import io
+import os
+import queue
+import tarfile
+import threading
+import time
+import zipfile
+
+
+# Zip timestamps start in 1980
+ZIP_EPOCH = 315532800
+
+
+def archive_time():
+    """Entry timestamp for reproducible archives: SOURCE_DATE_EPOCH, or the epoch"""
+    return int(os.environ.get('SOURCE_DATE_EPOCH', 0))
+
+
+def iter_chunks(data):
+    """Treat bytes and chunk iterators alike"""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        yield bytes(data)
+    else:
+        for chunk in data:
+            yield chunk
+
+
+class DirectorySink:
+    """Write each entry to a file under a root directory"""
+
+    def __init__(self, root):
+        self.root = root
+
+    def add(self, relative_path, data):
+        """Write one entry; returns the file path"""
+        path = os.path.join(self.root, relative_path)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'wb') as f:
+            for chunk in iter_chunks(data):
+                f.write(chunk)
+        return path
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _ArchiveSink:
+    """Archive sink that can compress in a background thread
+
+    With background=True, entries are handed to a writer thread through a
+    small queue, so compressing one file overlaps generating the next.
+    """
+
+    def __init__(self, background=True, queue_size=8):
+        self.names = []
+        self._error = None
+        self._queue = None
+        if background:
+            self._queue = queue.Queue(queue_size)
+            self._thread = threading.Thread(target=self._drain, daemon=True)
+            self._thread.start()
+
+    def _drain(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if self._error is None:
+                try:
+                    self._write(*item)
+                except Exception as error:
+                    self._error = error
+
+    def _check(self):
+        if self._error is not None:
+            raise self._error
+
+    def add(self, relative_path, data):
+        """Add one entry; returns its name in the archive"""
+        self._check()
+        name = relative_path.replace(os.sep, '/')
+        if self._queue is not None:
+            self._queue.put((name, data))
+        else:
+            self._write(name, data)
+        self.names.append(name)
+        return name
+
+    def close(self):
+        """Flush pending entries and finish the archive"""
+        if self._queue is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._queue = None
+        self._finish()
+        self._check()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ZipSink(_ArchiveSink):
+    """Stream entries into a zip file; chunk iterators are never joined"""
+
+    def __init__(self, path, compression=zipfile.ZIP_DEFLATED, compresslevel=6,
+                 background=True):
+        self.path = path
+        self.compression = compression
+        self._zip = zipfile.ZipFile(path, 'w', compression, compresslevel=compresslevel)
+        super().__init__(background)
+
+    def _write(self, name, data):
+        info = zipfile.ZipInfo(name, time.gmtime(max(archive_time(), ZIP_EPOCH))[:6])
+        info.compress_type = self.compression
+        with self._zip.open(info, 'w', force_zip64=True) as f:
+            for chunk in iter_chunks(data):
+                f.write(chunk)
+
+    def _finish(self):
+        self._zip.close()
+
+
+class TarSink(_ArchiveSink):
+    """Stream entries into a tar file (mode 'w', 'w:gz', 'w:bz2' or 'w:xz')
+
+    Tar headers need each entry's size up front, so chunked entries are
+    joined in memory one at a time.
+    """
+
+    def __init__(self, path, mode='w:gz', background=True):
+        self.path = path
+        self._gzip = None
+        if mode == 'w:gz':
+            # tarfile stamps the gzip header with the current time
+            self._gzip = gzip.GzipFile(path, 'wb', mtime=archive_time())
+            self._tar = tarfile.open(fileobj=self._gzip, mode='w')
+        else:
+            self._tar = tarfile.open(path, mode)
+        super().__init__(background)
+
+    def _write(self, name, data):
+        data = b''.join(iter_chunks(data))
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = archive_time()
+        info.mode = 0o644
+        self._tar.addfile(info, io.BytesIO(data))
+
+    def _finish(self):
+        self._tar.close()
+        if self._gzip is not None:
+            self._gzip.close()
+
+
+def open_sink(target, background=True):
+    """Pick a sink from the target name: .zip, .tar[.gz|.bz2|.xz] or a directory"""
+    if target.endswith('.zip'):
+        return ZipSink(target, background=background)
+    for suffix, mode in (('.tar.gz', 'w:gz'), ('.tgz', 'w:gz'), ('.tar.bz2', 'w:bz2'),
+                         ('.tar.xz', 'w:xz'), ('.tar', 'w')):
+        if target.endswith(suffix):
+            return TarSink(target, mode, background=background)
+    return DirectorySink(target)
+
+
+def write_stream(entries, sink):
+    """Send every (relative_path, data) entry to a sink; returns what was added"""
+    return [sink.add(relative_path, data) for relative_path, data in entries]
+
+
+# Build a release bundle of the robot's parts in a single pass
+if __name__ == "__main__":
+    import sys
+    from dolly_assembly import DollyRobotAssembly
+    from multi_format_export import DollyExporter
+
+    target = sys.argv[1] if len(sys.argv) > 1 else 'dolly_release.zip'
+    formats = ['step', 'stl', 'svg']
+
+    dolly = DollyRobotAssembly()
+    parts = [('dolly_complete_assembly', dolly.assemble_robot())]
+    parts += [(name, part) for name, part, _ in dolly.web_components()]
+
+    print(f"Streaming {len(parts)} parts ({', '.join(formats)}) into {target}...")
+    start = time.perf_counter()
+    with DollyExporter() as exporter, open_sink(target) as sink:
+        for name, part in parts:
+            added = write_stream(exporter.stream_all_formats(part, name, formats), sink)
+            print(f"  ✓ {name}: {len(added)} files")
+    print(f"\nDone in {time.perf_counter() - start:.1f}s")
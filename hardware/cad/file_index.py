@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Dolly Robot - Part File Index
+One shared index of the exported files under hardware/ (STEP, STL, SVG,
+GLB, ...) with each file's size, mtime and SHA-256, persisted in
+hardware/.file_index.json. Tools query it instead of walking the tree.
+
+Opening the index revalidates it incrementally: only directories whose
+mtime changed are listed again, and only files whose size or mtime
+changed are hashed again. A long-running tool can keep it current with
+watch(), which uses inotify on Linux and falls back to polling.
+"""
+
+import ctypes
+import ctypes.util
+import hashlib
+import json
+import os
+import select
+import struct
+import sys
+import threading
+
+# hardware/, wherever the tools are run from
+INDEX_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+INDEX_FILE = '.file_index.json'
+
+# Bump when the entry layout changes, to rebuild old indexes
+INDEX_VERSION = 1
+
+# Everything DollyExporter and the part scripts write
+INDEXED_EXTENSIONS = (
+    '.step', '.stp', '.stl', '.svg', '.svgz', '.dxf', '.wrl', '.amf',
+    '.json', '.glb', '.png', '.pdf', '.npy'
+)
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FileIndex:
+    """Size, mtime and hash of every indexed file under a root directory"""
+
+    def __init__(self, root=INDEX_ROOT, index_path=None, extensions=INDEXED_EXTENSIONS):
+        self.root = root
+        self.index_path = index_path or os.path.join(root, INDEX_FILE)
+        self.extensions = tuple(extensions)
+        # Relative file path -> {'size', 'mtime_ns', 'sha256'}
+        self.files = {}
+        # Relative directory path -> {'mtime_ns', 'files', 'dirs'}
+        self.dirs = {}
+        self.dirty = False
+        self._lock = threading.RLock()
+        self._watcher = None
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_path) as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        if stored.get('version') == INDEX_VERSION and stored.get('extensions') == list(self.extensions):
+            self.files = stored['files']
+            self.dirs = stored['dirs']
+
+    def save(self):
+        """Write the index if anything changed since it was loaded or saved"""
+        with self._lock:
+            if not self.dirty:
+                return
+            os.makedirs(os.path.dirname(self.index_path) or '.', exist_ok=True)
+            temporary = f'{self.index_path}.{os.getpid()}.tmp'
+            with open(temporary, 'w') as f:
+                json.dump({'version': INDEX_VERSION, 'extensions': list(self.extensions),
+                           'files': self.files, 'dirs': self.dirs}, f)
+            os.replace(temporary, self.index_path)
+            self.dirty = False
+
+    def _indexed(self, name):
+        return not name.startswith('.') and os.path.splitext(name)[1].lower() in self.extensions
+
+    def _list(self, relative_dir, stat):
+        files, dirs = [], []
+        with os.scandir(os.path.join(self.root, relative_dir)) as entries:
+            for entry in entries:
+                relative = os.path.join(relative_dir, entry.name) if relative_dir else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if not entry.name.startswith('.') and entry.name != '__pycache__':
+                        dirs.append(relative)
+                elif self._indexed(entry.name):
+                    files.append(relative)
+        self.dirs[relative_dir] = {'mtime_ns': stat.st_mtime_ns,
+                                   'files': sorted(files), 'dirs': sorted(dirs)}
+        self.dirty = True
+
+    def _update_file(self, relative, changes):
+        try:
+            stat = os.stat(os.path.join(self.root, relative))
+        except FileNotFoundError:
+            self._remove_file(relative, changes)
+            return
+        entry = self.files.get(relative)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return
+        self.files[relative] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': file_hash(os.path.join(self.root, relative)),
+        }
+        changes['changed' if entry else 'added'].append(relative)
+        self.dirty = True
+
+    def _remove_file(self, relative, changes):
+        if self.files.pop(relative, None) is not None:
+            changes['removed'].append(relative)
+            self.dirty = True
+
+    def refresh(self, relative_dir=''):
+        """Bring the index up to date; returns {'added', 'changed', 'removed'}
+
+        Directories are listed again only when their mtime changed (a file
+        was added, removed or renamed); other files are just stat()ed.
+        """
+        changes = {'added': [], 'changed': [], 'removed': []}
+        with self._lock:
+            seen_dirs, seen_files = set(), set()
+            stack = [relative_dir]
+            while stack:
+                current = stack.pop()
+                try:
+                    stat = os.stat(os.path.join(self.root, current))
+                except FileNotFoundError:
+                    continue
+                known = self.dirs.get(current)
+                if not known or known['mtime_ns'] != stat.st_mtime_ns:
+                    self._list(current, stat)
+                listing = self.dirs[current]
+                seen_dirs.add(current)
+                for relative in listing['files']:
+                    seen_files.add(relative)
+                    self._update_file(relative, changes)
+                stack.extend(listing['dirs'])
+
+            prefix = relative_dir + os.sep if relative_dir else ''
+            for relative in [d for d in self.dirs if d.startswith(prefix) or d == relative_dir]:
+                if relative not in seen_dirs:
+                    del self.dirs[relative]
+                    self.dirty = True
+            for relative in [f for f in self.files if f.startswith(prefix)]:
+                if relative not in seen_files:
+                    self._remove_file(relative, changes)
+        return changes
+
+    def update_paths(self, paths):
+        """Re-check specific files after change events (paths as on disk, e.g. hardware/stl/x.stl)"""
+        changes = {'added': [], 'changed': [], 'removed': []}
+        with self._lock:
+            for path in paths:
+                relative = os.path.relpath(path, self.root)
+                directory, name = os.path.split(relative)
+                if not self._indexed(name):
+                    continue
+                listing = self.dirs.get(directory)
+                if os.path.exists(os.path.join(self.root, relative)):
+                    if listing is not None and relative not in listing['files']:
+                        listing['files'] = sorted(listing['files'] + [relative])
+                    self._update_file(relative, changes)
+                else:
+                    if listing is not None and relative in listing['files']:
+                        listing['files'] = [f for f in listing['files'] if f != relative]
+                    self._remove_file(relative, changes)
+        return changes
+
+    def query(self, extensions=None, under=''):
+        """Sorted paths (including the root) of indexed files, optionally filtered"""
+        extensions = tuple(e.lower() for e in extensions) if extensions else None
+        prefix = under.rstrip('/') + '/' if under else ''
+        with self._lock:
+            return sorted(
+                os.path.join(self.root, relative) for relative in self.files
+                if relative.replace(os.sep, '/').startswith(prefix)
+                and (extensions is None or os.path.splitext(relative)[1].lower() in extensions)
+            )
+
+    def entry(self, path):
+        """{'size', 'mtime_ns', 'sha256'} for an indexed file, or None"""
+        relative = os.path.relpath(path, self.root)
+        with self._lock:
+            return self.files.get(relative)
+
+    def watch(self, on_change=None, interval=1.0):
+        """Keep the index current in a background thread until close()
+
+        on_change(changes) is called after each batch of changes, where
+        changes maps 'added', 'changed' and 'removed' to relative paths.
+        """
+        if self._watcher is None:
+            self._watcher = IndexWatcher(self, on_change, interval)
+            self._watcher.start()
+        return self._watcher
+
+    def close(self):
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+        self.save()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+_EVENT = struct.Struct('iIII')
+
+
+class Inotify:
+    """Minimal inotify binding through ctypes (Linux only)"""
+
+    def __init__(self):
+        if not sys.platform.startswith('linux'):
+            raise OSError("inotify is only available on Linux")
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # Watch descriptor -> directory path
+        self.watches = {}
+
+    def add(self, directory, mask=WATCH_MASK):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self.watches[wd] = directory
+        return wd
+
+    def read(self, timeout):
+        """[(directory, mask, name)] of pending events, waiting up to timeout seconds"""
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0').decode(errors='surrogateescape')
+            offset += length
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            events.append((self.watches.get(wd), mask, name))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class IndexWatcher:
+    """Background thread applying file system changes to a FileIndex"""
+
+    def __init__(self, index, on_change=None, interval=1.0):
+        self.index = index
+        self.on_change = on_change
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        try:
+            self._inotify = Inotify()
+            self.mode = 'inotify'
+        except (OSError, AttributeError):
+            self._inotify = None
+            self.mode = 'polling'
+
+    def start(self):
+        if self._inotify is not None:
+            self._watch_tree(self.index.root)
+        run = self._run_inotify if self._inotify is not None else self._run_polling
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self._inotify is not None:
+            self._inotify.close()
+
+    def _watch_tree(self, directory):
+        for current, dirs, _ in os.walk(directory):
+            dirs[:] = [d for d in dirs if not d.startswith('.') and d != '__pycache__']
+            self._inotify.add(current)
+
+    def _publish(self, changes):
+        if any(changes.values()):
+            self.index.save()
+            if self.on_change:
+                self.on_change(changes)
+
+    def _run_polling(self):
+        while not self._stop.wait(self.interval):
+            self._publish(self.index.refresh())
+
+    def _run_inotify(self):
+        while not self._stop.is_set():
+            events = self._inotify.read(self.interval)
+            if not events:
+                continue
+            paths, new_dirs, rescan = set(), [], False
+            for directory, mask, name in events:
+                if directory is None or mask & IN_Q_OVERFLOW:
+                    rescan = True
+                elif mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        new_dirs.append(os.path.join(directory, name))
+                    rescan = rescan or bool(mask & (IN_DELETE | IN_MOVED_FROM))
+                elif name and not mask & IN_CREATE:
+                    # New files are picked up when they are closed after writing
+                    paths.add(os.path.join(directory, name))
+
+            for directory in new_dirs:
+                self._watch_tree(directory)
+            if rescan or new_dirs:
+                changes = self.index.refresh()
+            else:
+                changes = self.index.update_paths(sorted(paths))
+            self._publish(changes)
+
+
+def open_index(root=INDEX_ROOT):
+    """The shared index of a tree, brought up to date and saved"""
+    index = FileIndex(root)
+    index.refresh()
+    index.save()
+    return index
+
+
+def find_files(directory, extensions):
+    """Indexed files with the given extensions anywhere under a directory
+
+    Directories inside hardware/ are answered from the shared index;
+    anything else is simply listed, so no index file is written into
+    the caller's tree.
+    """
+    relative = os.path.relpath(directory, INDEX_ROOT)
+    if relative == '.' or not relative.startswith('..'):
+        under = '' if relative == '.' else relative
+        base = os.path.join(INDEX_ROOT, under)
+        # Paths as the caller named the directory, e.g. hardware/step/x.step
+        return [os.path.join(directory, os.path.relpath(path, base))
+                for path in open_index(INDEX_ROOT).query(extensions, under)]
+
+    extensions = tuple(e.lower() for e in extensions)
+    found = []
+    for current, dirs, files in os.walk(directory):
+        dirs[:] = [name for name in dirs if not name.startswith('.')]
+        found += [os.path.join(current, name) for name in files
+                  if not name.startswith('.') and os.path.splitext(name)[1].lower() in extensions]
+    return sorted(found)
+
+
+# Show what the index holds, or watch the tree with --watch
+if __name__ == "__main__":
+    import time
+
+    start = time.perf_counter()
+    index = open_index(sys.argv[1] if len(sys.argv) > 1 and not sys.argv[1].startswith('-')
+                       else INDEX_ROOT)
+    by_extension = {}
+    for relative in index.files:
+        extension = os.path.splitext(relative)[1].lower()
+        by_extension[extension] = by_extension.get(extension, 0) + 1
+    print(f"📁 {len(index.files)} files under {index.root} "
+          f"(indexed in {(time.perf_counter() - start) * 1000:.1f} ms)")
+    for extension, count in sorted(by_extension.items()):
+        print(f"  {extension}: {count}")
+
+    if '--watch' in sys.argv:
+        def report(changes):
+            for kind, paths in changes.items():
+                for path in paths:
+                    print(f"  {kind}: {path}")
+
+        watcher = index.watch(report)
+        print(f"\n👀 Watching {index.root} ({watcher.mode}), Ctrl+C to stop")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            index.close()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Dolly Robot - GLB Exporter
+Binary glTF files for the browser viewer.
+Positions and normals are quantized (KHR_mesh_quantization), meshes are
+reordered for GPU cache locality, and repeated parts are drawn with
+EXT_mesh_gpu_instancing instead of being duplicated in the file.
+"""
+
+import json
+import struct
+
+import numpy as np
+
+from tessellation import vertex_normals
+
+GLB_MAGIC = 0x46546C67  # "glTF"
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+
+# glTF enums
+BYTE = 5120
+UNSIGNED_SHORT = 5123
+UNSIGNED_INT = 5125
+FLOAT = 5126
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+
+
+def _spread_bits(x):
+    """Spread the low 10 bits of x so two zero bits sit between each"""
+    x = x.astype(np.uint32) & 0x3FF
+    x = (x | (x << 16)) & 0x030000FF
+    x = (x | (x << 8)) & 0x0300F00F
+    x = (x | (x << 4)) & 0x030C30C3
+    x = (x | (x << 2)) & 0x09249249
+    return x
+
+
+def optimize_mesh(vertices, triangles):
+    """Reorder a mesh for GPU vertex cache and fetch locality
+
+    Triangles are sorted along a Morton (Z-order) curve through their
+    centroids so neighbours are drawn together, then vertices are
+    renumbered in first-use order of the new index buffer (the same
+    vertex fetch optimisation meshoptimizer does). Unused vertices are
+    dropped.
+    """
+    if len(triangles) == 0:
+        return vertices, triangles
+
+    centroids = vertices[triangles].mean(axis=1)
+    low = centroids.min(axis=0)
+    extent = float(np.ptp(centroids, axis=0).max()) or 1.0
+    cells = ((centroids - low) / extent * 1023).astype(np.uint32)
+    codes = (
+        _spread_bits(cells[:, 0])
+        | (_spread_bits(cells[:, 1]) << 1)
+        | (_spread_bits(cells[:, 2]) << 2)
+    )
+    triangles = triangles[np.argsort(codes, kind='stable')]
+
+    used, first_use = np.unique(triangles.ravel(), return_index=True)
+    order = used[np.argsort(first_use)]
+    remap = np.zeros(len(vertices), dtype=np.uint32)
+    remap[order] = np.arange(len(order), dtype=np.uint32)
+
+    return vertices[order], remap[triangles]
+
+
+def quantize_positions(vertices):
+    """Quantize positions to uint16 on a uniform grid over the bounding box
+
+    Returns (quantized, offset, scale) where vertex = quantized * scale + offset.
+    The fourth component is padding so every vertex is 4-byte aligned.
+    """
+    offset = vertices.min(axis=0)
+    extent = float(np.ptp(vertices, axis=0).max()) or 1.0
+    scale = extent / 65535.0
+
+    quantized = np.zeros((len(vertices), 4), dtype=np.uint16)
+    quantized[:, :3] = np.rint((vertices - offset) / scale)
+    return quantized, offset, scale
+
+
+def quantize_normals(normals):
+    """Quantize unit normals to normalized int8 (plus one padding byte)"""
+    quantized = np.zeros((len(normals), 4), dtype=np.int8)
+    quantized[:, :3] = np.rint(np.clip(normals, -1.0, 1.0) * 127)
+    return quantized
+
+
+def _rotate(quaternion, vector):
+    """Rotate a vector by an (x, y, z, w) unit quaternion"""
+    q = np.asarray(quaternion, dtype=np.float64)
+    v = np.asarray(vector, dtype=np.float64)
+    t = 2.0 * np.cross(q[:3], v)
+    return v + q[3] * t + np.cross(q[:3], t)
+
+
+class GlbWriter:
+    """Collect meshes and write them as a single .glb file"""
+
+    def __init__(self):
+        self.gltf = {
+            'asset': {'version': '2.0', 'generator': 'Dolly Robot glb_export'},
+            'scene': 0,
+            'scenes': [{'nodes': []}],
+            'nodes': [],
+            'meshes': [],
+            'materials': [],
+            'accessors': [],
+            'bufferViews': [],
+        }
+        self.blob = bytearray()
+        self.extensions = {'KHR_mesh_quantization'}
+
+    def _add_view(self, data, target=None, stride=None):
+        while len(self.blob) % 4:
+            self.blob.append(0)
+
+        view = {'buffer': 0, 'byteOffset': len(self.blob), 'byteLength': len(data)}
+        if target is not None:
+            view['target'] = target
+        if stride is not None:
+            view['byteStride'] = stride
+
+        self.blob.extend(data)
+        self.gltf['bufferViews'].append(view)
+        return len(self.gltf['bufferViews']) - 1
+
+    def _add_accessor(self, view, component_type, count, accessor_type, **extra):
+        accessor = {
+            'bufferView': view,
+            'componentType': component_type,
+            'count': int(count),
+            'type': accessor_type,
+        }
+        accessor.update(extra)
+        self.gltf['accessors'].append(accessor)
+        return len(self.gltf['accessors']) - 1
+
+    def add_mesh(self, name, vertices, triangles, instances=None, rotations=None,
+                 color=(0.7, 0.7, 0.75, 1.0)):
+        """Add a mesh to the scene
+
+        instances is an optional list of (x, y, z) translations. When given,
+        the mesh is stored once and drawn at every translation via
+        EXT_mesh_gpu_instancing; rotations can add an (x, y, z, w)
+        quaternion per instance.
+        """
+        vertices = np.asarray(vertices, dtype=np.float64)
+        triangles = np.asarray(triangles, dtype=np.uint32)
+        vertices, triangles = optimize_mesh(vertices, triangles)
+
+        positions, offset, scale = quantize_positions(vertices)
+        normals = quantize_normals(vertex_normals(vertices, triangles))
+
+        if len(vertices) < 65536:
+            indices, index_type = triangles.astype(np.uint16), UNSIGNED_SHORT
+        else:
+            indices, index_type = triangles, UNSIGNED_INT
+
+        index_view = self._add_view(indices.tobytes(), ELEMENT_ARRAY_BUFFER)
+        position_view = self._add_view(positions.tobytes(), ARRAY_BUFFER, stride=8)
+        normal_view = self._add_view(normals.tobytes(), ARRAY_BUFFER, stride=4)
+
+        index_accessor = self._add_accessor(index_view, index_type, indices.size, 'SCALAR')
+        position_accessor = self._add_accessor(
+            position_view, UNSIGNED_SHORT, len(positions), 'VEC3',
+            min=positions[:, :3].min(axis=0).tolist(),
+            max=positions[:, :3].max(axis=0).tolist(),
+        )
+        normal_accessor = self._add_accessor(
+            normal_view, BYTE, len(normals), 'VEC3', normalized=True
+        )
+
+        self.gltf['materials'].append({
+            'name': name,
+            'pbrMetallicRoughness': {
+                'baseColorFactor': list(color),
+                'metallicFactor': 0.1,
+                'roughnessFactor': 0.7,
+            },
+        })
+        self.gltf['meshes'].append({
+            'name': name,
+            'primitives': [{
+                'attributes': {'POSITION': position_accessor, 'NORMAL': normal_accessor},
+                'indices': index_accessor,
+                'material': len(self.gltf['materials']) - 1,
+            }],
+        })
+
+        # The node transform dequantizes the positions
+        node = {
+            'name': name,
+            'mesh': len(self.gltf['meshes']) - 1,
+            'translation': offset.tolist(),
+            'scale': [scale, scale, scale],
+        }
+        if instances is not None:
+            node['extensions'] = {
+                'EXT_mesh_gpu_instancing': self._instance_attributes(
+                    instances, rotations, offset, scale
+                )
+            }
+            self.extensions.add('EXT_mesh_gpu_instancing')
+
+        self.gltf['nodes'].append(node)
+        self.gltf['scenes'][0]['nodes'].append(len(self.gltf['nodes']) - 1)
+
+    def _instance_attributes(self, instances, rotations, offset, scale):
+        # Instance transforms are applied before the node's dequantization
+        # transform, so fold the offset and scale into each translation.
+        translations = np.asarray(instances, dtype=np.float64).reshape(-1, 3)
+        if rotations is None:
+            rotated_offsets = np.tile(offset, (len(translations), 1))
+        else:
+            rotated_offsets = np.array([_rotate(q, offset) for q in rotations])
+        translations = (translations + rotated_offsets - offset) / scale
+
+        attributes = {}
+        data = translations.astype(np.float32)
+        view = self._add_view(data.tobytes())
+        attributes['TRANSLATION'] = self._add_accessor(view, FLOAT, len(data), 'VEC3')
+
+        if rotations is not None:
+            data = np.asarray(rotations, dtype=np.float32).reshape(-1, 4)
+            view = self._add_view(data.tobytes())
+            attributes['ROTATION'] = self._add_accessor(view, FLOAT, len(data), 'VEC4')
+
+        return {'attributes': attributes}
+
+    def to_bytes(self):
+        """Serialize the scene as GLB bytes"""
+        gltf = dict(self.gltf)
+        gltf['extensionsUsed'] = sorted(self.extensions)
+        gltf['extensionsRequired'] = sorted(self.extensions)
+
+        binary = bytes(self.blob) + b'\x00' * (-len(self.blob) % 4)
+        gltf['buffers'] = [{'byteLength': len(binary)}]
+
+        text = json.dumps(gltf, separators=(',', ':')).encode('utf-8')
+        text += b' ' * (-len(text) % 4)
+
+        total = 12 + 8 + len(text) + 8 + len(binary)
+        return b''.join([
+            struct.pack('<III', GLB_MAGIC, 2, total),
+            struct.pack('<II', len(text), CHUNK_JSON), text,
+            struct.pack('<II', len(binary), CHUNK_BIN), binary,
+        ])
+
+    def write(self, path):
+        """Write the scene to a .glb file"""
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
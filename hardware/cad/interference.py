@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Dolly Robot - Interference Check
+Finds parts of the robot assembly that overlap, touch or come closer
+than a minimum clearance. Each placed component is meshed and a
+bounding-volume hierarchy (BVH) is built over its triangles; a BVH over
+the components' bounding boxes finds pairs that may be close, and the two
+triangle hierarchies of each such pair are walked together to confirm
+that some of their surfaces really are. Only the pairs that survive -
+plus the rare part entirely inside another - get the exact (and slow)
+OCC checks: the volume of their common solid and their minimum distance.
+"""
+
+import sys
+import time
+
+import cadquery as cq
+import numpy as np
+
+from dolly_assembly import DollyRobotAssembly
+from tessellation import tessellate_for, to_shape
+
+# Pairs closer than this (mm) are reported
+MIN_CLEARANCE = 10.0
+
+# Common volume (mm³) below which two parts only touch
+TOUCH_VOLUME = 1e-3
+
+# Triangles per BVH leaf
+LEAF_SIZE = 8
+
+
+class Bvh:
+    """Bounding volume hierarchy over axis-aligned boxes
+
+    Nodes are stored in flat arrays; node 0 is the root. A leaf (left
+    == -1) holds items[first:first + count]; an inner node's children are
+    its left and right nodes.
+    """
+
+    def __init__(self, lower, upper, leaf_size=LEAF_SIZE):
+        self.lower = np.asarray(lower, dtype=np.float64)
+        self.upper = np.asarray(upper, dtype=np.float64)
+        centers = (self.lower + self.upper) / 2
+        self.items = np.arange(len(self.lower))
+
+        node_lower, node_upper, first, count, left, right = [], [], [], [], [], []
+        stack = [(0, len(self.items), -1, False)]
+        while stack:
+            start, end, parent, is_right = stack.pop()
+            index = len(first)
+            if parent >= 0:
+                (right if is_right else left)[parent] = index
+            items = self.items[start:end]
+            node_lower.append(self.lower[items].min(axis=0))
+            node_upper.append(self.upper[items].max(axis=0))
+            first.append(start)
+            count.append(end - start)
+            left.append(-1)
+            right.append(-1)
+            if end - start <= leaf_size:
+                continue
+            # Median split along the longest axis of the centers
+            spread = centers[items]
+            axis = int(np.argmax(spread.max(axis=0) - spread.min(axis=0)))
+            order = np.argsort(spread[:, axis], kind='stable')
+            self.items[start:end] = items[order]
+            middle = (start + end) // 2
+            stack.append((middle, end, index, True))
+            stack.append((start, middle, index, False))
+
+        self.node_lower = np.array(node_lower)
+        self.node_upper = np.array(node_upper)
+        self.first = np.array(first)
+        self.count = np.array(count)
+        self.left = np.array(left)
+        self.right = np.array(right)
+
+    @classmethod
+    def from_triangles(cls, vertices, triangles, leaf_size=LEAF_SIZE):
+        corners = vertices[triangles]
+        return cls(corners.min(axis=1), corners.max(axis=1), leaf_size)
+
+    def _near(self, a, other, b, margin):
+        return bool(np.all(self.node_lower[a] - margin <= other.node_upper[b])
+                    and np.all(other.node_lower[b] - margin <= self.node_upper[a]))
+
+    def pairs(self, other, margin=0.0, first=False):
+        """(item, other item) pairs whose boxes are within margin of each other
+
+        With other the tree itself, each pair of different items is listed
+        once. With first, stops at the first pair found.
+        """
+        same = other is self
+        found = []
+        stack = [(0, 0)] if self._near(0, other, 0, margin) else []
+        while stack:
+            a, b = stack.pop()
+            a_leaf, b_leaf = self.left[a] < 0, other.left[b] < 0
+            if a_leaf and b_leaf:
+                mine = self.items[self.first[a]:self.first[a] + self.count[a]]
+                theirs = other.items[other.first[b]:other.first[b] + other.count[b]]
+                near = np.all(
+                    (self.lower[mine][:, None] - margin <= other.upper[theirs][None])
+                    & (other.lower[theirs][None] - margin <= self.upper[mine][:, None]),
+                    axis=2)
+                for i, j in zip(*np.nonzero(near)):
+                    pair = (int(mine[i]), int(theirs[j]))
+                    if same:
+                        if a == b and pair[0] >= pair[1]:
+                            continue
+                        pair = tuple(sorted(pair))
+                    found.append(pair)
+                    if first:
+                        return found
+                continue
+            # Descend into the larger node (both, for a node against itself)
+            if same and a == b:
+                low, high = self.left[a], self.right[a]
+                stack += [(low, low), (high, high)]
+                if self._near(low, self, high, margin):
+                    stack.append((low, high))
+                continue
+            if b_leaf or (not a_leaf and self.count[a] >= other.count[b]):
+                candidates = [(self.left[a], b), (self.right[a], b)]
+            else:
+                candidates = [(a, other.left[b]), (a, other.right[b])]
+            stack += [(x, y) for x, y in candidates if self._near(x, other, y, margin)]
+        return found
+
+
+def placed_components(assembly=None):
+    """[(label, shape)] for every placed part of the robot assembly
+
+    Instanced parts get one entry per placement, labelled 'caster[2]'.
+    """
+    assembly = assembly or DollyRobotAssembly()
+    placed = []
+    for name, part, instances in assembly.web_components():
+        shape = to_shape(part)
+        if not instances:
+            placed.append((name, shape))
+            continue
+        for number, position in enumerate(instances, start=1):
+            placed.append((f'{name}[{number}]', shape.translate(cq.Vector(*position))))
+    return placed
+
+
+def _inside(shape, other):
+    """Whether a point of shape lies inside the solids of other"""
+    point = shape.Vertices()[0].Center()
+    return any(solid.isInside(point) for solid in other.Solids())
+
+
+def check_interference(components, clearance=MIN_CLEARANCE):
+    """Overlaps, contacts and close calls between placed components
+
+    Returns (report, stats): report is a list of {'a', 'b', 'status',
+    'volume', 'distance'} with status 'overlap' (common volume in mm³),
+    'touching' or 'close' (minimum distance in mm, under clearance);
+    stats counts the pairs settled at each stage.
+    """
+    meshes = []
+    for label, shape in components:
+        vertices, triangles, info = tessellate_for(shape, 'preview')
+        # Facets stray up to the deflection from the true surface
+        meshes.append((Bvh.from_triangles(vertices, triangles), info['tolerance']))
+
+    bounds = [shape.BoundingBox() for _, shape in components]
+    top = Bvh([(b.xmin, b.ymin, b.zmin) for b in bounds],
+              [(b.xmax, b.ymax, b.zmax) for b in bounds], leaf_size=2)
+    candidates = top.pairs(top, clearance)
+
+    stats = {'components': len(components),
+             'pairs': len(components) * (len(components) - 1) // 2,
+             'box_candidates': len(candidates), 'exact_checks': 0}
+    report = []
+    for i, j in candidates:
+        (label_a, a), (label_b, b) = components[i], components[j]
+        (tree_a, deflection_a), (tree_b, deflection_b) = meshes[i], meshes[j]
+        margin = clearance + deflection_a + deflection_b
+        if not (tree_a.pairs(tree_b, margin, first=True) or _inside(a, b) or _inside(b, a)):
+            continue
+
+        stats['exact_checks'] += 1
+        volume = a.intersect(b).Volume()
+        if volume > TOUCH_VOLUME:
+            report.append({'a': label_a, 'b': label_b, 'status': 'overlap',
+                           'volume': round(volume, 1), 'distance': 0.0})
+            continue
+        distance = a.distance(b)
+        if distance < clearance:
+            report.append({'a': label_a, 'b': label_b,
+                           'status': 'touching' if distance < 1e-6 else 'close',
+                           'volume': 0.0, 'distance': round(distance, 2)})
+
+    order = {'overlap': 0, 'touching': 1, 'close': 2}
+    report.sort(key=lambda r: (order[r['status']], -r['volume'], r['distance'], r['a'], r['b']))
+    return report, stats
+
+
+# python hardware/cad/interference.py [min clearance mm], from the repository root
+if __name__ == "__main__":
+    clearance = float(sys.argv[1]) if len(sys.argv) > 1 else MIN_CLEARANCE
+    start = time.perf_counter()
+    components = placed_components()
+    report, stats = check_interference(components, clearance)
+    elapsed = time.perf_counter() - start
+
+    print(f"🔍 {stats['components']} components, {stats['pairs']} pairs: "
+          f"{stats['box_candidates']} near by bounding box, "
+          f"{stats['exact_checks']} checked exactly ({elapsed:.1f}s)")
+    icons = {'overlap': '❌', 'touching': '🤝', 'close': '⚠️ '}
+    for row in report:
+        detail = (f"{row['volume']:g} mm³ overlap" if row['status'] == 'overlap'
+                  else 'in contact' if row['status'] == 'touching'
+                  else f"{row['distance']:g} mm apart")
+        print(f"  {icons[row['status']]} {row['a']} / {row['b']}: {detail}")
+    if not report:
+        print(f"  ✓ Every pair is at least {clearance:g} mm apart")
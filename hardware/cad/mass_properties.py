@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Dolly Robot - Mass Properties
+Volume, mass, center of gravity and inertia tensor of every part the
+part modules (dolly_*.py) build, and of the complete robot assembly, for
+each printable or machinable material. Parts are built and measured in
+parallel worker processes. hardware/mass_properties.json records the
+source hash of the method that built each part (see
+part_modules.method_keys), so parts whose source is unchanged are not
+even built again, and a rebuilt part is only measured if its shape
+fingerprint changed. The heavy parts are also measured at each
+material's plate thickness (6 mm aluminum, 8 mm PETG); the thickness
+they are modelled at reuses their plain measurements. Assemblies are combined
+from their components' properties with the parallel axis theorem, so
+instanced parts (wheels, casters, posts) are measured once.
+"""
+
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from OCP.BRepGProp import BRepGProp
+from OCP.GProp import GProp_GProps
+
+from export_manifest import shape_fingerprint
+from part_modules import CAD_DIR, MATERIAL_DENSITIES, method_keys, part_builders, part_module_names
+from tessellation import to_shape
+
+MASS_PROPERTIES = 'hardware/mass_properties.json'
+
+# Bump when the measurements or file layout change
+MASS_PROPERTIES_VERSION = 2
+
+# Plate thickness (mm) of DollyHeavyParts for each material it is made from
+HEAVY_PARTS_MODULE = 'dolly_heavy_parts'
+HEAVY_PARTS_THICKNESS = {
+    '6061 Aluminum': 6,
+    'PETG': 8,
+}
+
+# README: "Weight: ~15 lbs (6.8kg)"
+TARGET_MASS_KG = 6.8
+
+
+def _number(value):
+    return float(f'{value:.6g}')
+
+
+def measure(shape):
+    """Mass properties of a shape at unit density
+
+    volume in mm³, cog in mm and the inertia tensor about the center of
+    gravity in mm⁵ (multiply by a density for mass units).
+    """
+    props = GProp_GProps()
+    BRepGProp.VolumeProperties_s(to_shape(shape).wrapped, props)
+    center = props.CentreOfMass()
+    matrix = props.MatrixOfInertia()
+    return {
+        'volume': _number(props.Mass()),
+        'cog': [_number(value) for value in (center.X(), center.Y(), center.Z())],
+        'inertia': [[_number(matrix.Value(row, column)) for column in (1, 2, 3)]
+                    for row in (1, 2, 3)],
+    }
+
+
+def combine(placed):
+    """Unit-density properties of several (properties, offset) together
+
+    offset is a translation of the measured shape, or None.
+    """
+    volume = sum(props['volume'] for props, _ in placed)
+    if volume == 0:
+        return {'volume': 0.0, 'cog': [0.0, 0.0, 0.0], 'inertia': np.zeros((3, 3)).tolist()}
+    centers = [np.add(props['cog'], offset if offset is not None else 0.0)
+               for props, offset in placed]
+    cog = sum(props['volume'] * center for (props, _), center in zip(placed, centers)) / volume
+    inertia = np.zeros((3, 3))
+    for (props, _), center in zip(placed, centers):
+        d = center - cog
+        inertia += np.array(props['inertia']) + props['volume'] * (d @ d * np.eye(3) - np.outer(d, d))
+    return {
+        'volume': _number(volume),
+        'cog': [_number(value) for value in cog],
+        'inertia': [[_number(value) for value in row] for row in inertia],
+    }
+
+
+def material_properties(props, material):
+    """Mass (g) and inertia tensor (kg·m²) of unit-density properties in a material"""
+    density = MATERIAL_DENSITIES[material]  # g/cm³ = 1e-3 g/mm³
+    return {
+        'mass_g': round(props['volume'] * density / 1000, 1),
+        'inertia_kg_m2': [[_number(value * density * 1e-12) for value in row]
+                          for row in props['inertia']],
+    }
+
+
+def report(props):
+    """A stored entry: unit-density properties plus each material's mass and inertia"""
+    entry = dict(props)
+    entry['volume_cm3'] = round(props['volume'] / 1000, 3)
+    entry['materials'] = {material: material_properties(props, material)
+                          for material in MATERIAL_DENSITIES}
+    return entry
+
+
+def _source_key(module, method, is_assembly, keys):
+    """Hash of the source that builds a part (or the whole module, for an assembly)"""
+    if is_assembly:
+        return hashlib.sha256(inspect.getsource(module).encode('utf-8')).hexdigest()
+    return keys[(type(method.__self__).__name__, method.__name__)]
+
+
+def _mass_job(job):
+    """Worker: build one part or assembly and measure what isn't cached
+
+    Returns [(name, fingerprint, properties or None if cached, instances)]
+    for each shape built, or an error message.
+    """
+    module_name, target, _, thickness, known = job
+    module = importlib.import_module(module_name)
+    for name, method, is_assembly in part_builders(module):
+        if name != target:
+            continue
+        if thickness is not None:
+            method.__self__.material_thickness = thickness
+        try:
+            result = method()
+            if is_assembly:
+                shapes = [(part_name, part, instances) for part_name, part, instances in result]
+            else:
+                results = result if isinstance(result, tuple) else (result,)
+                shapes = [(name if len(results) == 1 else f'{name}_{number}', part, None)
+                          for number, part in enumerate(results, start=1)]
+            measured = []
+            for part_name, part, instances in shapes:
+                fingerprint = shape_fingerprint(part)
+                props = None if fingerprint in known else measure(part)
+                measured.append((part_name, fingerprint, props,
+                                 [list(position) for position in instances] if instances else None))
+            return measured
+        except Exception as error:
+            return f'{type(error).__name__}: {error}'
+    return f'{target} not found in {module_name}'
+
+
+class MassProperties:
+    """hardware/mass_properties.json: measured parts, assemblies and heavy-part variants"""
+
+    def __init__(self, path=MASS_PROPERTIES, cad_dir=CAD_DIR):
+        self.path = path
+        self.cad_dir = cad_dir
+        self.parts = {}
+        self.assemblies = {}
+        self.variants = {}
+        self.errors = {}
+        self.measured = []
+        self._cache = {}
+        self._sources = {}
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != MASS_PROPERTIES_VERSION:
+            return
+        groups = [(data.get('parts', {}), None, {})]
+        groups += [(assembly['components'], None, assembly.get('positions', {}))
+                   for assembly in data.get('assemblies', {}).values()]
+        groups += [(variant['parts'], variant['thickness_mm'], {})
+                   for variant in data.get('variants', {}).values()]
+        for entries, thickness, positions in groups:
+            for name, entry in entries.items():
+                self._cache[entry['fingerprint']] = {key: entry[key]
+                                                     for key in ('volume', 'cog', 'inertia')}
+                self._sources.setdefault((entry['source'], thickness), []).append(
+                    (name, entry['fingerprint'], None, positions.get(name)))
+
+    def _jobs(self):
+        """[(job, source key, thickness its plain results also stand for)]"""
+        if self.cad_dir not in sys.path:
+            sys.path.insert(0, self.cad_dir)
+        jobs = []
+        known = frozenset(self._cache)
+        for module_name in part_module_names(self.cad_dir):
+            module = importlib.import_module(module_name)
+            keys = method_keys(module)
+            for name, method, is_assembly in part_builders(module):
+                source = _source_key(module, method, is_assembly, keys)
+                if module_name != HEAVY_PARTS_MODULE or is_assembly:
+                    jobs.append(((module_name, name, is_assembly, None, known), source, None))
+                    continue
+                modelled = getattr(method.__self__, 'material_thickness', None)
+                jobs.append(((module_name, name, False, None, known), source, modelled))
+                jobs += [((module_name, name, False, thickness, known), source, None)
+                         for thickness in sorted(set(HEAVY_PARTS_THICKNESS.values()))
+                         if thickness != modelled]
+        return jobs
+
+    def _entry(self, fingerprint, props, source):
+        if props is None:
+            props = self._cache[fingerprint]
+        else:
+            self._cache[fingerprint] = props
+            self.measured.append(fingerprint)
+        entry = report(props)
+        entry['fingerprint'] = fingerprint
+        entry['source'] = source
+        return entry
+
+    def update(self, processes=None):
+        """Build and measure whatever changed; returns the number of shapes measured"""
+        jobs = self._jobs()
+        results = [self._sources.get((source, job[3])) for job, source, _ in jobs]
+        pending = [job for (job, _, _), result in zip(jobs, results) if result is None]
+        processes = processes or os.cpu_count() or 1
+        if processes < 2 or len(pending) < 2:
+            built = [_mass_job(job) for job in pending]
+        else:
+            with ProcessPoolExecutor(min(processes, len(pending))) as pool:
+                built = list(pool.map(_mass_job, pending))
+        built = iter(built)
+        results = [next(built) if result is None else result for result in results]
+
+        self.parts, self.assemblies, self.errors, self.measured = {}, {}, {}, []
+        variant_parts = {}
+        for ((_, name, is_assembly, thickness, _), source, modelled), result in zip(jobs, results):
+            if isinstance(result, str):
+                if thickness is None:
+                    self.errors[name] = result
+                continue
+            entries = {part_name: self._entry(fingerprint, props, source)
+                       for part_name, fingerprint, props, _ in result}
+            if thickness is not None:
+                variant_parts.setdefault(thickness, {}).update(entries)
+            elif is_assembly:
+                self.assemblies[name] = self._assembly(result, entries)
+                self.assemblies[name]['source'] = source
+            else:
+                self.parts.update(entries)
+                if modelled is not None:
+                    variant_parts.setdefault(modelled, {}).update(entries)
+
+        self.variants = {}
+        for material, thickness in HEAVY_PARTS_THICKNESS.items():
+            parts = dict(sorted(variant_parts.get(thickness, {}).items()))
+            self.variants[f'{material} {thickness} mm'] = {
+                'material': material,
+                'thickness_mm': thickness,
+                'mass_g': round(sum(part['materials'][material]['mass_g']
+                                    for part in parts.values()), 1),
+                'parts': parts,
+            }
+        self.parts = dict(sorted(self.parts.items()))
+        return len(self.measured)
+
+    def _assembly(self, result, entries):
+        placed = []
+        for part_name, _, _, instances in result:
+            props = entries[part_name]
+            placed += [(props, offset) for offset in instances] if instances else [(props, None)]
+        assembly = report(combine(placed))
+        assembly['components'] = entries
+        assembly['instances'] = {part_name: len(instances) if instances else 1
+                                 for part_name, _, _, instances in result}
+        assembly['positions'] = {part_name: instances
+                                 for part_name, _, _, instances in result if instances}
+        return assembly
+
+    def save(self):
+        data = json.dumps({
+            'version': MASS_PROPERTIES_VERSION,
+            'densities_g_cm3': MATERIAL_DENSITIES,
+            'parts': self.parts,
+            'assemblies': self.assemblies,
+            'variants': self.variants,
+            'errors': self.errors,
+        }, indent=1, sort_keys=True)
+        temporary = f'{self.path}.{os.getpid()}.tmp'
+        with open(temporary, 'w') as f:
+            f.write(data + '\n')
+        os.replace(temporary, self.path)
+
+
+def update_mass_properties(path=MASS_PROPERTIES, cad_dir=CAD_DIR, processes=None):
+    """Measure every part and assembly and save the results"""
+    properties = MassProperties(path, cad_dir)
+    properties.update(processes)
+    properties.save()
+    return properties
+
+
+# python hardware/cad/mass_properties.py [processes], from the repository root
+if __name__ == "__main__":
+    start = time.perf_counter()
+    properties = update_mass_properties(
+        processes=int(sys.argv[1]) if len(sys.argv) > 1 else None)
+    elapsed = time.perf_counter() - start
+    total = len(properties.parts) + sum(len(a['components']) for a in properties.assemblies.values()) \
+        + sum(len(v['parts']) for v in properties.variants.values())
+    print(f"⚖️  {total} shapes, {len(properties.measured)} measured "
+          f"({total - len(properties.measured)} cached) in {elapsed:.1f}s -> {properties.path}")
+
+    for name, assembly in properties.assemblies.items():
+        x, y, z = assembly['cog']
+        print(f"\n🤖 {name}: {assembly['volume_cm3']:g} cm³, "
+              f"CoG ({x:.1f}, {y:.1f}, {z:.1f}) mm")
+        for material, values in assembly['materials'].items():
+            kg = values['mass_g'] / 1000
+            diagonal = [values['inertia_kg_m2'][axis][axis] for axis in range(3)]
+            print(f"   {material:14} {kg:6.2f} kg ({kg * 2.20462:5.1f} lb)   "
+                  f"Ixx/Iyy/Izz {diagonal[0]:.4f} / {diagonal[1]:.4f} / {diagonal[2]:.4f} kg·m²")
+        print(f"   README estimate: ~{TARGET_MASS_KG} kg for the real robot "
+              f"(the assembly's parts are simplified solids)")
+
+    print("\n🔩 Heavy parts by plate material:")
+    for label, variant in properties.variants.items():
+        print(f"   {label:22} {variant['mass_g'] / 1000:.2f} kg ({len(variant['parts'])} parts)")
+
+    print("\n📦 Parts (PLA):")
+    for name, part in properties.parts.items():
+        x, y, z = part['cog']
+        print(f"   {name:42} {part['materials']['PLA']['mass_g']:8.1f} g   "
+              f"CoG ({x:.1f}, {y:.1f}, {z:.1f})")
+    for name, error in properties.errors.items():
+        print(f"   ⚠️  {name}: {error}")
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Dolly Robot - Level-of-Detail Meshes
+Quadric error decimation on NumPy mesh arrays.
+Each pass collapses a batch of independent cheapest edges at once,
+so a whole LOD chain builds in a few vectorized passes.
+"""
+
+import numpy as np
+
+# Default LOD chain: fraction of the full-resolution triangle count
+LOD_RATIOS = (1.0, 0.25, 0.05)
+
+# Default error ceiling as a fraction of the bounding-box diagonal.
+# A level stops short of its ratio rather than exceed it.
+LOD_MAX_ERROR = 0.02
+
+
+def weld_vertices(vertices, triangles, tolerance=1e-6):
+    """Merge coincident vertices so faces share edges across B-rep seams"""
+    keys = np.round(vertices / tolerance).astype(np.int64)
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    triangles = inverse.reshape(-1)[triangles]
+    return vertices[first], _drop_degenerate(triangles)
+
+
+def flat_shaded(vertices, triangles):
+    """Give every triangle its own corners so normals don't blend over creases"""
+    corners = vertices[triangles].reshape(-1, 3)
+    return corners, np.arange(len(corners), dtype=np.uint32).reshape(-1, 3)
+
+
+def _drop_degenerate(triangles):
+    a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    return triangles[(a != b) & (b != c) & (a != c)]
+
+
+def _face_normals(vertices, triangles):
+    corners = vertices[triangles]
+    return np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+
+
+def vertex_quadrics(vertices, triangles):
+    """Sum of squared-distance plane quadrics (4x4) at every vertex"""
+    normals = _face_normals(vertices, triangles)
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    normals = np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+
+    planes = np.hstack([normals, -np.einsum('ij,ij->i', normals, vertices[triangles[:, 0]])[:, None]])
+    face_quadrics = np.einsum('fi,fj->fij', planes, planes)
+
+    quadrics = np.zeros((len(vertices), 4, 4))
+    for k in range(3):
+        np.add.at(quadrics, triangles[:, k], face_quadrics)
+    return quadrics
+
+
+def _quadric_error(quadrics, points):
+    homogeneous = np.hstack([points, np.ones((len(points), 1))])
+    return np.einsum('ni,nij,nj->n', homogeneous, quadrics, homogeneous)
+
+
+def _edges(triangles):
+    edges = np.concatenate([triangles[:, [0, 1]], triangles[:, [1, 2]], triangles[:, [2, 0]]])
+    return np.unique(np.sort(edges, axis=1), axis=0)
+
+
+def _collapse_targets(vertices, quadrics, edges):
+    """Best collapse position and cost for every edge
+
+    Candidates are both endpoints, the midpoint and (where the quadric is
+    well conditioned) the error-minimising point.
+    """
+    a, b = edges[:, 0], edges[:, 1]
+    q = quadrics[a] + quadrics[b]
+
+    candidates = [vertices[a], vertices[b], (vertices[a] + vertices[b]) / 2]
+
+    # Flat and creased regions give singular quadrics whose "optimum"
+    # slides freely along the surface, so only trust well-conditioned
+    # solutions that land near the edge
+    system = q[:, :3, :3]
+    solvable = np.linalg.cond(system) < 1e4
+    optimal = candidates[2].copy()
+    if solvable.any():
+        solved = np.linalg.solve(system[solvable], -q[solvable, :3, 3:])[..., 0]
+        optimal[solvable] = solved
+    length = np.linalg.norm(vertices[b] - vertices[a], axis=1)
+    near = np.linalg.norm(optimal - candidates[2], axis=1) <= length
+    optimal[~near] = candidates[2][~near]
+    candidates.append(optimal)
+
+    costs = np.stack([_quadric_error(q, c) for c in candidates])
+    best = np.argmin(costs, axis=0)
+    positions = np.stack(candidates)[best, np.arange(len(edges))]
+    return positions, np.maximum(costs[best, np.arange(len(edges))], 0.0), q
+
+
+def _flipped(vertices, triangles, mapping, positions):
+    """Triangles whose normal would reverse under a vertex mapping"""
+    before = _face_normals(vertices, triangles)
+    new_triangles = mapping[triangles]
+    corners = positions[new_triangles]
+    after = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+
+    moved = np.any(new_triangles != triangles, axis=1)
+    collapsed = (
+        (new_triangles[:, 0] == new_triangles[:, 1])
+        | (new_triangles[:, 1] == new_triangles[:, 2])
+        | (new_triangles[:, 0] == new_triangles[:, 2])
+    )
+    return moved & ~collapsed & (np.einsum('ij,ij->i', before, after) <= 0)
+
+
+def _safe_collapses(vertices, triangles, edges, chosen, positions):
+    """Drop collapses that would fold a neighbouring triangle over
+
+    Returns the surviving collapses with their vertex mapping and the
+    updated vertex positions.
+    """
+    while True:
+        mapping = np.arange(len(vertices))
+        mapping[edges[chosen, 1]] = edges[chosen, 0]
+        new_positions = vertices.copy()
+        new_positions[edges[chosen, 0]] = positions[chosen]
+
+        flipped = _flipped(vertices, triangles, mapping, new_positions)
+        if len(chosen) == 0 or not flipped.any():
+            return chosen, mapping, new_positions
+
+        bad_vertices = np.unique(triangles[flipped])
+        keep = ~(np.isin(edges[chosen, 0], bad_vertices) | np.isin(edges[chosen, 1], bad_vertices))
+        chosen = chosen[keep]
+
+
+def decimate(vertices, triangles, target_triangles, quadrics=None, max_error=None,
+             max_passes=500):
+    """Reduce a welded mesh to about target_triangles triangles
+
+    Decimation stops early if every remaining collapse would push the
+    quadric error above max_error (model units).
+
+    Returns (vertices, triangles, quadrics, error) where error is the
+    largest quadric (plane distance) error of any remaining vertex, in
+    model units. Pass the returned quadrics back in to keep decimating
+    the same mesh further.
+    """
+    if quadrics is None:
+        quadrics = vertex_quadrics(vertices, triangles)
+    vertices = vertices.copy()
+
+    for _ in range(max_passes):
+        excess = len(triangles) - target_triangles
+        if excess <= 0:
+            break
+
+        edges = _edges(triangles)
+        positions, costs, edge_quadrics = _collapse_targets(vertices, quadrics, edges)
+
+        # Independent set: edges that are the cheapest at both endpoints
+        order = np.argsort(costs, kind='stable')
+        rank = np.empty(len(edges), dtype=np.int64)
+        rank[order] = np.arange(len(edges))
+        best = np.full(len(vertices), len(edges), dtype=np.int64)
+        np.minimum.at(best, edges[:, 0], rank)
+        np.minimum.at(best, edges[:, 1], rank)
+        independent = (best[edges[:, 0]] == rank) & (best[edges[:, 1]] == rank)
+        if max_error is not None:
+            independent &= costs <= max_error ** 2
+
+        # Only collapse edges among the globally cheapest ones, so a pass
+        # never spends the budget on costly edges while cheaper ones wait.
+        # Each collapse removes about two triangles; small batches keep
+        # the costs close to a one-at-a-time decimator. If every candidate
+        # would fold the surface, widen the window.
+        limit = max(min(excess // 2, len(edges) // 20), 1)
+        while True:
+            chosen = np.flatnonzero(independent & (rank < limit))
+            chosen, mapping, new_positions = _safe_collapses(
+                vertices, triangles, edges, chosen, positions
+            )
+            if len(chosen) or limit >= len(edges):
+                break
+            limit *= 2
+
+        if len(chosen) == 0:
+            break
+
+        vertices = new_positions
+        quadrics[edges[chosen, 0]] = edge_quadrics[chosen]
+        triangles = _drop_degenerate(mapping[triangles])
+        _, first = np.unique(np.sort(triangles, axis=1), axis=0, return_index=True)
+        triangles = triangles[np.sort(first)]
+
+    # Compact away vertices no triangle uses any more
+    used = np.unique(triangles)
+    remap = np.zeros(len(vertices), dtype=np.int64)
+    remap[used] = np.arange(len(used))
+    vertices, quadrics, triangles = vertices[used], quadrics[used], remap[triangles]
+
+    error = float(np.sqrt(_quadric_error(quadrics, vertices).max())) if len(vertices) else 0.0
+    return vertices, triangles, quadrics, error
+
+
+def build_lod_chain(vertices, triangles, ratios=LOD_RATIOS, max_error=None):
+    """Build a level-of-detail chain from a full-resolution mesh
+
+    Returns a list of dicts (finest first) with 'ratio', 'vertices',
+    'triangles', 'triangle_count' and 'error' (model units). Each level
+    is decimated from the previous one. max_error defaults to
+    LOD_MAX_ERROR times the bounding-box diagonal. Decimated levels are
+    welded meshes; pass them through flat_shaded() before rendering.
+    """
+    original = (np.asarray(vertices, dtype=np.float64), np.asarray(triangles, dtype=np.uint32))
+    vertices, triangles = weld_vertices(original[0], original[1].astype(np.int64))
+    if max_error is None:
+        max_error = LOD_MAX_ERROR * float(np.linalg.norm(np.ptp(vertices, axis=0)))
+
+    full_count = len(triangles)
+    quadrics = None
+    error = 0.0
+
+    levels = []
+    for ratio in sorted(ratios, reverse=True):
+        target = max(int(full_count * ratio), 4)
+        if target < len(triangles):
+            vertices, triangles, quadrics, error = decimate(
+                vertices, triangles, target, quadrics, max_error
+            )
+
+        # Undecimated levels keep the original tessellation (and its
+        # per-face normals) rather than the welded copy
+        level_vertices, level_triangles = (
+            original if quadrics is None else (vertices, triangles.astype(np.uint32))
+        )
+        levels.append({
+            'ratio': ratio,
+            'vertices': level_vertices,
+            'triangles': level_triangles,
+            'triangle_count': int(len(level_triangles)),
+            'error': error,
+        })
+    return levels
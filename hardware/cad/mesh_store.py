@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Dolly Robot - Memory-Mapped Mesh Store
+Tessellated meshes stored as raw arrays that tools map instead of parse.
+Each part gets a directory with one .npy file per array (positions,
+normals, indices) and LOD level, plus a small header.json describing
+every level: array dtypes, shapes and the byte offset where each array's
+data starts. Readers open the arrays with numpy.memmap straight from
+those offsets, so loading the whole robot costs page faults, not parsing;
+the same offsets let a web client fetch raw buffers with Range requests
+that the server answers with sendfile.
+"""
+
+import io
+import json
+import os
+
+import numpy as np
+
+from tessellation import vertex_normals
+
+STORE_DIR = 'mesh'
+HEADER_FILE = 'header.json'
+
+# Bump when the header or array layout changes
+STORE_VERSION = 1
+
+# Little-endian, fixed-width dtypes: what WebGL buffers and numpy both map
+ARRAY_DTYPES = {
+    'positions': '<f4',
+    'normals': '<f4',
+    'indices': '<u4',
+}
+
+
+def level_arrays(vertices, triangles):
+    """positions, normals and indices arrays for one mesh level"""
+    vertices = np.asarray(vertices, dtype=np.float64)
+    triangles = np.asarray(triangles, dtype=np.int64)
+    return {
+        'positions': vertices.astype(ARRAY_DTYPES['positions']),
+        'normals': vertex_normals(vertices, triangles).astype(ARRAY_DTYPES['normals']),
+        'indices': triangles.astype(ARRAY_DTYPES['indices']),
+    }
+
+
+def npy_bytes(array):
+    """An array as .npy file contents; returns (bytes, data offset)
+
+    numpy pads the .npy header to a multiple of 64 bytes, so the data
+    starts aligned for any dtype and for page-granular memory maps.
+    """
+    stream = io.BytesIO()
+    np.lib.format.write_array(stream, np.ascontiguousarray(array), allow_pickle=False)
+    data = stream.getvalue()
+    return data, len(data) - array.nbytes
+
+
+def iter_store_files(name, levels, directory=STORE_DIR):
+    """Yield (relative_path, bytes) for a part's arrays, then its header
+
+    levels is a list (finest first) of dicts with 'vertices' and
+    'triangles' and optionally 'ratio' and 'error', as returned by
+    mesh_lod.build_lod_chain(). The header comes last, so a reader that
+    finds it also finds every array it lists.
+    """
+    header = {'version': STORE_VERSION, 'name': name, 'levels': []}
+    for i, level in enumerate(levels):
+        arrays = level_arrays(level['vertices'], level['triangles'])
+        positions = arrays['positions']
+        entry = {
+            'level': i,
+            'ratio': level.get('ratio', 1.0),
+            'error': round(float(level.get('error', 0.0)), 6),
+            'vertex_count': int(len(positions)),
+            'triangle_count': int(len(arrays['indices'])),
+            'bounds': {
+                'min': positions.min(axis=0).tolist() if len(positions) else [0.0] * 3,
+                'max': positions.max(axis=0).tolist() if len(positions) else [0.0] * 3,
+            },
+            'arrays': {},
+        }
+        for key, array in arrays.items():
+            file_name = f'lod{i}.{key}.npy'
+            data, offset = npy_bytes(array)
+            entry['arrays'][key] = {
+                'file': file_name,
+                'dtype': array.dtype.str,
+                'shape': list(array.shape),
+                'offset': offset,
+                'nbytes': int(array.nbytes),
+            }
+            yield f'{directory}/{name}/{file_name}', data
+        header['levels'].append(entry)
+
+    yield f'{directory}/{name}/{HEADER_FILE}', json.dumps(header, indent=2).encode('utf-8')
+
+
+def write_store(root, name, levels, directory=STORE_DIR):
+    """Write a part's store under root; returns the paths written"""
+    paths = []
+    for relative_path, data in iter_store_files(name, levels, directory):
+        path = os.path.join(root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f'{path}.{os.getpid()}.tmp'
+        with open(temporary, 'wb') as f:
+            f.write(data)
+        os.replace(temporary, path)
+        paths.append(path)
+    return paths
+
+
+class MeshStore:
+    """Open stored meshes as read-only memory maps"""
+
+    def __init__(self, root=os.path.join('hardware', STORE_DIR)):
+        self.root = root
+        self._headers = {}
+
+    def parts(self):
+        """Names of every stored part"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root)
+                      if os.path.exists(os.path.join(self.root, name, HEADER_FILE)))
+
+    def header(self, name):
+        """A part's header; re-read when the file changes"""
+        path = os.path.join(self.root, name, HEADER_FILE)
+        mtime = os.stat(path).st_mtime_ns
+        cached = self._headers.get(name)
+        if cached is None or cached[0] != mtime:
+            with open(path) as f:
+                header = json.load(f)
+            if header.get('version') != STORE_VERSION:
+                raise ValueError(f"{path} is mesh store version {header.get('version')}, "
+                                 f"expected {STORE_VERSION}")
+            cached = self._headers[name] = (mtime, header)
+        return cached[1]
+
+    def open(self, name, level=0):
+        """{'positions', 'normals', 'indices'} memmaps for one LOD level
+
+        level indexes the finest-first chain, so -1 is the coarsest; parts
+        with fewer levels give their coarsest. Nothing is read until the
+        arrays are used.
+        """
+        levels = self.header(name)['levels']
+        entry = levels[min(level, len(levels) - 1)]
+        arrays = {}
+        for key, spec in entry['arrays'].items():
+            arrays[key] = np.memmap(
+                os.path.join(self.root, name, spec['file']), dtype=np.dtype(spec['dtype']),
+                mode='r', offset=spec['offset'], shape=tuple(spec['shape'])
+            )
+        return arrays
+
+    def open_all(self, level=0):
+        """{part: arrays} for every stored part at one LOD level"""
+        return {name: self.open(name, level) for name in self.parts()}
+
+    def bounds(self, name):
+        """(min, max) corners of a part from its header, without touching the arrays"""
+        entry = self.header(name)['levels'][0]['bounds']
+        return np.array(entry['min']), np.array(entry['max'])
+
+
+# Summarize the store: python mesh_store.py [store directory]
+if __name__ == "__main__":
+    import sys
+    import time
+
+    store = MeshStore(sys.argv[1] if len(sys.argv) > 1 else os.path.join('hardware', STORE_DIR))
+    start = time.perf_counter()
+    meshes = store.open_all()
+    triangles = sum(len(arrays['indices']) for arrays in meshes.values())
+    print(f"🗺️  Mapped {len(meshes)} parts ({triangles:,} triangles) "
+          f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+    for name in store.parts():
+        levels = store.header(name)['levels']
+        counts = ' / '.join(f"{level['triangle_count']:,}" for level in levels)
+        print(f"  {name}: {len(levels)} levels, {counts} triangles")
@@ -0,0 +1,535 @@
+#!/usr/bin/env python3
+"""
+Dolly Robot - Local Model Server
+Serves the generated models and drawings (hardware/) and the docs (docs/)
+over HTTP on the local network, with no internet connection needed.
+
+- Strong ETags from content hashes (the shared file index), so repeat
+  loads are answered with 304 Not Modified
+- Range requests for large STEP/STL files
+- Precompressed gzip (and brotli, if the brotli module is installed)
+  variants, built once per content hash in hardware/.serve_cache
+- /api/index.json listing every exported file with size, mtime and hash
+- /api/live, a WebSocket that pushes notifications (rebuilt parts from
+  watch mode) to open pages
+"""
+
+import asyncio
+import base64
+import datetime
+import email.utils
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import struct
+import sys
+import urllib.parse
+
+from file_index import FileIndex, INDEX_ROOT, file_hash
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8421
+
+REPO_ROOT = os.path.dirname(INDEX_ROOT)
+
+# URL prefix -> directory
+MOUNTS = {
+    '/hardware/': INDEX_ROOT,
+    '/docs/': os.path.join(REPO_ROOT, 'docs'),
+}
+HOME_PAGE = '/docs/interactive/index.html'
+INDEX_URL = '/api/index.json'
+LIVE_URL = '/api/live'
+
+# RFC 6455 handshake constant
+WEBSOCKET_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+SERVE_CACHE = os.path.join(INDEX_ROOT, '.serve_cache')
+
+# Worth compressing: text formats and uncompressed binary meshes
+COMPRESSIBLE = {
+    '.html', '.css', '.js', '.json', '.md', '.txt', '.svg', '.step', '.stp',
+    '.stl', '.wrl', '.amf', '.dxf'
+}
+MIN_COMPRESS_SIZE = 1024
+
+CONTENT_TYPES = {
+    '.step': 'model/step',
+    '.stp': 'model/step',
+    '.stl': 'model/stl',
+    '.glb': 'model/gltf-binary',
+    '.wrl': 'model/vrml',
+    '.amf': 'application/x-amf',
+    '.dxf': 'image/vnd.dxf',
+    '.svg': 'image/svg+xml',
+    '.svgz': 'image/svg+xml',
+    '.md': 'text/markdown; charset=utf-8',
+    '.json': 'application/json',
+    '.npy': 'application/octet-stream',
+}
+
+REASONS = {
+    101: 'Switching Protocols', 200: 'OK', 206: 'Partial Content', 301: 'Moved Permanently', 304: 'Not Modified',
+    400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    416: 'Range Not Satisfiable'
+}
+
+# Request bodies are read and discarded; refuse larger ones
+MAX_REQUEST_BODY = 1 << 20
+
+# Encodings by preference, with the cache suffix of their variants
+ENCODINGS = [('br', 'br'), ('gzip', 'gz')]
+
+
+def request_body_length(value):
+    """Content-Length as an int, or None if invalid or over MAX_REQUEST_BODY"""
+    try:
+        length = int(value)
+    except ValueError:
+        return None
+    return length if 0 <= length <= MAX_REQUEST_BODY else None
+
+
+def http_date(value):
+    """An HTTP date header as an aware datetime, or None if malformed"""
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:  # '-0000' dates are UTC too
+        date = date.replace(tzinfo=datetime.timezone.utc)
+    return date
+
+
+def content_type(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension in CONTENT_TYPES:
+        return CONTENT_TYPES[extension]
+    guessed = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    return guessed + '; charset=utf-8' if guessed.startswith('text/') else guessed
+
+
+def accepted_encodings(header):
+    """Encodings the client accepts (q > 0) from an Accept-Encoding header"""
+    accepted = set()
+    for item in (header or '').split(','):
+        name, _, params = item.strip().partition(';')
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name and q > 0:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+def etag_matches(header, etag):
+    """If-None-Match comparison (weak, as RFC 9110 requires for GET)"""
+    if header.strip() == '*':
+        return True
+    tags = [tag.strip() for tag in header.split(',')]
+    return etag in [tag[2:] if tag.startswith('W/') else tag for tag in tags]
+
+
+def parse_range(header, size):
+    """(start, end) inclusive for a single byte range, 'unsatisfiable', or None to ignore
+
+    Invalid ranges (reversed, or not numbers) are ignored, as RFC 9110
+    asks, and the whole file is sent.
+    """
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return None  # multiple ranges: send the whole file
+    first, _, last = spec.strip().partition('-')
+    if not (first.isdigit() or last.isdigit()) or not all(
+            value.isdigit() for value in (first, last) if value):
+        return None
+    try:
+        if first == '':
+            length = int(last)
+            if length == 0:
+                return 'unsatisfiable'
+            return max(size - length, 0), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if last and end < start:
+        return None
+    if start >= size:
+        return 'unsatisfiable'
+    return start, min(end, size - 1)
+
+
+def compress(data, encoding):
+    if encoding == 'gzip':
+        return gzip.compress(data, 9, mtime=0)
+    return brotli.compress(data, quality=9)
+
+
+def websocket_accept(key):
+    """Sec-WebSocket-Accept value for a client's Sec-WebSocket-Key"""
+    digest = hashlib.sha1((key.strip() + WEBSOCKET_GUID).encode('latin-1')).digest()
+    return base64.b64encode(digest).decode('ascii')
+
+
+def websocket_frame(payload, opcode=0x1):
+    """One unfragmented server frame (servers never mask)"""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack('>BB', 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack('>BBH', 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack('>BBQ', 0x80 | opcode, 127, length)
+    return header + payload
+
+
+class WebSocketProtocolError(Exception):
+    """A client frame that breaks RFC 6455; the connection closes with 1002"""
+
+
+async def read_websocket_frame(reader):
+    """(opcode, payload) of the next client frame"""
+    first, second = await reader.readexactly(2)
+    if not second & 0x80:
+        raise WebSocketProtocolError('client frames must be masked')
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack('>H', await reader.readexactly(2))[0]
+    elif length == 127:
+        length = struct.unpack('>Q', await reader.readexactly(8))[0]
+    mask = await reader.readexactly(4)
+    payload = await reader.readexactly(length)
+    return first & 0x0F, bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+
+
+class ModelServer:
+    """Asyncio HTTP/1.1 server for the hardware outputs and docs"""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, mounts=MOUNTS,
+                 cache_dir=SERVE_CACHE, log=True):
+        self.host = host
+        self.port = port
+        self.mounts = mounts
+        self.cache_dir = cache_dir
+        self.log = log
+        self.index = FileIndex(INDEX_ROOT)
+        self.index.refresh()
+        self.index.save()
+        # Hashes of files outside the index (docs), by path
+        self._hashes = {}
+        self.encodings = [(name, suffix) for name, suffix in ENCODINGS
+                          if name != 'br' or brotli is not None]
+        # Open /api/live connections, and the loop serving them
+        self.live_clients = set()
+        self.loop = None
+
+    def resolve(self, url_path):
+        """File path for a URL path, or None (never outside a mount)"""
+        for prefix, directory in self.mounts.items():
+            if url_path.startswith(prefix):
+                root = os.path.realpath(directory)
+                path = os.path.realpath(os.path.join(root, url_path[len(prefix):]))
+                if path == root or path.startswith(root + os.sep):
+                    if os.path.isdir(path):
+                        path = os.path.join(path, 'index.html')
+                    return path if os.path.isfile(path) else None
+        return None
+
+    def content_hash(self, path, stat):
+        """SHA-256 of a file, from the file index when it is current"""
+        relative = os.path.relpath(path, os.path.realpath(INDEX_ROOT))
+        if not relative.startswith('..'):
+            entry = self.index.entry(os.path.join(INDEX_ROOT, relative))
+            if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                return entry['sha256']
+
+        cached = self._hashes.get(path)
+        if cached and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+            return cached[2]
+        digest = file_hash(path)
+        self._hashes[path] = (stat.st_size, stat.st_mtime_ns, digest)
+        return digest
+
+    def build_variant(self, path, digest, encoding, suffix):
+        """Path of the compressed copy of a file, compressing it if needed"""
+        cached = os.path.join(self.cache_dir, f'{digest}.{suffix}')
+        if not os.path.exists(cached):
+            with open(path, 'rb') as f:
+                data = compress(f.read(), encoding)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temporary = f'{cached}.{os.getpid()}.tmp'
+            with open(temporary, 'wb') as f:
+                f.write(data)
+            os.replace(temporary, cached)
+        return cached
+
+    async def variant(self, path, digest, encoding, suffix):
+        # Compress off the event loop; other requests keep being served
+        return await asyncio.to_thread(self.build_variant, path, digest, encoding, suffix)
+
+    def precompress(self):
+        """Build the compressed variants of every indexed file up front"""
+        count = 0
+        for path in self.index.query(COMPRESSIBLE):
+            entry = self.index.entry(path)
+            if entry['size'] < MIN_COMPRESS_SIZE:
+                continue
+            for encoding, suffix in self.encodings:
+                self.build_variant(path, entry['sha256'], encoding, suffix)
+                count += 1
+        return count
+
+    def index_document(self):
+        """JSON listing of the exported files (and the export manifest's part stats)"""
+        files = []
+        for path in self.index.query():
+            entry = self.index.entry(path)
+            relative = os.path.relpath(path, REPO_ROOT).replace(os.sep, '/')
+            files.append({
+                'path': relative,
+                'url': '/' + relative,
+                'format': os.path.splitext(path)[1].lower().lstrip('.'),
+                'size': entry['size'],
+                'mtime': entry['mtime_ns'] // 1_000_000_000,
+                'sha256': entry['sha256'],
+            })
+        document = {'files': files}
+        manifest = os.path.join(INDEX_ROOT, 'manifest.json')
+        if os.path.exists(manifest):
+            with open(manifest) as f:
+                document['parts'] = json.load(f).get('parts', {})
+        return json.dumps(document, indent=1, sort_keys=True).encode('utf-8')
+
+    async def handle(self, reader, writer):
+        """Serve requests on one connection until it is closed"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                parts = request_line.decode('latin-1').split()
+                if len(parts) != 3 or not parts[2].startswith('HTTP/'):
+                    await self.send_error(writer, 400)
+                    break
+                method, target, version = parts
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                if method not in ('GET', 'HEAD'):
+                    # Its body is never read, so the connection can't carry on
+                    await self.send_error(writer, 405, {'Allow': 'GET, HEAD', 'Connection': 'close'})
+                    break
+                if 'transfer-encoding' in headers:
+                    await self.send_error(writer, 400)
+                    break
+                if 'content-length' in headers:
+                    length = request_body_length(headers['content-length'])
+                    if length is None:
+                        await self.send_error(writer, 400)
+                        break
+                    await reader.readexactly(length)  # meaningless on GET/HEAD: skip it
+                if (urllib.parse.urlsplit(target).path == LIVE_URL
+                        and headers.get('upgrade', '').lower() == 'websocket'):
+                    await self.live(reader, writer, headers)
+                    break
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                status = await self.respond(writer, method, target, headers)
+                if self.log:
+                    print(f"  {method} {target} {status}")
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def live(self, reader, writer, headers):
+        """Hold a WebSocket open for notify() until the client closes it"""
+        if 'sec-websocket-key' not in headers:
+            await self.send_error(writer, 400)
+            return
+        await self.send(writer, 101, {
+            'Upgrade': 'websocket',
+            'Connection': 'Upgrade',
+            'Sec-WebSocket-Accept': websocket_accept(headers['sec-websocket-key']),
+        })
+        self.live_clients.add(writer)
+        if self.log:
+            print(f"  🔌 Live client connected ({len(self.live_clients)} open)")
+        try:
+            while True:
+                try:
+                    opcode, payload = await read_websocket_frame(reader)
+                except WebSocketProtocolError:
+                    writer.write(websocket_frame(struct.pack('>H', 1002), 0x8))
+                    await writer.drain()
+                    break
+                if opcode == 0x8:  # close
+                    writer.write(websocket_frame(payload[:2], 0x8))
+                    await writer.drain()
+                    break
+                if opcode == 0x9:  # ping
+                    writer.write(websocket_frame(payload, 0xA))
+                    await writer.drain()
+        finally:
+            self.live_clients.discard(writer)
+
+    async def broadcast(self, message):
+        """Send a JSON message to every live client"""
+        frame = websocket_frame(json.dumps(message).encode('utf-8'))
+        for writer in list(self.live_clients):
+            try:
+                writer.write(frame)
+                await writer.drain()
+            except ConnectionError:
+                self.live_clients.discard(writer)
+
+    def notify(self, message):
+        """broadcast() from any thread; a no-op until the server is running"""
+        if self.loop is not None:
+            asyncio.run_coroutine_threadsafe(self.broadcast(message), self.loop)
+
+    async def send(self, writer, status, headers, body=b'', head_only=False):
+        lines = [f'HTTP/1.1 {status} {REASONS[status]}']
+        lines += [f'{name}: {value}' for name, value in headers.items()]
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        if body and not head_only:
+            writer.write(body)
+        await writer.drain()
+        return status
+
+    async def send_error(self, writer, status, extra=None):
+        body = f'{status} {REASONS[status]}\n'.encode()
+        headers = {'Content-Type': 'text/plain; charset=utf-8',
+                   'Content-Length': str(len(body))}
+        headers.update(extra or {})
+        return await self.send(writer, status, headers, body)
+
+    async def respond(self, writer, method, target, headers):
+        """Answer a GET or HEAD request"""
+        url_path = urllib.parse.unquote(urllib.parse.urlsplit(target).path)
+        head_only = method == 'HEAD'
+
+        if url_path == '/':
+            return await self.send(writer, 301, {'Location': HOME_PAGE, 'Content-Length': '0'})
+        if url_path == INDEX_URL:
+            body = self.index_document()
+            etag = '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+            common = {'ETag': etag, 'Cache-Control': 'no-cache'}
+            if etag_matches(headers.get('if-none-match', ''), etag):
+                return await self.send(writer, 304, common)
+            common.update({'Content-Type': 'application/json', 'Content-Length': str(len(body))})
+            return await self.send(writer, 200, common, body, head_only)
+
+        path = self.resolve(url_path)
+        if path is None:
+            return await self.send_error(writer, 404)
+        return await self.send_file(writer, path, headers, head_only)
+
+    async def send_file(self, writer, path, headers, head_only):
+        stat = os.stat(path)
+        digest = await asyncio.to_thread(self.content_hash, path, stat)
+        extension = os.path.splitext(path)[1].lower()
+        common = {
+            'Cache-Control': 'no-cache',  # always revalidate; unchanged files get a 304
+            'Last-Modified': email.utils.formatdate(stat.st_mtime, usegmt=True),
+            'Accept-Ranges': 'bytes',
+        }
+
+        # A precompressed variant, unless a byte range of the file was asked for
+        encoding = suffix = None
+        compressible = extension in COMPRESSIBLE and stat.st_size >= MIN_COMPRESS_SIZE
+        if compressible:
+            common['Vary'] = 'Accept-Encoding'
+            if 'range' not in headers:
+                accepted = accepted_encodings(headers.get('accept-encoding'))
+                encoding, suffix = next(((name, sfx) for name, sfx in self.encodings
+                                         if name in accepted), (None, None))
+        etag = f'"{digest[:32]}-{suffix}"' if encoding else f'"{digest[:32]}"'
+        common['ETag'] = etag
+
+        if 'if-none-match' in headers:
+            if etag_matches(headers['if-none-match'], etag):
+                return await self.send(writer, 304, common)
+        elif 'if-modified-since' in headers:
+            since = http_date(headers['if-modified-since'])
+            if since is not None and int(stat.st_mtime) <= since.timestamp():
+                return await self.send(writer, 304, common)
+
+        common['Content-Type'] = content_type(path)
+        if encoding:
+            path = await self.variant(path, digest, encoding, suffix)
+            common['Content-Encoding'] = encoding
+        elif extension == '.svgz':
+            common['Content-Encoding'] = 'gzip'
+        size = os.path.getsize(path)
+
+        status, start, length = 200, 0, size
+        byte_range = None
+        if 'range' in headers and headers.get('if-range', etag) == etag:
+            byte_range = parse_range(headers['range'], size)
+        if byte_range == 'unsatisfiable':
+            return await self.send_error(writer, 416, {'Content-Range': f'bytes */{size}'})
+        if byte_range:
+            status, start = 206, byte_range[0]
+            length = byte_range[1] - start + 1
+            common['Content-Range'] = f'bytes {start}-{byte_range[1]}/{size}'
+
+        common['Content-Length'] = str(length)
+        await self.send(writer, status, common)
+        if not head_only and length:
+            with open(path, 'rb') as f:
+                await asyncio.get_running_loop().sendfile(writer.transport, f, start, length)
+        return status
+
+    async def serve_forever(self):
+        self.loop = asyncio.get_running_loop()
+        watcher = self.index.watch()
+        server = await asyncio.start_server(self.handle, self.host, self.port)
+        print(f"🌐 Serving Dolly models at http://{self.host}:{self.port}{HOME_PAGE}")
+        print(f"   File index: http://{self.host}:{self.port}{INDEX_URL} "
+              f"({len(self.index.files)} files, {watcher.mode})")
+        print(f"   Compression: {', '.join(name for name, _ in self.encodings)}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.index.close()
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, precompress=False):
+    """Run the server until interrupted"""
+    server = ModelServer(host, port)
+    if precompress:
+        print(f"Precompressed {server.precompress()} variants")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("\nServer stopped")
+
+
+# python model_server.py [port] [--public] [--precompress], from the repository root
+if __name__ == "__main__":
+    arguments = [a for a in sys.argv[1:] if not a.startswith('--')]
+    serve(
+        host='0.0.0.0' if '--public' in sys.argv else DEFAULT_HOST,
+        port=int(arguments[0]) if arguments else DEFAULT_PORT,
+        precompress='--precompress' in sys.argv,
+    )
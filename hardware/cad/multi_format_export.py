@@ -5,98 +5,276 @@ Export CADQuery models to various formats for different uses
 """
 
 import cadquery as cq
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import os
+import time
+
+from tessellation import tessellate_for, TESSELLATION_PROFILES
+from glb_export import GlbWriter
+from export_manifest import ExportManifest, shape_fingerprint, options_hash
+from svg_views import ViewProjector
+from export_stream import DirectorySink
+from svg_gallery import write_gallery, GALLERY_PAGE
+from export_plugins import (
+    EXPORTERS, ExportError, ExportJob, get_exporter, plan, MESH, THREAD,
+    SVG_VIEWS, SVG_OPTIONS, SVG_COMPACT
+)
+
+# Bump when a writer's output changes so cached exports are regenerated
+EXPORTER_VERSION = 3
+
+# Exported files live under this directory, one subdirectory per format
+OUTPUT_ROOT = 'hardware'
 
 class DollyExporter:
     """Export Dolly parts to multiple formats"""
     
-    def __init__(self):
-        # Create output directories
-        self.formats = {
-            'step': 'STEP files for CAD software',
-            'stl': 'STL files for 3D printing',
-            'svg': 'SVG drawings for documentation',
-            'dxf': 'DXF files for laser cutting',
-            'vrml': 'VRML for 3D visualization',
-            'amf': 'AMF for advanced 3D printing',
-            'json': 'Three.js JSON format',
-            'png': 'PNG images for documentation'
-        }
+    def __init__(self, tessellation_overrides=None, manifest_path='hardware/manifest.json',
+                 format_options=None):
+        # Per-part tessellation overrides, keyed by part name
+        # e.g. {'soft_gripper_fingers': {'angular': 0.05}}
+        self.tessellation_overrides = tessellation_overrides or {}
+        
+        # Per-format option overrides on top of each plugin's defaults
+        # e.g. {'stl': {'ascii': True}, 'dxf': {'face': '<Z'}}
+        self.format_options = format_options or {}
+        
+        # Outputs from earlier runs, used to skip unchanged parts
+        self.manifest = ExportManifest(manifest_path)
+        self.skipped = []
+        
+        # Deflections and triangle counts of every mesh written, by part
+        self.mesh_stats = self.manifest.parts
+        
+        # Meshes of the part being exported, shared by formats with the same profile
+        self._meshes = {}
+        
+        # Hidden-line views are projected in parallel, one pool for all parts
+        # (started on first use, shut down by close())
+        self.view_projector = ViewProjector()
+        
+        # Output directories are created as files are written (see DirectorySink),
+        # so streaming to an archive leaves the disk untouched
+        self.output_root = OUTPUT_ROOT
+        self.formats = {fmt: plugin.description for fmt, plugin in EXPORTERS.items()}
+    
+    def close(self):
+        """Shut down the view projector's worker processes (restarted if needed)"""
+        self.view_projector.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def mesh(self, obj, name, profile):
+        """(vertices, triangles, info) for a part and profile
+        
+        Meshes are cached for the duration of one export_all_formats call.
+        """
+        key = (name, profile)
+        if key not in self._meshes:
+            self._meshes[key] = tessellate_for(
+                obj, profile, self.tessellation_overrides.get(name)
+            )
+        return self._meshes[key]
+    
+    def tessellate(self, obj, name, profile, fmt):
+        """Tessellate a part for a profile and record its mesh stats"""
+        vertices, triangles, info = self.mesh(obj, name, profile)
+        self.mesh_stats.setdefault(name, {})[fmt] = dict(info)
+        return vertices, triangles
+    
+    def plugin_options(self, fmt):
+        """A format's options: plugin defaults plus this exporter's overrides"""
+        return dict(get_exporter(fmt).default_options, **self.format_options.get(fmt, {}))
+    
+    def export_options(self, name, fmt):
+        """Everything besides the shape itself that affects a format's output"""
+        plugin = get_exporter(fmt)
+        options = {'exporter_version': EXPORTER_VERSION}
+        
+        if plugin.needs == MESH:
+            options['tessellation'] = {
+                'profile': plugin.profile,
+                'settings': TESSELLATION_PROFILES[plugin.profile],
+                'overrides': self.tessellation_overrides.get(name)
+            }
+        options.update(self.plugin_options(fmt))
         
-        for fmt in self.formats:
-            Path(f'hardware/{fmt}').mkdir(parents=True, exist_ok=True)
+        return options
     
-    def export_all_formats(self, obj, name, formats=None):
-        """Export a CadQuery object to multiple formats"""
+    def export_all_formats(self, obj, name, formats=None, force=False):
+        """Export a CadQuery object to multiple formats
+        
+        Formats whose files are already up to date for this exact shape and
+        these options are skipped (see hardware/manifest.json) unless
+        force is set. The rest are grouped by the data they share (one
+        tessellation per mesh profile); thread-safe writers in a group run
+        concurrently.
+        """
         if formats is None:
             formats = ['step', 'stl', 'svg']  # Default formats
         
-        exported = []
+        fingerprint = shape_fingerprint(obj)
+        job = ExportJob(self, obj, name)
+        self._meshes.clear()
         
+        outputs = {}
+        pending = []
         for fmt in formats:
-            if fmt == 'step':
-                path = f'hardware/step/{name}.step'
-                cq.exporters.export(obj, path)
-                exported.append(path)
-                
-            elif fmt == 'stl':
-                path = f'hardware/stl/{name}.stl'
-                cq.exporters.export(obj, path, tolerance=0.001)
-                exported.append(path)
-                
-            elif fmt == 'svg':
-                # Export multiple views as SVG
-                views = [
-                    ('top', (0, 0, 1)),
-                    ('front', (1, 0, 0)),
-                    ('side', (0, 1, 0))
-                ]
-                for view_name, direction in views:
-                    path = f'hardware/svg/{name}_{view_name}.svg'
-                    cq.exporters.export(
-                        obj,
-                        path,
-                        opt={
-                            "projectionDir": direction,
-                            "width": 800,
-                            "height": 600,
-                            "marginLeft": 50,
-                            "marginTop": 50,
-                            "showAxes": False,
-                            "showHidden": False
-                        }
-                    )
-                    exported.append(path)
-                    
-            elif fmt == 'dxf':
-                # Export for laser cutting (2D projection)
-                try:
-                    path = f'hardware/dxf/{name}.dxf'
-                    # Get the top face and export as DXF
-                    top_face = obj.faces(">Z").val()
-                    cq.exporters.export(top_face, path)
-                    exported.append(path)
-                except:
-                    print(f"  ⚠️  Could not export DXF for {name}")
-                    
-            elif fmt == 'vrml':
-                path = f'hardware/vrml/{name}.wrl'
-                cq.exporters.export(obj, path)
-                exported.append(path)
-                
-            elif fmt == 'amf':
-                path = f'hardware/amf/{name}.amf'
-                cq.exporters.export(obj, path)
-                exported.append(path)
-                
-            elif fmt == 'json':
-                # Three.js JSON format
-                path = f'hardware/json/{name}.json'
-                cq.exporters.export(obj, path)
-                exported.append(path)
+            options = self.export_options(name, fmt)
+            paths = None
+            if not force:
+                paths = self.manifest.current_outputs(name, fmt, fingerprint, options)
+            
+            if paths is not None:
+                self.skipped.extend(paths)
+                outputs[fmt] = paths
+            else:
+                pending.append(fmt)
         
+        sink = DirectorySink(self.output_root)
+        for (needs, profile), plugins in plan(pending):
+            job.prepare(needs, profile)
+            threaded = [p for p in plugins if p.concurrency == THREAD]
+            results = {}
+            
+            if len(threaded) > 1:
+                with ThreadPoolExecutor(len(threaded)) as pool:
+                    futures = {p.name: pool.submit(self._write_format, job, p, sink)
+                               for p in threaded}
+                    for p in plugins:
+                        if p not in threaded:
+                            results[p.name] = self._write_format(job, p, sink)
+                    for fmt, future in futures.items():
+                        results[fmt] = future.result()
+            else:
+                for p in plugins:
+                    results[p.name] = self._write_format(job, p, sink)
+            
+            for fmt, (paths, duration) in results.items():
+                # Extra fields such as SVG sizes before compaction
+                details = {}
+                for relative_path, fields in job.details.items():
+                    details[os.path.join(self.output_root, relative_path)] = fields
+                self.manifest.record(name, fmt, paths, fingerprint,
+                                     self.export_options(name, fmt), duration, details)
+                outputs[fmt] = paths
+        
+        exported = []
+        for fmt in formats:
+            exported.extend(outputs.get(fmt, []))
         return exported
+    
+    def _write_format(self, job, plugin, sink):
+        """Run one plugin; returns (paths, seconds). ExportError skips the format."""
+        start = time.perf_counter()
+        try:
+            paths = plugin.write(job, self.plugin_options(plugin.name), sink)
+        except ExportError as error:
+            print(f"  ⚠️  Could not export {plugin.name.upper()} for {job.name}: {error}")
+            paths = []
+        return paths, time.perf_counter() - start
+    
+    def export_format(self, obj, name, fmt):
+        """Export a CadQuery object to one format, returning the paths written"""
+        job = ExportJob(self, obj, name)
+        return self._write_format(job, get_exporter(fmt), DirectorySink(self.output_root))[0]
+    
+    def stream_all_formats(self, obj, name, formats=None):
+        """Yield (relative_path, data) for every file of every format
+        
+        Nothing is written to disk and the manifest is not consulted; send
+        the entries to a sink from export_stream (zip, tar or directory).
+        """
+        if formats is None:
+            formats = ['step', 'stl', 'svg']
+        job = ExportJob(self, obj, name)
+        self._meshes.clear()
+        for (needs, profile), plugins in plan(formats):
+            job.prepare(needs, profile)
+            for plugin in plugins:
+                yield from self._stream(job, plugin)
+    
+    def stream_format(self, obj, name, fmt):
+        """Yield (relative_path, data) for each file of one format
+        
+        Paths are relative to the hardware/ directory; data is bytes or an
+        iterator of byte chunks.
+        """
+        yield from self._stream(ExportJob(self, obj, name), get_exporter(fmt))
+    
+    def _stream(self, job, plugin):
+        if not plugin.streamable:
+            raise ValueError(f"{plugin.name.upper()} can only be exported to a file, not streamed")
+        try:
+            yield from plugin.export(job, self.plugin_options(plugin.name))
+        except ExportError as error:
+            print(f"  ⚠️  Could not export {plugin.name.upper()} for {job.name}: {error}")
+    
+    def write_manifest(self, prune=False):
+        """Save hardware/manifest.json (outputs, hashes, mesh stats)
+        
+        With prune=True, files from parts/formats that were not exported in
+        this session are deleted - use it after a full regeneration.
+        """
+        if prune:
+            for path in self.manifest.prune():
+                print(f"  🗑️  Removed stale {path}")
+        return self.manifest.save()
+    
+    def export_glb_assembly(self, components, name):
+        """Export several parts as one GLB, instancing repeated parts
+        
+        components is a list of (part_name, obj, instances) where instances
+        is None for a one-off part or a list of (x, y, z) positions.
+        """
+        plugin = get_exporter('glb')
+        path = os.path.join(self.output_root, plugin.path(name))
+        fingerprint = options_hash([
+            (part_name, shape_fingerprint(obj), instances)
+            for part_name, obj, instances in components
+        ])
+        options = self.export_options(name, 'glb')
+        if self.manifest.current_outputs(name, 'glb', fingerprint, options):
+            self.skipped.append(path)
+            return path
+        
+        start = time.perf_counter()
+        self._meshes.clear()
+        writer = GlbWriter()
+        for part_name, obj, instances in components:
+            vertices, triangles = self.tessellate(obj, part_name, plugin.profile, 'glb')
+            writer.add_mesh(part_name, vertices, triangles, instances=instances)
+            self.manifest.touched.add((part_name, 'glb'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        writer.write(path)
+        
+        self.manifest.record(name, 'glb', [path], fingerprint, options,
+                             time.perf_counter() - start)
+        return path
+
+    def export_mesh_assembly(self, components, name, formats=('meshstore',)):
+        """Export an assembly's parts for the web viewer and record its layout
+        
+        components is a list of (part_name, obj, instances) as for
+        export_glb_assembly. Each part is exported once (unchanged parts are
+        skipped) and the manifest lists the assembly's parts with their
+        positions, so the viewer can load them one by one.
+        """
+        paths = []
+        layout = []
+        for part_name, obj, instances in components:
+            paths.extend(self.export_all_formats(obj, part_name, list(formats)))
+            layout.append({
+                'part': part_name,
+                'instances': [[float(v) for v in position] for position in instances]
+                if instances else None,
+            })
+        self.manifest.record_assembly(name, layout)
+        return paths
 
 # Example: Create and export a simple part in multiple formats
 def demo_multi_export():
@@ -117,20 +295,29 @@ def demo_multi_export():
     )
     
     # Export to multiple formats
-    exporter = DollyExporter()
-    formats_to_export = ['step', 'stl', 'svg', 'dxf', 'vrml']
+    formats_to_export = ['step', 'stl', 'svg', 'dxf', 'lod', 'meshstore', 'png', 'vrml']
     
     print(f"\nExporting to {len(formats_to_export)} formats...")
-    exported_files = exporter.export_all_formats(
-        demo_part, 
-        'demo_part',
-        formats_to_export
-    )
+    with DollyExporter() as exporter:
+        exported_files = exporter.export_all_formats(
+            demo_part, 
+            'demo_part',
+            formats_to_export
+        )
+    
+    exporter.write_manifest()
     
     print("\n✅ Exported files:")
     for file in exported_files:
         size = os.path.getsize(file) / 1024  # KB
-        print(f"  - {file} ({size:.1f} KB)")
+        status = " - unchanged, skipped" if file in exporter.skipped else ""
+        print(f"  - {file} ({size:.1f} KB){status}")
+    
+    print("\n🔺 Mesh sizes:")
+    for part, stats in exporter.mesh_stats.items():
+        for fmt, info in stats.items():
+            print(f"  - {part} [{fmt}, {info['profile']}]: {info['triangles']} triangles "
+                  f"(tolerance {info['tolerance']:.3f} mm)")
     
     # Print viewing instructions
     print("\n📋 How to view each format:")
@@ -139,227 +326,13 @@ def demo_multi_export():
     print("  SVG:  Any web browser, Inkscape, Illustrator")
     print("  DXF:  LibreCAD, AutoCAD, or online DXF viewers")
     print("  VRML: FreeWRL, Blender, or older 3D viewers")
+    print("  PNG:  Any image viewer or web browser")
 
 # Create HTML viewer for SVG files
 def create_svg_viewer():
-    """Create an HTML page to view SVG exports"""
-    html = '''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Dolly Robot - SVG Technical Drawings</title>
-    <style>
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, sans-serif;
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-            background: #f5f5f5;
-        }
-        
-        .header {
-            background: #2563eb;
-            color: white;
-            padding: 30px;
-            border-radius: 10px;
-            text-align: center;
-            margin-bottom: 30px;
-        }
-        
-        h1 {
-            margin: 0;
-            font-size: 2.5em;
-        }
-        
-        .drawing-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(350px, 1fr));
-            gap: 20px;
-        }
-        
-        .drawing-card {
-            background: white;
-            border-radius: 8px;
-            overflow: hidden;
-            box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-        }
-        
-        .drawing-header {
-            background: #f3f4f6;
-            padding: 15px;
-            border-bottom: 1px solid #e5e7eb;
-        }
-        
-        .drawing-header h3 {
-            margin: 0;
-            color: #374151;
-        }
-        
-        .drawing-content {
-            padding: 20px;
-            background: white;
-            min-height: 300px;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-        }
-        
-        .svg-container {
-            width: 100%;
-            height: 300px;
-            border: 1px solid #e5e7eb;
-            border-radius: 4px;
-            overflow: hidden;
-        }
-        
-        .svg-container img,
-        .svg-container object {
-            width: 100%;
-            height: 100%;
-            object-fit: contain;
-        }
-        
-        .info {
-            background: #fef3c7;
-            border: 1px solid #fbbf24;
-            border-radius: 6px;
-            padding: 15px;
-            margin-bottom: 20px;
-        }
-        
-        .viewer-options {
-            background: white;
-            padding: 20px;
-            border-radius: 8px;
-            margin-bottom: 20px;
-        }
-        
-        .format-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 15px;
-            margin-top: 15px;
-        }
-        
-        .format-card {
-            border: 1px solid #e5e7eb;
-            border-radius: 6px;
-            padding: 15px;
-            text-align: center;
-        }
-        
-        .format-card h4 {
-            margin: 0 0 10px 0;
-            color: #2563eb;
-        }
-        
-        .format-card p {
-            margin: 5px 0;
-            font-size: 0.9em;
-            color: #6b7280;
-        }
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>🤖 Dolly Robot</h1>
-        <p>Technical Drawings Viewer</p>
-    </div>
-    
-    <div class="info">
-        <h3>📋 About These Drawings</h3>
-        <p>These SVG files are generated directly from CADQuery 3D models. They show accurate 2D projections of each part.</p>
-        <p>SVG files can be opened in any web browser, edited in Inkscape/Illustrator, or used in documentation.</p>
-    </div>
-    
-    <div class="viewer-options">
-        <h2>Available Export Formats from CADQuery</h2>
-        <div class="format-grid">
-            <div class="format-card">
-                <h4>STEP</h4>
-                <p>CAD Exchange</p>
-                <p>✓ Full 3D geometry</p>
-                <p>✓ Editable in CAD</p>
-            </div>
-            <div class="format-card">
-                <h4>STL</h4>
-                <p>3D Printing</p>
-                <p>✓ Direct to slicer</p>
-                <p>✓ Mesh format</p>
-            </div>
-            <div class="format-card">
-                <h4>SVG</h4>
-                <p>2D Drawings</p>
-                <p>✓ Browser viewable</p>
-                <p>✓ Vector graphics</p>
-            </div>
-            <div class="format-card">
-                <h4>DXF</h4>
-                <p>Laser Cutting</p>
-                <p>✓ 2D profiles</p>
-                <p>✓ CAD compatible</p>
-            </div>
-            <div class="format-card">
-                <h4>VRML</h4>
-                <p>3D Visualization</p>
-                <p>✓ Color support</p>
-                <p>✓ Web viewable</p>
-            </div>
-            <div class="format-card">
-                <h4>AMF</h4>
-                <p>Advanced 3D Print</p>
-                <p>✓ Color/material</p>
-                <p>✓ Next-gen format</p>
-            </div>
-        </div>
-    </div>
-    
-    <h2>SVG Drawing Gallery</h2>
-    <div class="drawing-grid" id="drawingGrid">
-        <!-- SVG files will be loaded here by JavaScript -->
-    </div>
-    
-    <script>
-        // In a real implementation, this would scan the SVG directory
-        const svgFiles = [
-            'dolly_frame_top.svg',
-            'dolly_frame_front.svg', 
-            'dolly_frame_side.svg',
-            'dolly_base_plate_top.svg',
-            'dolly_assembly_top.svg'
-        ];
-        
-        const grid = document.getElementById('drawingGrid');
-        
-        svgFiles.forEach(file => {
-            const card = document.createElement('div');
-            card.className = 'drawing-card';
-            
-            const partName = file.replace('.svg', '').replace(/_/g, ' ');
-            
-            card.innerHTML = `
-                <div class="drawing-header">
-                    <h3>${partName}</h3>
-                </div>
-                <div class="drawing-content">
-                    <div class="svg-container">
-                        <object data="hardware/svg/${file}" type="image/svg+xml">
-                            <img src="hardware/svg/${file}" alt="${partName}">
-                        </object>
-                    </div>
-                </div>
-            `;
-            
-            grid.appendChild(card);
-        });
-    </script>
-</body>
-</html>'''
-    
-    with open('docs/svg-viewer.html', 'w') as f:
-        f.write(html)
-    print("\nCreated: docs/svg-viewer.html")
+    """Create an HTML gallery of the exported SVG drawings (see svg_gallery.py)"""
+    count = write_gallery()
+    print(f"\nCreated: {GALLERY_PAGE} ({count} drawings)")
 
 if __name__ == "__main__":
     demo_multi_export()
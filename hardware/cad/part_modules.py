@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Dolly Robot - Part Modules
+What the part modules (hardware/cad/dolly_*.py) build, and a hash of the
+source behind each part, found by inspecting the modules - no CadQuery
+or export code is imported here, so tools that only need to list or
+measure parts stay light. The material densities shared by the mass
+properties and the parts catalog live here for the same reason.
+"""
+
+import hashlib
+import inspect
+import os
+import re
+
+CAD_DIR = os.path.dirname(os.path.abspath(__file__))
+MODULE_PREFIX = 'dolly_'
+
+# Densities in g/cm³ for solid (100% infill) parts
+MATERIAL_DENSITIES = {
+    'PLA': 1.24,
+    'PETG': 1.27,
+    'TPU': 1.21,
+    '6061 Aluminum': 2.70,
+}
+
+_SELF_CALL = re.compile(r'self\.(create_\w+)')
+
+
+def method_keys(module):
+    """{(class, create_* method): hash of the source that builds its part}
+
+    A method's hash covers its own source, the create_*() methods it
+    calls, and everything in the module that is not a create_*() method
+    (constructors, helpers, constants) - so editing one method changes
+    only that method's hash.
+    """
+    methods = {}
+    for _, cls in inspect.getmembers(module, inspect.isclass):
+        if cls.__module__ == module.__name__:
+            for name, function in vars(cls).items():
+                if name.startswith('create_') and inspect.isfunction(function):
+                    methods[(cls.__name__, name)] = inspect.getsource(function)
+
+    shared = inspect.getsource(module)
+    for source in methods.values():
+        shared = shared.replace(source, '')
+
+    keys = {}
+    for (class_name, name), source in methods.items():
+        used, pending = {name}, [source]
+        sources = []
+        while pending:
+            text = pending.pop()
+            sources.append(text)
+            for called in _SELF_CALL.findall(text):
+                if called not in used and (class_name, called) in methods:
+                    used.add(called)
+                    pending.append(methods[(class_name, called)])
+        digest = hashlib.sha256(shared.encode('utf-8'))
+        for text in sorted(sources):
+            digest.update(text.encode('utf-8'))
+        keys[(class_name, name)] = digest.hexdigest()
+    return keys
+
+
+def part_builders(module):
+    """(name, method, is_assembly) for everything a part module builds
+
+    A class with web_components() (the robot assembly) builds an assembly,
+    named by its assembly_name, with that method. Any other class builds a
+    part with each create_*() method that takes no arguments, named
+    '<module>_<part>' without the 'dolly_' and 'create_' prefixes.
+    """
+    prefix = module.__name__[len(MODULE_PREFIX):] if module.__name__.startswith(MODULE_PREFIX) \
+        else module.__name__
+    for _, cls in inspect.getmembers(module, inspect.isclass):
+        if cls.__module__ != module.__name__ or _required_arguments(cls):
+            continue
+        instance = cls()
+        if hasattr(instance, 'web_components'):
+            yield getattr(instance, 'assembly_name', module.__name__), instance.web_components, True
+            continue
+        for method_name, method in inspect.getmembers(instance, inspect.ismethod):
+            if method_name.startswith('create_') and not _required_arguments(method):
+                yield f"{prefix}_{method_name[len('create_'):]}", method, False
+
+
+def part_module_names(cad_dir=CAD_DIR):
+    """Names of the part modules in a directory, sorted"""
+    return [name[:-len('.py')] for name in sorted(os.listdir(cad_dir))
+            if name.startswith(MODULE_PREFIX) and name.endswith('.py')]
+
+
+def _required_arguments(callable_):
+    return any(parameter.default is parameter.empty
+               and parameter.kind not in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD)
+               for parameter in inspect.signature(callable_).parameters.values())
@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+"""
+Dolly Robot - Parts Catalog
+Builds docs/parts_catalog.html, a print-ready catalog with one A4 page
+per exported STEP file: shaded views rendered from the part's mesh and
+specifications measured from its geometry (bounding box, volume, surface
+area and mass in each printable material). Parts are loaded through the
+STEP cache and rendered in parallel worker processes. catalog.json keeps
+every part's specs keyed on its STEP file's SHA-256, so a refresh only
+renders parts whose files changed and reuses everything else.
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from html import escape
+
+from export_manifest import file_hash
+from file_index import find_files, open_index
+from part_modules import MATERIAL_DENSITIES
+from png_render import png_bytes, render
+
+CATALOG_PAGE = 'docs/parts_catalog.html'
+CATALOG_DIR = 'docs/catalog'
+STATE_FILE = 'catalog.json'
+
+# Bump when the rendered views or measured specs change
+CATALOG_VERSION = 1
+
+# Shaded views on each page (direction as in png_render)
+CATALOG_VIEWS = [
+    ('front', 'Front View', (1, 0, 0)),
+    ('side', 'Side View', (0, 1, 0)),
+    ('top', 'Top View', (0, 0, 1)),
+    ('iso', 'Isometric View', (1, 1, 1)),
+]
+VIEW_SIZE = (400, 300)
+
+
+def part_specs(shape):
+    """Specifications of a cq.Shape measured from its geometry"""
+    box = shape.BoundingBox()
+    volume = shape.Volume()  # mm³
+    return {
+        'size': [round(box.xlen, 2), round(box.ylen, 2), round(box.zlen, 2)],
+        'volume_cm3': round(volume / 1000, 3),
+        'area_cm2': round(shape.Area() / 100, 2),
+        'solids': len(shape.Solids()),
+        'faces': len(shape.Faces()),
+        'mass_g': {material: round(volume / 1000 * density, 1)
+                   for material, density in MATERIAL_DENSITIES.items()},
+    }
+
+
+def _write(path, data):
+    temporary = f'{path}.{os.getpid()}.tmp'
+    with open(temporary, 'wb') as f:
+        f.write(data)
+    os.replace(temporary, path)
+
+
+def _catalog_job(job):
+    """Worker: measure one STEP file and render its views; returns its entry"""
+    step_file, digest, slug, image_dir = job
+    from step_cache import StepCache
+
+    cache = StepCache()
+    specs = part_specs(cache.load(step_file))
+    vertices, triangles, _ = cache.load_mesh(step_file)
+    images = {}
+    for view, _, direction in CATALOG_VIEWS:
+        path = os.path.join(image_dir, f'{slug}_{view}.png')
+        _write(path, png_bytes(render(vertices, triangles, direction, VIEW_SIZE)))
+        images[view] = path
+    specs['triangles'] = int(len(triangles))
+    return {'step_file': step_file, 'sha256': digest, 'specs': specs, 'images': images}
+
+
+class PartsCatalog:
+    """Incrementally rendered catalog of every STEP file under a directory"""
+
+    def __init__(self, step_dir='hardware/step', page=CATALOG_PAGE, catalog_dir=CATALOG_DIR):
+        self.step_dir = step_dir
+        self.page = page
+        self.catalog_dir = catalog_dir
+        self.state_path = os.path.join(catalog_dir, STATE_FILE)
+        self.parts = self._load()
+
+    def _load(self):
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return state['parts'] if state.get('version') == CATALOG_VERSION else {}
+
+    def save(self):
+        data = json.dumps({'version': CATALOG_VERSION, 'parts': self.parts},
+                          indent=2, sort_keys=True)
+        _write(self.state_path, data.encode('utf-8'))
+
+    def _current(self, entry, digest):
+        return (entry is not None and entry['sha256'] == digest
+                and all(os.path.exists(path) for path in entry['images'].values()))
+
+    def update(self, processes=None):
+        """Render every new or changed part; returns (rendered, reused) names"""
+        os.makedirs(self.catalog_dir, exist_ok=True)
+        index = open_index()
+        jobs = []
+        parts = {}
+        for step_file in find_files(self.step_dir, ('.step', '.stp')):
+            relative = os.path.relpath(step_file, self.step_dir)
+            slug = os.path.splitext(relative)[0].replace(os.sep, '-')
+            indexed = index.entry(step_file)
+            digest = indexed['sha256'] if indexed else file_hash(step_file)
+            if self._current(self.parts.get(slug), digest):
+                parts[slug] = self.parts[slug]
+            else:
+                jobs.append((step_file, digest, slug, self.catalog_dir))
+
+        processes = processes or os.cpu_count() or 1
+        if processes < 2 or len(jobs) < 2:
+            results = [_catalog_job(job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(min(processes, len(jobs))) as pool:
+                results = list(pool.map(_catalog_job, jobs))
+
+        rendered = [job[2] for job in jobs]
+        reused = sorted(parts)
+        parts.update(zip(rendered, results))
+        self.parts = dict(sorted(parts.items()))
+        self._prune_images()
+        self.save()
+        return rendered, reused
+
+    def _prune_images(self):
+        """Delete views of parts that no longer have a STEP file"""
+        used = {os.path.abspath(path) for entry in self.parts.values()
+                for path in entry['images'].values()}
+        for name in os.listdir(self.catalog_dir):
+            path = os.path.abspath(os.path.join(self.catalog_dir, name))
+            if name.endswith('.png') and path not in used:
+                os.remove(path)
+
+    def html(self, date=None):
+        """The catalog page: cover with contents, then one page per part"""
+        from pdf_drawing import drawing_date
+
+        base = os.path.dirname(os.path.abspath(self.page))
+        contents = []
+        pages = []
+        for number, (slug, entry) in enumerate(self.parts.items(), start=1):
+            title = part_title(entry['step_file'])
+            specs = entry['specs']
+            contents.append(TOC_ROW.format(
+                number=number, slug=escape(slug), title=escape(title), page=number + 1,
+                size=escape(size_text(specs['size'])),
+                mass=escape(mass_text(specs['mass_g']['PLA'])),
+            ))
+            views = ''.join(VIEW_BOX.format(
+                label=label, alt=escape(f'{title} - {label}'),
+                src=escape(os.path.relpath(os.path.abspath(entry['images'][view]), base)
+                           .replace(os.sep, '/')),
+            ) for view, label, _ in CATALOG_VIEWS)
+            pages.append(PART_PAGE.format(
+                number=number, slug=escape(slug), title=escape(title), views=views,
+                specs=spec_groups(specs),
+                source=escape(entry['step_file']), sha=entry['sha256'][:12],
+            ))
+
+        return (CATALOG_TEMPLATE
+                .replace('__DATE__', escape(date or drawing_date()))
+                .replace('__COUNT__', str(len(pages)))
+                .replace('__CONTENTS__', ''.join(contents))
+                .replace('__PAGES__', ''.join(pages)))
+
+    def write(self, date=None):
+        """Write the page if its content changed; returns True when written"""
+        html = self.html(date)
+        try:
+            with open(self.page, encoding='utf-8') as f:
+                if f.read() == html:
+                    return False
+        except OSError:
+            pass
+        os.makedirs(os.path.dirname(os.path.abspath(self.page)), exist_ok=True)
+        _write(self.page, html.encode('utf-8'))
+        return True
+
+
+def part_title(step_file):
+    """'dolly_base_plate.step' -> 'Base Plate'"""
+    stem = os.path.splitext(os.path.basename(step_file))[0]
+    if stem.startswith('dolly_'):
+        stem = stem[len('dolly_'):]
+    return stem.replace('_', ' ').title()
+
+
+def size_text(size):
+    return ' × '.join(f'{value:g}' for value in size) + ' mm'
+
+
+def mass_text(grams):
+    return f'{grams / 1000:.2f} kg' if grams >= 1000 else f'{grams:g} g'
+
+
+def _spec_rows(rows):
+    return ''.join(f'<li><span class="spec-label">{escape(label)}:</span>'
+                   f'<span class="spec-value">{escape(value)}</span></li>' for label, value in rows)
+
+
+def spec_groups(specs):
+    """Specification lists of one part as HTML"""
+    x, y, z = specs['size']
+    dimensions = [
+        ('Width (X)', f'{x:g} mm ({x / 25.4:.1f}")'),
+        ('Depth (Y)', f'{y:g} mm ({y / 25.4:.1f}")'),
+        ('Height (Z)', f'{z:g} mm ({z / 25.4:.1f}")'),
+        ('Volume', f"{specs['volume_cm3']:g} cm³"),
+        ('Surface area', f"{specs['area_cm2']:g} cm²"),
+    ]
+    masses = [(material, mass_text(specs['mass_g'][material]))
+              for material in MATERIAL_DENSITIES if material in specs['mass_g']]
+    geometry = [
+        ('Solids', str(specs['solids'])),
+        ('Faces', str(specs['faces'])),
+        ('Preview triangles', f"{specs['triangles']:,}"),
+    ]
+    return ''.join(SPEC_GROUP.format(title=title, rows=_spec_rows(rows)) for title, rows in [
+        ('Dimensions', dimensions),
+        ('Mass (solid, 100% infill)', masses),
+        ('Geometry', geometry),
+    ])
+
+
+def update_catalog(step_dir='hardware/step', page=CATALOG_PAGE, catalog_dir=CATALOG_DIR,
+                   processes=None):
+    """Bring the catalog up to date; returns (rendered, reused, page written)"""
+    catalog = PartsCatalog(step_dir, page, catalog_dir)
+    rendered, reused = catalog.update(processes)
+    return rendered, reused, catalog.write()
+
+
+TOC_ROW = '''
+            <tr><td>{number}.</td><td><a href="#{slug}">{title}</a></td><td>{size}</td><td>{mass}</td><td>{page}</td></tr>'''
+
+VIEW_BOX = '''
+                    <div class="view-box">
+                        <h4>{label}</h4>
+                        <img src="{src}" alt="{alt}">
+                    </div>'''
+
+SPEC_GROUP = '''
+                <div class="spec-group">
+                    <h4>{title}</h4>
+                    <ul class="spec-list">{rows}</ul>
+                </div>'''
+
+PART_PAGE = '''
+    <section id="{slug}" class="part-page">
+        <div class="part-header">
+            <h2>{number}. {title}</h2>
+        </div>
+        <div class="part-content">
+            <div class="views-section">
+                <h3>Views</h3>
+                <div class="view-grid">{views}
+                </div>
+            </div>
+            <div class="specs-section">
+                <h3>Specifications</h3>{specs}
+                <p class="source">Source: {source} (sha256 {sha})</p>
+            </div>
+        </div>
+    </section>
+'''
+
+CATALOG_TEMPLATE = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Dolly Robot - Parts Catalog</title>
+    <style>
+        @page {
+            size: A4 landscape;
+            margin: 12mm;
+        }
+
+        @media print {
+            .no-print { display: none; }
+            body { padding: 0; font-size: 10pt; }
+        }
+
+        body {
+            font-family: Arial, sans-serif;
+            line-height: 1.5;
+            color: #333;
+            max-width: 1200px;
+            margin: 0 auto;
+            padding: 20px;
+            background: white;
+        }
+
+        .cover, .part-page {
+            break-after: page;
+            page-break-after: always;
+        }
+
+        .part-page {
+            break-inside: avoid;
+            margin-bottom: 30px;
+        }
+
+        .header {
+            text-align: center;
+            border-bottom: 3px solid #0099cc;
+            padding-bottom: 20px;
+            margin-bottom: 30px;
+        }
+
+        h1 {
+            color: #0099cc;
+            margin: 0;
+            font-size: 36pt;
+        }
+
+        .subtitle {
+            color: #666;
+            font-size: 14pt;
+            margin-top: 10px;
+        }
+
+        .toc {
+            width: 100%;
+            border-collapse: collapse;
+        }
+
+        .toc th, .toc td {
+            text-align: left;
+            padding: 4px 8px;
+            border-bottom: 1px solid #ddd;
+        }
+
+        .toc a {
+            color: #0099cc;
+            text-decoration: none;
+        }
+
+        .part-header {
+            background: #f0f0f0;
+            padding: 10px 15px;
+            border-left: 5px solid #0099cc;
+            margin-bottom: 15px;
+        }
+
+        .part-header h2 {
+            margin: 0;
+            font-size: 20pt;
+        }
+
+        .part-content {
+            display: grid;
+            grid-template-columns: 3fr 2fr;
+            gap: 25px;
+        }
+
+        .views-section {
+            background: #fafafa;
+            padding: 15px;
+            border-radius: 8px;
+        }
+
+        .views-section h3, .specs-section h3 {
+            color: #0099cc;
+            margin: 0 0 10px 0;
+            font-size: 14pt;
+        }
+
+        .view-grid {
+            display: grid;
+            grid-template-columns: 1fr 1fr;
+            gap: 10px;
+        }
+
+        .view-box {
+            background: white;
+            border: 1px solid #ddd;
+            border-radius: 4px;
+            padding: 6px;
+            text-align: center;
+        }
+
+        .view-box h4 {
+            margin: 0 0 4px 0;
+            color: #666;
+            font-size: 10pt;
+        }
+
+        .view-box img {
+            width: 100%;
+            height: auto;
+        }
+
+        .spec-group h4 {
+            color: #666;
+            margin: 10px 0 5px 0;
+            font-size: 11pt;
+        }
+
+        .spec-list {
+            list-style: none;
+            padding: 0;
+            margin: 0;
+        }
+
+        .spec-list li {
+            padding: 2px 0;
+            display: flex;
+            justify-content: space-between;
+            border-bottom: 1px dotted #ddd;
+        }
+
+        .spec-label { color: #666; }
+        .spec-value { font-weight: bold; }
+
+        .source {
+            color: #999;
+            font-size: 8pt;
+            margin-top: 15px;
+        }
+
+        .print-button {
+            position: fixed;
+            top: 20px;
+            right: 20px;
+            padding: 10px 20px;
+            background: #0099cc;
+            color: white;
+            border: none;
+            border-radius: 4px;
+            cursor: pointer;
+            font-size: 14pt;
+        }
+    </style>
+</head>
+<body>
+    <button class="print-button no-print" onclick="window.print()">📄 Print to PDF</button>
+
+    <section class="cover">
+        <div class="header">
+            <h1>Dolly Robot</h1>
+            <div class="subtitle">Technical Parts Catalog</div>
+            <div style="margin-top: 20px; color: #666;">
+                __COUNT__ parts, measured from the exported STEP files<br>
+                Generated: __DATE__
+            </div>
+        </div>
+        <table class="toc">
+            <tr><th></th><th>Part</th><th>Size (X × Y × Z)</th><th>Mass (PLA)</th><th>Page</th></tr>__CONTENTS__
+        </table>
+    </section>
+__PAGES__
+</body>
+</html>
+'''
+
+
+# Refresh the catalog: python parts_catalog.py [step directory]
+if __name__ == "__main__":
+    import sys
+    import time
+
+    step_dir = sys.argv[1] if len(sys.argv) > 1 else 'hardware/step'
+    print("Updating parts catalog...")
+    start = time.perf_counter()
+    rendered, reused, written = update_catalog(step_dir)
+    for name in rendered:
+        print(f"  ✓ {name}")
+    print(f"📚 {CATALOG_PAGE}: {len(rendered)} rendered, {len(reused)} unchanged"
+          f"{'' if written else ', page unchanged'} ({time.perf_counter() - start:.1f}s)")
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Dolly Robot - PDF Technical Drawings
+FreeCAD-free drawing pipeline: each part is projected with OCC's
+hidden-line removal from the front, top, right and an isometric
+direction, laid out at a standard scale on the A3 template (the same
+one step_to_pdf's create_simple_template writes) and written as a
+vector PDF page. Parts are drawn in parallel worker processes, one per
+STEP file, and their pages are merged into a single catalog PDF.
+"""
+
+import os
+import re
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from drawing_template import A3_TEMPLATE
+
+MM = 72 / 25.4  # PDF points per millimetre
+
+# (label, view direction towards the viewer, model direction pointing right)
+DRAWING_VIEWS = [
+    ('FRONT', (0, -1, 0), (1, 0, 0)),
+    ('TOP', (0, 0, 1), (1, 0, 0)),
+    ('RIGHT', (1, 0, 0), (0, 1, 0)),
+    ('ISOMETRIC', (1, -1, 1), (1, 1, 0)),
+]
+
+# View cells on the sheet (x, y, width, height in mm, y down), clear of the title block
+VIEW_CELLS = [
+    (20, 20, 185, 105),
+    (215, 20, 185, 105),
+    (20, 137, 185, 105),
+    (215, 137, 185, 105),
+]
+
+# Drawing scales to choose from (drawing size / model size), largest first
+STANDARD_SCALES = (5, 2, 1, 0.5, 0.2, 0.1, 0.05, 0.02, 0.01)
+
+VISIBLE_WIDTH = 0.35   # mm
+HIDDEN_WIDTH = 0.18
+LABEL_SIZE = 3.5
+
+_ATTRIBUTE = re.compile(r'([\w-]+)="([^"]*)"')
+
+
+def parse_template(svg):
+    """The rectangles and text of an SVG sheet template
+
+    Returns (width, height, rects, texts) in template units (mm, y down)
+    where rects are (x, y, w, h, stroke_width) and texts (x, y, size, text).
+    """
+    root = dict(_ATTRIBUTE.findall(re.search(r'<svg\b[^>]*>', svg).group(0)))
+    width, height = (float(v) for v in root['viewBox'].split()[2:4])
+    rects = []
+    for attributes in re.findall(r'<rect\b([^>]*)/?>', svg):
+        a = dict(_ATTRIBUTE.findall(attributes))
+        rects.append((float(a['x']), float(a['y']), float(a['width']), float(a['height']),
+                      float(a.get('stroke-width', 0.5))))
+    texts = []
+    for attributes, text in re.findall(r'<text\b([^>]*)>([^<]*)</text>', svg):
+        a = dict(_ATTRIBUTE.findall(attributes))
+        texts.append((float(a['x']), float(a['y']), float(a.get('font-size', 3)), text))
+    return width, height, rects, texts
+
+
+def _pdf_string(text):
+    text = text.encode('latin-1', 'replace').decode('latin-1')
+    return '(' + text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)') + ')'
+
+
+def _number(value):
+    text = f'{value:.2f}'.rstrip('0').rstrip('.')
+    return '0' if text == '-0' else text
+
+
+class PageCanvas:
+    """PDF content-stream operators for a sheet drawn in mm with y down"""
+
+    def __init__(self, height):
+        # Flip the page so template coordinates (mm, y down) work directly
+        self.ops = [f'{_number(MM)} 0 0 {_number(-MM)} 0 {_number(height * MM)} cm',
+                    '1 J 1 j']
+
+    def line_style(self, width, gray=0.0, dash=None):
+        self.ops.append(f'{_number(width)} w {_number(gray)} G '
+                        + (f'[{" ".join(_number(d) for d in dash)}] 0 d' if dash else '[] 0 d'))
+
+    def rect(self, x, y, w, h):
+        self.ops.append(f'{_number(x)} {_number(y)} {_number(w)} {_number(h)} re S')
+
+    def polylines(self, polylines):
+        for points in polylines:
+            coords = [f'{_number(x)} {_number(y)}' for x, y in points]
+            self.ops.append(coords[0] + ' m ' + ' l '.join(coords[1:]) + ' l S')
+
+    def text(self, x, y, size, text):
+        # Undo the page flip for the glyphs
+        self.ops.append(f'BT /F1 {_number(size)} Tf 1 0 0 -1 {_number(x)} {_number(y)} Tm '
+                        f'{_pdf_string(text)} Tj ET')
+
+    def content(self):
+        return '\n'.join(self.ops).encode('latin-1')
+
+
+class PdfDocument:
+    """Minimal vector PDF: pages of line drawings and Helvetica text"""
+
+    def __init__(self, title=None):
+        self.title = title
+        self.pages = []
+
+    def add_page(self, content, width, height):
+        """Add a page from content-stream bytes; width and height in mm"""
+        self.pages.append((content, width * MM, height * MM))
+
+    def to_bytes(self):
+        objects = [None, None, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica '
+                               b'/Encoding /WinAnsiEncoding >>']
+        kids = []
+        for content, width, height in self.pages:
+            stream = zlib.compress(content, 9)
+            objects.append(b'<< /Length %d /Filter /FlateDecode >>\nstream\n' % len(stream)
+                           + stream + b'\nendstream')
+            content_id = len(objects)
+            objects.append((f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {_number(width)} '
+                            f'{_number(height)}] /Resources << /Font << /F1 3 0 R >> >> '
+                            f'/Contents {content_id} 0 R >>').encode('ascii'))
+            kids.append(f'{len(objects)} 0 R')
+        objects[0] = b'<< /Type /Catalog /Pages 2 0 R >>'
+        objects[1] = f'<< /Type /Pages /Kids [{" ".join(kids)}] /Count {len(kids)} >>'.encode('ascii')
+        if self.title:
+            objects.append(f'<< /Title {_pdf_string(self.title)} /Producer (Dolly Robot) >>'
+                           .encode('latin-1'))
+
+        out = bytearray(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        offsets = []
+        for number, body in enumerate(objects, 1):
+            offsets.append(len(out))
+            out += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+        xref = len(out)
+        out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+        out += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+        info = f' /Info {len(objects)} 0 R' if self.title else ''
+        out += (f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R{info} >>\n'
+                f'startxref\n{xref}\n%%EOF\n').encode('ascii')
+        return bytes(out)
+
+    def write(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        temporary = f'{path}.{os.getpid()}.tmp'
+        with open(temporary, 'wb') as f:
+            f.write(self.to_bytes())
+        os.replace(temporary, path)
+        return path
+
+
+def _bounds(projection):
+    points = np.vstack(projection['visible'] + projection['hidden'] or [np.zeros((1, 2))])
+    return points.min(axis=0), points.max(axis=0)
+
+
+def drawing_scale(projections, cells=VIEW_CELLS, scales=STANDARD_SCALES):
+    """The largest standard scale at which every view fits its cell"""
+    for scale in scales:
+        fits = True
+        for projection, (_, _, width, height) in zip(projections, cells):
+            low, high = _bounds(projection)
+            size = (high - low) * scale
+            # Leave room for the view label
+            if size[0] > width or size[1] > height - 2 * LABEL_SIZE:
+                fits = False
+                break
+        if fits:
+            return scale
+    return scales[-1]
+
+
+def scale_text(scale):
+    return f'{scale:g}:1' if scale >= 1 else f'1:{1 / scale:g}'
+
+
+def drawing_date():
+    """Today's date, or SOURCE_DATE_EPOCH's for reproducible builds"""
+    epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    return time.strftime('%Y-%m-%d', time.gmtime(int(epoch)) if epoch else time.localtime())
+
+
+def drawing_page(name, projections, labels, template=A3_TEMPLATE, title='Dolly Robot',
+                 date=None):
+    """(content bytes, width, height) of one sheet with every projected view"""
+    width, height, rects, texts = parse_template(template)
+    scale = drawing_scale(projections)
+    canvas = PageCanvas(height)
+
+    # The sheet: frame, title block and its labels with their values
+    values = {'Title:': title, 'Part:': name, 'Date:': date or drawing_date(),
+              'Scale:': scale_text(scale)}
+    for x, y, w, h, stroke in rects:
+        canvas.line_style(stroke)
+        canvas.rect(x, y, w, h)
+    for x, y, size, text in texts:
+        canvas.text(x, y, size, text)
+        if text.strip() in values:
+            canvas.text(x + 15, y, size, values[text.strip()])
+
+    for projection, label, (cx, cy, cw, ch) in zip(projections, labels, VIEW_CELLS):
+        low, high = _bounds(projection)
+        centre = (low + high) / 2
+        origin = np.array([cx + cw / 2, cy + (ch - 2 * LABEL_SIZE) / 2])
+
+        def place(points):
+            placed = (points - centre) * scale
+            placed[:, 1] = -placed[:, 1]  # model y is up, the sheet's is down
+            return placed + origin
+
+        canvas.line_style(HIDDEN_WIDTH, gray=0.45, dash=(1.5, 1))
+        canvas.polylines(place(p) for p in projection['hidden'])
+        canvas.line_style(VISIBLE_WIDTH)
+        canvas.polylines(place(p) for p in projection['visible'])
+        canvas.text(cx + cw / 2 - len(label) * LABEL_SIZE * 0.3, cy + ch - 1, LABEL_SIZE, label)
+
+    return canvas.content(), width, height
+
+
+def project_drawing_views(shape, views=DRAWING_VIEWS):
+    """Hidden-line projections of a shape for every drawing view"""
+    from svg_views import project
+
+    projections = []
+    for label, direction, x_direction in views:
+        # Isometric views conventionally leave hidden lines out
+        projections.append(project(shape, direction, hidden=label != 'ISOMETRIC',
+                                   x_direction=x_direction))
+    return projections
+
+
+def _drawing_job(job):
+    """Worker: draw one STEP file, write its PDF and return its page"""
+    step_file, output_dir, date = job
+    from step_cache import StepCache
+
+    name = os.path.splitext(os.path.basename(step_file))[0]
+    shape = StepCache().load(step_file)
+    content, width, height = drawing_page(
+        name, project_drawing_views(shape), [label for label, _, _ in DRAWING_VIEWS], date=date
+    )
+    document = PdfDocument(name)
+    document.add_page(content, width, height)
+    path = document.write(os.path.join(output_dir, f'{name}.pdf'))
+    return name, path, content, width, height
+
+
+def render_drawings(step_files, output_dir='docs/pdf', catalog_name='dolly_drawings.pdf',
+                    processes=None):
+    """Draw every STEP file to its own PDF and merge them into a catalog
+
+    Files are drawn in parallel worker processes. Returns (catalog path,
+    [part PDF paths]).
+    """
+    date = drawing_date()
+    jobs = [(step_file, output_dir, date) for step_file in step_files]
+    processes = processes or os.cpu_count() or 1
+    if processes < 2 or len(jobs) < 2:
+        results = [_drawing_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(min(processes, len(jobs))) as pool:
+            results = list(pool.map(_drawing_job, jobs))
+
+    catalog = PdfDocument('Dolly Robot - Technical Drawings')
+    for _, _, content, width, height in results:
+        catalog.add_page(content, width, height)
+    catalog_path = catalog.write(os.path.join(output_dir, catalog_name))
+    return catalog_path, [path for _, path, _, _, _ in results]
+
+
+# Draw every STEP file: python pdf_drawing.py [step directory] [output directory]
+if __name__ == "__main__":
+    import sys
+
+    from file_index import find_files
+
+    step_dir = sys.argv[1] if len(sys.argv) > 1 else 'hardware/step'
+    output_dir = sys.argv[2] if len(sys.argv) > 2 else 'docs/pdf'
+    step_files = find_files(step_dir, ('.step', '.stp'))
+    print(f"Drawing {len(step_files)} STEP files...")
+    start = time.perf_counter()
+    catalog_path, paths = render_drawings(step_files, output_dir)
+    for path in paths:
+        print(f"  ✓ {path}")
+    print(f"📄 Catalog: {catalog_path} ({len(paths)} pages, {time.perf_counter() - start:.1f}s)")
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Dolly Robot - PNG Renderer
+Headless, CPU-only preview images from tessellated parts.
+A vectorized NumPy z-buffer rasterizer with flat Lambert shading:
+no GPU, display or OpenGL needed, so it runs on build servers.
+"""
+
+import os
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Same directions as the SVG views, plus an isometric view
+PNG_VIEWS = [
+    ('top', (0, 0, 1)),
+    ('front', (1, 0, 0)),
+    ('side', (0, 1, 0)),
+    ('iso', (1, 1, 1))
+]
+
+# Image sizes by suffix ('' is the full-size view)
+PNG_SIZES = {'': (800, 600), '_thumb': (160, 120)}
+
+PART_COLOR = (0.55, 0.6, 0.7)
+BACKGROUND = (255, 255, 255)
+
+# Light direction in camera space (from the upper left, towards the viewer)
+LIGHT = np.array([-0.4, 0.5, 1.0]) / np.linalg.norm([-0.4, 0.5, 1.0])
+AMBIENT = 0.25
+
+# Upper bound on candidate pixels rasterized at once (memory use)
+FRAGMENT_CHUNK = 4_000_000
+
+
+def view_basis(direction):
+    """Rows (right, up, towards camera) for looking from direction at the origin"""
+    towards = np.asarray(direction, dtype=np.float64)
+    towards = towards / np.linalg.norm(towards)
+    hint = np.array([0.0, 0.0, 1.0]) if abs(towards[2]) < 0.99 else np.array([0.0, 1.0, 0.0])
+    right = np.cross(hint, towards)
+    right /= np.linalg.norm(right)
+    return np.array([right, np.cross(towards, right), towards])
+
+
+def _shades(camera, triangles, color):
+    """Flat Lambert colour of every triangle, lit in camera space"""
+    corners = camera[triangles]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    normals = np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+    # Two-sided: light whichever side faces the camera
+    normals[normals[:, 2] < 0] *= -1
+    intensity = AMBIENT + (1 - AMBIENT) * np.clip(normals @ LIGHT, 0, 1)
+    return np.clip(intensity[:, None] * np.asarray(color) * 255, 0, 255)
+
+
+def rasterize(screen, triangles, width, height):
+    """Nearest triangle at every pixel centre (-1 where there is none)
+
+    screen holds (x, y, depth) per vertex in pixels; larger depth is
+    closer to the camera.
+    """
+    depth_buffer = np.full(width * height, -np.inf)
+    face_buffer = np.full(width * height, -1, dtype=np.int64)
+
+    corners = screen[triangles]
+    (x0, y0, z0), (x1, y1, z1), (x2, y2, z2) = (corners[:, k].T for k in range(3))
+    area = (x1 - x0) * (y2 - y0) - (x2 - x0) * (y1 - y0)
+
+    xmin = np.clip(np.floor(corners[:, :, 0].min(axis=1) - 0.5), 0, width).astype(np.int64)
+    xmax = np.clip(np.ceil(corners[:, :, 0].max(axis=1) - 0.5), -1, width - 1).astype(np.int64)
+    ymin = np.clip(np.floor(corners[:, :, 1].min(axis=1) - 0.5), 0, height).astype(np.int64)
+    ymax = np.clip(np.ceil(corners[:, :, 1].max(axis=1) - 0.5), -1, height - 1).astype(np.int64)
+    widths = np.maximum(xmax - xmin + 1, 0)
+    counts = widths * np.maximum(ymax - ymin + 1, 0)
+    counts[np.abs(area) < 1e-12] = 0
+
+    # Split the triangles so no batch produces more than FRAGMENT_CHUNK candidates
+    totals = np.cumsum(counts)
+    bounds = np.searchsorted(totals, np.arange(FRAGMENT_CHUNK, totals[-1] if len(totals) else 0,
+                                               FRAGMENT_CHUNK))
+    for chunk in np.split(np.arange(len(triangles)), np.unique(bounds)):
+        chunk = chunk[counts[chunk] > 0]
+        if len(chunk) == 0:
+            continue
+
+        # One candidate fragment per pixel of each triangle's bounding box
+        owner = np.repeat(chunk, counts[chunk])
+        starts = np.repeat(np.cumsum(counts[chunk]) - counts[chunk], counts[chunk])
+        local = np.arange(len(owner)) - starts
+        px = xmin[owner] + local % widths[owner]
+        py = ymin[owner] + local // widths[owner]
+        cx, cy = px + 0.5, py + 0.5
+
+        a = area[owner]
+        w0 = ((x1[owner] - cx) * (y2[owner] - cy) - (x2[owner] - cx) * (y1[owner] - cy)) / a
+        w1 = ((x2[owner] - cx) * (y0[owner] - cy) - (x0[owner] - cx) * (y2[owner] - cy)) / a
+        w2 = 1.0 - w0 - w1
+        inside = (w0 >= 0) & (w1 >= 0) & (w2 >= 0)
+
+        owner, pixel = owner[inside], (py * width + px)[inside]
+        w0, w1, w2 = w0[inside], w1[inside], w2[inside]
+        depth = w0 * z0[owner] + w1 * z1[owner] + w2 * z2[owner]
+
+        # Closest fragment per pixel, then merge with the buffer
+        order = np.lexsort((-depth, pixel))
+        pixels, first = np.unique(pixel[order], return_index=True)
+        best = order[first]
+        closer = depth[best] > depth_buffer[pixels]
+        depth_buffer[pixels[closer]] = depth[best][closer]
+        face_buffer[pixels[closer]] = owner[best][closer]
+
+    return face_buffer.reshape(height, width)
+
+
+def render(vertices, triangles, direction, size=(800, 600), color=PART_COLOR,
+           background=BACKGROUND, margin=0.05, supersample=2):
+    """Render a mesh from one direction as an (height, width, 3) uint8 image
+
+    Orthographic, fitted to the image with a relative margin, and
+    anti-aliased by rendering supersample times larger and averaging.
+    """
+    width, height = size
+    big_width, big_height = width * supersample, height * supersample
+    vertices = np.asarray(vertices, dtype=np.float64)
+    triangles = np.asarray(triangles, dtype=np.int64)
+
+    camera = vertices @ view_basis(direction).T
+    low, high = camera[:, :2].min(axis=0), camera[:, :2].max(axis=0)
+    extent = np.maximum(high - low, 1e-9)
+    scale = min(big_width * (1 - 2 * margin) / extent[0],
+                big_height * (1 - 2 * margin) / extent[1])
+    centre = (low + high) / 2
+
+    screen = np.empty_like(camera)
+    screen[:, 0] = big_width / 2 + (camera[:, 0] - centre[0]) * scale
+    screen[:, 1] = big_height / 2 - (camera[:, 1] - centre[1]) * scale
+    screen[:, 2] = camera[:, 2]
+
+    faces = rasterize(screen, triangles, big_width, big_height)
+    colors = np.vstack([_shades(camera, triangles, color), background])
+    image = colors[faces]  # face -1 picks the background row
+
+    image = image.reshape(height, supersample, width, supersample, 3).mean(axis=(1, 3))
+    return np.rint(image).astype(np.uint8)
+
+
+def _png_chunk(kind, data):
+    body = kind + data
+    return struct.pack('>I', len(data)) + body + struct.pack('>I', zlib.crc32(body))
+
+
+def png_bytes(image):
+    """Encode an (height, width, 3 or 4) uint8 image as PNG bytes"""
+    height, width, channels = image.shape
+    color_type = {3: 2, 4: 6}[channels]
+
+    # Every scanline starts with filter type 0 (none)
+    rows = np.zeros((height, width * channels + 1), dtype=np.uint8)
+    rows[:, 1:] = image.reshape(height, -1)
+
+    return b''.join([
+        b'\x89PNG\r\n\x1a\n',
+        _png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, color_type, 0, 0, 0)),
+        _png_chunk(b'IDAT', zlib.compress(rows.tobytes(), 9)),
+        _png_chunk(b'IEND', b''),
+    ])
+
+
+def write_png(path, image):
+    """Write an (height, width, 3 or 4) uint8 image as a PNG file"""
+    with open(path, 'wb') as f:
+        f.write(png_bytes(image))
+    return path
+
+
+def iter_part_images(name, vertices, triangles, views=PNG_VIEWS, sizes=PNG_SIZES):
+    """Yield (file_name, png_bytes) for every view at every size"""
+    for view_name, direction in views:
+        for suffix, size in sizes.items():
+            yield f'{name}_{view_name}{suffix}.png', png_bytes(
+                render(vertices, triangles, direction, size)
+            )
+
+
+def render_part(name, vertices, triangles, out_dir='hardware/png',
+                views=PNG_VIEWS, sizes=PNG_SIZES):
+    """Render every view at every size; returns the paths written"""
+    paths = []
+    for file_name, data in iter_part_images(name, vertices, triangles, views, sizes):
+        path = os.path.join(out_dir, file_name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        paths.append(path)
+    return paths
+
+
+def _render_part_job(job):
+    return render_part(*job)
+
+
+def render_parts(parts, out_dir='hardware/png', views=PNG_VIEWS, sizes=PNG_SIZES,
+                 processes=None):
+    """Render many parts in parallel
+
+    parts is a list of (name, vertices, triangles). Returns {name: paths}.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [(name, vertices, triangles, out_dir, views, sizes)
+            for name, vertices, triangles in parts]
+    processes = processes or os.cpu_count() or 1
+
+    if processes < 2 or len(jobs) < 2:
+        results = [_render_part_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(min(processes, len(jobs))) as pool:
+            results = list(pool.map(_render_part_job, jobs))
+    return {job[0]: paths for job, paths in zip(jobs, results)}
+
+
+# Preview images of every assembly component
+if __name__ == "__main__":
+    import time
+    from dolly_assembly import DollyRobotAssembly
+    from tessellation import tessellate_for
+
+    dolly = DollyRobotAssembly()
+    parts = [('dolly_complete_assembly', dolly.assemble_robot())]
+    parts += [(name, part) for name, part, _ in dolly.web_components()]
+
+    print("Rendering PNG previews...")
+    start = time.perf_counter()
+    meshes = [(name,) + tessellate_for(part, 'preview')[:2] for name, part in parts]
+    rendered = render_parts(meshes)
+    for name, paths in rendered.items():
+        print(f"  ✓ {name}: {len(paths)} images")
+    print(f"\nDone in {time.perf_counter() - start:.1f}s - see hardware/png/")
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Dolly Robot - Docs Search Index
+Builds docs/interactive/search-index.json, the prebuilt index behind the
+search box on the interactive docs. Every part is found by reading the
+part modules' source (no CadQuery needed): each create_*() method gives
+a name, docstring, category (its class), nominal dimensions (its first
+sketch or box call) and the materials mentioned around it. Exported
+sizes and formats come from the export manifest and the parts guide's
+sections are indexed too. The index maps every prefix of every word to
+the documents containing it, plus trigrams for matches inside words, so
+the page answers each keystroke with a dictionary lookup.
+"""
+
+import ast
+import json
+import os
+import re
+
+CAD_DIR = 'hardware/cad'
+MODULE_PREFIX = 'dolly_'
+GUIDES = ['docs/parts_guide.md']
+INDEX_PAGE = 'docs/interactive/search-index.json'
+REPO_URL = 'https://github.com/MikeyBeez/dolly-robot/blob/master/'
+
+# Bump when the index layout changes (docs-search.js checks it)
+SEARCH_INDEX_VERSION = 1
+
+# How much a word counts in each field of a document
+FIELD_WEIGHTS = {
+    'title': 8,
+    'part': 8,
+    'category': 4,
+    'materials': 4,
+    'section': 3,
+    'dimensions': 2,
+    'text': 1,
+}
+
+# Shorter prefixes match too much to be worth storing
+MIN_PREFIX = 2
+
+MATERIALS = {
+    'pla': 'PLA', 'petg': 'PETG', 'tpu': 'TPU', 'abs': 'ABS', 'nylon': 'Nylon',
+    'aluminum': 'Aluminum', 'aluminium': 'Aluminum', 'steel': 'Steel',
+    'acrylic': 'Acrylic', 'rubber': 'Rubber', 'silicone': 'Silicone', 'wood': 'Wood',
+}
+
+# Calls whose numeric arguments are a part's nominal size
+SIZE_CALLS = ('box', 'rect', 'circle', 'polygon', 'cylinder')
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is', 'it',
+    'of', 'on', 'or', 'that', 'the', 'this', 'to', 'with',
+}
+
+_TOKEN = re.compile(r'[a-z]+|\d+(?:\.\d+)?')
+_CAMEL = re.compile(r'(?<=[a-z0-9])(?=[A-Z])')
+_HEADING = re.compile(r'^(#{1,6})\s+(.*)$')
+
+
+def tokens(text):
+    """Lowercase words and numbers - the same split docs-search.js uses"""
+    return _TOKEN.findall(text.lower())
+
+
+def materials_in(text):
+    """Materials a piece of text mentions, in a stable order"""
+    found = {MATERIALS[word] for word in tokens(text) if word in MATERIALS}
+    return sorted(found)
+
+
+def _module_title(docstring, fallback):
+    """'Dolly Robot - Heavy Duty Parts' -> 'Heavy Duty Parts'"""
+    first = (docstring or '').strip().splitlines()[0] if docstring else ''
+    return first.split(' - ', 1)[1].strip() if ' - ' in first else fallback
+
+
+def _constant_attributes(cls):
+    """{attribute: number} for the self.<attribute> = <number> lines of __init__"""
+    attributes = {}
+    for function in cls.body:
+        if isinstance(function, ast.FunctionDef) and function.name == '__init__':
+            for node in ast.walk(function):
+                if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                        and isinstance(node.targets[0], ast.Attribute)
+                        and isinstance(node.targets[0].value, ast.Name)
+                        and node.targets[0].value.id == 'self'
+                        and isinstance(node.value, ast.Constant)
+                        and isinstance(node.value.value, (int, float))):
+                    attributes[node.targets[0].attr] = node.value.value
+    return attributes
+
+
+_OPERATORS = {ast.Add: lambda a, b: a + b, ast.Sub: lambda a, b: a - b,
+              ast.Mult: lambda a, b: a * b, ast.Div: lambda a, b: a / b}
+
+
+def _value(node, attributes):
+    """The number an argument stands for, or None if it isn't a plain constant
+
+    Constants, self.<attribute> constants set in __init__ (see
+    _constant_attributes) and arithmetic on them count.
+    """
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) \
+            and not isinstance(node.value, bool):
+        return node.value
+    if (isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name)
+            and node.value.id == 'self'):
+        return attributes.get(node.attr)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        value = _value(node.operand, attributes)
+        return None if value is None else -value
+    if isinstance(node, ast.BinOp) and type(node.op) in _OPERATORS:
+        left, right = _value(node.left, attributes), _value(node.right, attributes)
+        if left is None or right is None or (isinstance(node.op, ast.Div) and right == 0):
+            return None
+        value = _OPERATORS[type(node.op)](left, right)
+        return round(value, 3) if isinstance(value, float) else value
+    return None
+
+
+def _nominal_size(function, attributes=None):
+    """Numeric arguments of the first sizing call in a method, e.g. [280, 230]"""
+    calls = [node for node in ast.walk(function)
+             if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+             and node.func.attr in SIZE_CALLS and node.args]
+    for node in sorted(calls, key=lambda call: (call.lineno, call.col_offset)):
+        values = [_value(argument, attributes or {}) for argument in node.args]
+        if None not in values:
+            return [abs(value) for value in values]
+    return []
+
+
+def _web_component_names(cls):
+    """{create_* method: part name} from a web_components() list"""
+    names = {}
+    for function in cls.body:
+        if isinstance(function, ast.FunctionDef) and function.name == 'web_components':
+            for node in ast.walk(function):
+                if (isinstance(node, ast.Tuple) and len(node.elts) >= 2
+                        and isinstance(node.elts[0], ast.Constant)
+                        and isinstance(node.elts[1], ast.Call)
+                        and isinstance(node.elts[1].func, ast.Attribute)):
+                    names[node.elts[1].func.attr] = node.elts[0].value
+    return names
+
+
+def source_documents(path):
+    """One document per create_*() method of a part module"""
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    tree = ast.parse(source)
+    lines = source.splitlines()
+    module = os.path.splitext(os.path.basename(path))[0]
+    prefix = module[len(MODULE_PREFIX):] if module.startswith(MODULE_PREFIX) else module
+    module_doc = ast.get_docstring(tree) or ''
+    section = _module_title(module_doc, prefix.replace('_', ' ').title())
+
+    documents = []
+    for cls in tree.body:
+        if not isinstance(cls, ast.ClassDef):
+            continue
+        category = _CAMEL.sub(' ', cls.name)
+        class_doc = ast.get_docstring(cls) or ''
+        web_names = _web_component_names(cls)
+        attributes = _constant_attributes(cls)
+        for function in cls.body:
+            if not (isinstance(function, ast.FunctionDef) and function.name.startswith('create_')):
+                continue
+            name = function.name[len('create_'):]
+            text = ast.get_docstring(function) or ''
+            method_source = '\n'.join(lines[function.lineno - 1:function.end_lineno])
+            documents.append({
+                'title': name.replace('_', ' ').title(),
+                'part': web_names.get(function.name, f'{prefix}_{name}'),
+                'category': category,
+                'section': section,
+                'text': text,
+                'dimensions': _nominal_size(function, attributes),
+                'materials': materials_in('\n'.join([method_source, class_doc, module_doc])),
+                'url': f'{REPO_URL}{path}#L{function.lineno}',
+                'source': f'{module}.{cls.name}.{function.name}',
+            })
+    return documents
+
+
+def _anchor(heading):
+    """GitHub's anchor for a Markdown heading"""
+    text = re.sub(r'[^\w\- ]', '', heading.strip().lower())
+    return text.replace(' ', '-')
+
+
+def guide_documents(path):
+    """One document per section of a Markdown guide"""
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    title = os.path.splitext(os.path.basename(path))[0].replace('_', ' ').title()
+
+    documents = []
+    heading, body = None, []
+
+    def flush():
+        if heading is not None:
+            text = ' '.join(line.strip(' -*#>|`') for line in body if line.strip())
+            plain = re.sub(r'[^\w\s\-.,:/"()]', '', heading).strip()
+            documents.append({
+                'title': plain,
+                'category': 'Guide',
+                'section': title,
+                'text': text[:400],
+                'materials': materials_in(text),
+                'url': f'{REPO_URL}{path}#{_anchor(heading)}',
+            })
+
+    for line in lines:
+        match = _HEADING.match(line)
+        if match:
+            flush()
+            heading, body = match.group(2), []
+        else:
+            body.append(line)
+    flush()
+    return documents
+
+
+def exported_parts(manifest_path='hardware/manifest.json'):
+    """{part: {'formats', 'size'}} from the export manifest"""
+    if not os.path.exists(manifest_path):
+        return {}, {}
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    parts = {}
+    for path, entry in manifest.get('outputs', {}).items():
+        info = parts.setdefault(entry['part'], {'formats': set(), 'size': None})
+        info['formats'].add(entry['format'])
+        if entry.get('part_size'):
+            info['size'] = [round(value, 1) for value in entry['part_size']]
+        elif entry['format'] == 'meshstore' and path.endswith('header.json') and os.path.exists(path):
+            with open(path) as header_file:
+                bounds = json.load(header_file)['levels'][0]['bounds']
+            info['size'] = [round(high - low, 1) for low, high in zip(bounds['min'], bounds['max'])]
+    return parts, manifest.get('assemblies', {})
+
+
+def collect_documents(cad_dir=CAD_DIR, guides=GUIDES, manifest_path='hardware/manifest.json'):
+    """Every searchable document: parts, exported-only parts, assemblies and guide sections"""
+    documents = []
+    for name in sorted(os.listdir(cad_dir)):
+        if name.startswith(MODULE_PREFIX) and name.endswith('.py'):
+            documents += source_documents(os.path.join(cad_dir, name))
+
+    exported, assemblies = exported_parts(manifest_path)
+    for document in documents:
+        info = exported.pop(document['part'], None)
+        if info:
+            document['exported'] = sorted(info['formats'])
+            document['size'] = info['size']
+
+    for name, components in sorted(assemblies.items()):
+        info = exported.pop(name, {'formats': set(), 'size': None})
+        documents.append({
+            'title': name.replace('_', ' ').title(),
+            'part': name,
+            'category': 'Assembly',
+            'section': 'Exported',
+            'text': 'Parts: ' + ', '.join(c['part'] for c in components),
+            'exported': sorted(info['formats'] | {'meshstore'}),
+            'size': info['size'],
+        })
+    for name, info in sorted(exported.items()):
+        documents.append({
+            'title': name.replace('_', ' ').title(),
+            'part': name,
+            'category': 'Exported',
+            'section': 'Exported',
+            'exported': sorted(info['formats']),
+            'size': info['size'],
+        })
+
+    for path in guides:
+        if os.path.exists(path):
+            documents += guide_documents(path)
+    return documents
+
+
+def _field_text(document, field):
+    value = document.get(field)
+    if field == 'dimensions':
+        value = list(value or []) + list(document.get('size') or [])
+    if isinstance(value, list):
+        return ' '.join(str(v) for v in value)
+    return value or ''
+
+
+def build_index(documents):
+    """The search index: documents plus prefix and trigram postings
+
+    prefixes maps each prefix to a flat [doc, score, doc, score, ...]
+    list, best first; a prefix scores its field weight scaled by how
+    much of the word it covers, so whole words rank above fragments.
+    grams maps each trigram to the sorted documents whose words contain
+    it, for queries that start mid-word.
+    """
+    words = {}  # word -> {doc: weight}
+    for doc_id, document in enumerate(documents):
+        for field, weight in FIELD_WEIGHTS.items():
+            for word in tokens(_field_text(document, field)):
+                if field == 'text' and word in STOPWORDS:
+                    continue
+                found = words.setdefault(word, {})
+                found[doc_id] = max(found.get(doc_id, 0), weight)
+
+    prefixes, grams = {}, {}
+    for word, found in words.items():
+        for end in range(min(MIN_PREFIX, len(word)), len(word) + 1):
+            postings = prefixes.setdefault(word[:end], {})
+            for doc_id, weight in found.items():
+                score = max(1, round(weight * 10 * end / len(word)))
+                postings[doc_id] = max(postings.get(doc_id, 0), score)
+        for start in range(len(word) - 2):
+            grams.setdefault(word[start:start + 3], set()).update(found)
+
+    def flat(postings):
+        ranked = sorted(postings.items(), key=lambda item: (-item[1], item[0]))
+        return [value for item in ranked for value in item]
+
+    return {
+        'version': SEARCH_INDEX_VERSION,
+        'min_prefix': MIN_PREFIX,
+        'stopwords': sorted(STOPWORDS),
+        'documents': documents,
+        'prefixes': {prefix: flat(postings) for prefix, postings in sorted(prefixes.items())},
+        'grams': {gram: sorted(ids) for gram, ids in sorted(grams.items())},
+    }
+
+
+def write_search_index(path=INDEX_PAGE, cad_dir=CAD_DIR, guides=GUIDES,
+                       manifest_path='hardware/manifest.json'):
+    """Build and write the index; returns (documents, bytes written)"""
+    index = build_index(collect_documents(cad_dir, guides, manifest_path))
+    data = json.dumps(index, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f'{path}.{os.getpid()}.tmp'
+    with open(temporary, 'wb') as f:
+        f.write(data)
+    os.replace(temporary, path)
+    return len(index['documents']), len(data)
+
+
+# Rebuild the docs search index: python hardware/cad/search_index.py, from the repository root
+if __name__ == "__main__":
+    import gzip
+
+    count, size = write_search_index()
+    with open(INDEX_PAGE, 'rb') as f:
+        compressed = len(gzip.compress(f.read(), 9))
+    print(f"🔎 {INDEX_PAGE}: {count} documents, {size / 1024:.1f} KB "
+          f"({compressed / 1024:.1f} KB gzipped)")
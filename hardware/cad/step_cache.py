@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Dolly Robot - STEP Sidecar Cache
+Translating a STEP file into OCC shapes is slow (the complete assembly
+takes ~70x longer than reading the same shape back from binary BREP).
+StepCache keeps a binary BREP and a tessellated mesh next to each STEP
+file, in a .step_cache directory, keyed on the file's SHA-256: the first
+load parses the STEP text, later loads read the sidecar. load_all()
+imports many STEP files in parallel worker processes.
+"""
+
+import glob
+import hashlib
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import cadquery as cq
+import numpy as np
+from OCP.BinTools import BinTools, BinTools_FormatVersion
+from OCP.BRepTools import BRepTools
+from OCP.IFSelect import IFSelect_RetDone
+from OCP.STEPControl import STEPControl_Reader
+from OCP.TopoDS import TopoDS_Shape
+from OCP.TopTools import TopTools_FormatVersion
+
+from export_manifest import file_hash
+from tessellation import tessellate_for
+
+CACHE_DIR_NAME = '.step_cache'
+
+# Mesh profile stored next to the B-rep (see tessellation.py)
+MESH_PROFILE = 'web'
+
+
+def read_step(path):
+    """Parse a STEP file into a single OCC shape"""
+    reader = STEPControl_Reader()
+    if reader.ReadFile(path) != IFSelect_RetDone:
+        raise ValueError(f"Could not read STEP file {path}")
+    reader.TransferRoots()
+    return reader.OneShape()
+
+
+def _replace(path, write):
+    """Write a file through a temporary name, so readers never see half of it"""
+    temporary = f'{path}.{os.getpid()}.tmp'
+    write(temporary)
+    os.replace(temporary, path)
+
+
+class StepCache:
+    """Load STEP files through binary BREP and mesh sidecars"""
+
+    def __init__(self, cache_dir=None, profile=MESH_PROFILE):
+        # None keeps the sidecars in a .step_cache directory beside each file
+        self.cache_dir = cache_dir
+        self.profile = profile
+        self.hits = 0
+        self.misses = 0
+
+    def _name(self, step_file):
+        """Sidecar name of a STEP file, unique within the cache directory
+
+        A shared cache_dir holds files from many directories, so the name
+        includes a hash of the file's path as well as its basename.
+        """
+        name = os.path.basename(step_file)
+        if self.cache_dir is None:
+            return name
+        path = os.path.abspath(step_file).encode('utf-8')
+        return f'{name}-{hashlib.sha256(path).hexdigest()[:12]}'
+
+    def sidecars(self, step_file, digest):
+        """(brep_path, mesh_path) for one version of a STEP file"""
+        directory = self.cache_dir or os.path.join(os.path.dirname(step_file), CACHE_DIR_NAME)
+        stem = os.path.join(directory, f'{self._name(step_file)}.{digest[:16]}')
+        return f'{stem}.brep', f'{stem}.{self.profile}.npz'
+
+    def _prune(self, step_file, digest):
+        """Delete sidecars left by earlier versions of the file"""
+        brep_path, _ = self.sidecars(step_file, digest)
+        prefix = self._name(step_file) + '.'
+        for path in glob.glob(os.path.join(glob.escape(os.path.dirname(brep_path)),
+                                           glob.escape(prefix) + '*')):
+            key = os.path.basename(path)[len(prefix):].split('.')[0]
+            if len(key) == 16 and key != digest[:16]:
+                os.remove(path)
+
+    def _cached(self, step_file, digest, mesh):
+        brep_path, mesh_path = self.sidecars(step_file, digest)
+        return os.path.exists(brep_path) and (not mesh or os.path.exists(mesh_path))
+
+    def ensure(self, step_file, mesh=False, digest=None):
+        """Create any missing sidecars for a STEP file; returns its hash"""
+        digest = digest or file_hash(step_file)
+        if self._cached(step_file, digest, mesh):
+            self.hits += 1
+            return digest
+        self.misses += 1
+
+        brep_path, mesh_path = self.sidecars(step_file, digest)
+        if os.path.exists(brep_path):
+            shape = self._read_brep(brep_path)
+        else:
+            shape = read_step(step_file)
+            os.makedirs(os.path.dirname(brep_path), exist_ok=True)
+            self._prune(step_file, digest)
+            # Geometry only; the mesh is kept in its own sidecar
+            _replace(brep_path, lambda path: BinTools.Write_s(
+                shape, path, False, False, BinTools_FormatVersion.BinTools_FormatVersion_CURRENT
+            ))
+        if mesh:
+            self._write_mesh(shape, mesh_path)
+        return digest
+
+    def _read_brep(self, path):
+        shape = TopoDS_Shape()
+        BinTools.Read_s(shape, path)
+        return shape
+
+    def _write_mesh(self, shape, path):
+        vertices, triangles, info = tessellate_for(cq.Shape.cast(shape), self.profile)
+
+        def write(temporary):
+            with open(temporary, 'wb') as f:
+                np.savez(f, vertices=vertices, triangles=triangles,
+                         info=np.array(json.dumps(info)))
+
+        _replace(path, write)
+
+    def load(self, step_file):
+        """The STEP file's shape as a cq.Shape"""
+        brep_path, _ = self.sidecars(step_file, self.ensure(step_file))
+        return cq.Shape.cast(self._read_brep(brep_path))
+
+    def load_mesh(self, step_file):
+        """The STEP file's mesh: (vertices, triangles, info)"""
+        _, mesh_path = self.sidecars(step_file, self.ensure(step_file, mesh=True))
+        with np.load(mesh_path) as data:
+            return data['vertices'], data['triangles'], json.loads(str(data['info']))
+
+    def brep_text(self, step_file):
+        """The shape as ASCII BREP, for tools (FreeCAD) that can't read OCP's binary BREP"""
+        stream = io.BytesIO()
+        BRepTools.Write_s(self.load(step_file).wrapped, stream, False, False,
+                          TopTools_FormatVersion.TopTools_FormatVersion_CURRENT)
+        return stream.getvalue().decode('latin-1')
+
+    def load_all(self, step_files, processes=None, mesh=False):
+        """Load many STEP files, parsing the uncached ones in parallel
+
+        Worker processes translate the STEP files and write the sidecars;
+        the shapes are then read back from binary BREP here. Returns
+        {step_file: cq.Shape}.
+        """
+        digests = {step_file: file_hash(step_file) for step_file in step_files}
+        missing = [f for f, digest in digests.items() if not self._cached(f, digest, mesh)]
+        self.hits += len(digests) - len(missing)
+        self.misses += len(missing)
+
+        processes = processes or os.cpu_count() or 1
+        jobs = [(self.cache_dir, self.profile, f, mesh, digests[f]) for f in missing]
+        if processes < 2 or len(jobs) < 2:
+            for job in jobs:
+                _ensure_job(job)
+        else:
+            with ProcessPoolExecutor(min(processes, len(jobs))) as pool:
+                list(pool.map(_ensure_job, jobs))
+
+        return {
+            step_file: cq.Shape.cast(self._read_brep(self.sidecars(step_file, digest)[0]))
+            for step_file, digest in digests.items()
+        }
+
+
+def _ensure_job(job):
+    cache_dir, profile, step_file, mesh, digest = job
+    return StepCache(cache_dir, profile).ensure(step_file, mesh, digest)
+
+
+# Warm the cache for every STEP file in the repository and time both paths
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from file_index import find_files
+
+    root = sys.argv[1] if len(sys.argv) > 1 else 'hardware'
+    step_files = find_files(root, ('.step', '.stp'))
+    print(f"Loading {len(step_files)} STEP files from {root}...")
+
+    cache = StepCache()
+    start = time.perf_counter()
+    cache.load_all(step_files, mesh=True)
+    print(f"  ✓ First load: {time.perf_counter() - start:.2f}s ({cache.misses} parsed, {cache.hits} from cache)")
+
+    cache = StepCache()
+    start = time.perf_counter()
+    cache.load_all(step_files, mesh=True)
+    print(f"  ✓ Cached load: {time.perf_counter() - start:.2f}s")
@@ -18,10 +18,21 @@ try:
     import Drawing
     import FreeCADGui
 except ImportError:
-    print("ERROR: FreeCAD Python modules not found!")
-    print("\nTo use this script, you need FreeCAD installed.")
-    print("You can also run this script from within FreeCAD's Python console.")
-    sys.exit(1)
+    # Drawings can still be made with CadQuery (pdf_drawing.py)
+    FreeCAD = None
+
+from drawing_template import A3_TEMPLATE
+from file_index import find_files
+
+try:
+    from step_cache import StepCache
+    from pdf_drawing import render_drawings
+    from parts_catalog import update_catalog
+except ImportError:
+    # FreeCAD's bundled Python usually has no CadQuery/OCP
+    StepCache = None
+    render_drawings = None
+    update_catalog = None
 
 class StepToPdfConverter:
     """Convert STEP files to PDF technical drawings"""
@@ -29,6 +40,8 @@ class StepToPdfConverter:
     def __init__(self, step_dir="hardware/step", output_dir="docs/pdf"):
         self.step_dir = step_dir
         self.output_dir = output_dir
+        # Parsed STEP files are kept as BREP sidecars (step_cache.py)
+        self.step_cache = StepCache() if StepCache else None
         os.makedirs(output_dir, exist_ok=True)
         
     def convert_step_to_pdf(self, step_file, pdf_name=None):
@@ -42,15 +55,12 @@ class StepToPdfConverter:
         doc = FreeCAD.newDocument("temp")
         
         # Import STEP file
-        Part.insert(step_file, doc.Name)
+        obj = self.import_step(step_file, doc)
         
         # Create drawing page
         page = doc.addObject('Drawing::FeaturePage', 'Page')
         page.Template = self.get_template_path()
         
-        # Get the imported object
-        obj = doc.Objects[-1]  # Last imported object
-        
         # Create multiple views
         views = [
             ("FrontView", (0, 1, 0), 100, 200),    # Front view
@@ -81,6 +91,19 @@ class StepToPdfConverter:
         print(f"  ✓ Saved to {output_path}")
         return output_path
     
+    def import_step(self, step_file, doc):
+        """Add a STEP file's shape to the document, from the sidecar cache if possible"""
+        if self.step_cache is None:
+            Part.insert(step_file, doc.Name)
+            return doc.Objects[-1]  # Last imported object
+        
+        shape = Part.Shape()
+        shape.importBrepFromString(self.step_cache.brep_text(step_file))
+        name = os.path.splitext(os.path.basename(step_file))[0]
+        obj = doc.addObject('Part::Feature', name)
+        obj.Shape = shape
+        return obj
+    
     def get_template_path(self):
         """Get the path to drawing template"""
         # Try to find FreeCAD's template directory
@@ -103,19 +126,9 @@ class StepToPdfConverter:
     
     def create_simple_template(self):
         """Create a simple A3 drawing template"""
-        template = '''<?xml version="1.0" encoding="UTF-8"?>
-<svg width="420mm" height="297mm" viewBox="0 0 420 297">
-  <rect x="10" y="10" width="400" height="277" fill="none" stroke="black" stroke-width="0.5"/>
-  <rect x="290" y="247" width="120" height="40" fill="none" stroke="black" stroke-width="0.5"/>
-  <text x="295" y="257" font-family="Arial" font-size="3">Title:</text>
-  <text x="295" y="267" font-family="Arial" font-size="3">Part:</text>
-  <text x="295" y="277" font-family="Arial" font-size="3">Date:</text>
-  <text x="295" y="287" font-family="Arial" font-size="3">Scale:</text>
-</svg>'''
-        
         template_path = os.path.join(self.output_dir, "template.svg")
         with open(template_path, 'w') as f:
-            f.write(template)
+            f.write(A3_TEMPLATE)
         return template_path
     
     def add_title_block(self, page, filename):
@@ -126,16 +139,15 @@ class StepToPdfConverter:
     
     def convert_all_step_files(self):
         """Convert all STEP files in the directory"""
-        step_files = []
-        
-        # Find all STEP files recursively
-        for root, dirs, files in os.walk(self.step_dir):
-            for file in files:
-                if file.endswith('.step') or file.endswith('.STEP'):
-                    step_files.append(os.path.join(root, file))
+        # All STEP files under step_dir, from the shared file index
+        step_files = find_files(self.step_dir, ('.step', '.stp'))
         
         print(f"Found {len(step_files)} STEP files to convert")
         
+        # Parse the uncached files in parallel up front
+        if self.step_cache is not None:
+            self.step_cache.load_all(step_files)
+        
         for step_file in step_files:
             try:
                 self.convert_step_to_pdf(step_file)
@@ -144,6 +156,22 @@ class StepToPdfConverter:
                 
         print(f"\nConversion complete! PDFs saved to {self.output_dir}")
 
+def convert_with_cadquery(step_dir="hardware/step", output_dir="docs/pdf"):
+    """Draw every STEP file with CadQuery/OCC - no FreeCAD needed
+    
+    Writes one PDF per file plus docs/pdf/dolly_drawings.pdf with every page.
+    """
+    step_files = find_files(step_dir, ('.step', '.stp'))
+    if not step_files:
+        print(f"  No STEP files in {step_dir} - run the CadQuery scripts first")
+        return None
+    print(f"  Drawing {len(step_files)} STEP files in parallel...")
+    catalog_path, paths = render_drawings(step_files, output_dir)
+    for path in paths:
+        print(f"  ✓ {path}")
+    print(f"  ✓ Catalog: {catalog_path}")
+    return catalog_path
+
 # Alternative: Command-line conversion using OpenSCAD
 def create_openscad_converter():
     """Create an OpenSCAD script for STEP to PDF conversion"""
@@ -170,113 +198,19 @@ import("dolly_complete_assembly.step");
     print("Created convert_step.scad")
     print("Usage: openscad -o output.pdf convert_step.scad")
 
-# Simpler approach: Generate HTML with screenshots
-def create_html_catalog():
-    """Create an HTML catalog that could be printed to PDF"""
-    html = '''<!DOCTYPE html>
-<html>
-<head>
-    <title>Dolly Robot Parts Catalog</title>
-    <style>
-        @media print {
-            .page-break { page-break-after: always; }
-        }
-        body { 
-            font-family: Arial, sans-serif; 
-            max-width: 800px; 
-            margin: 0 auto;
-        }
-        .part {
-            margin-bottom: 2em;
-            border: 1px solid #ccc;
-            padding: 1em;
-        }
-        .views {
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 1em;
-        }
-        .view {
-            border: 1px solid #ddd;
-            padding: 0.5em;
-            text-align: center;
-        }
-        h1 { color: #333; }
-        h2 { color: #0099cc; }
-        .specs {
-            background: #f0f0f0;
-            padding: 0.5em;
-            margin-top: 1em;
-        }
-    </style>
-</head>
-<body>
-    <h1>Dolly Robot Technical Documentation</h1>
-    <p>Generated from STEP files</p>
-    
-    <div class="part">
-        <h2>Complete Assembly</h2>
-        <div class="views">
-            <div class="view">
-                <h3>Front View</h3>
-                <div style="width: 300px; height: 300px; background: #eee; display: flex; align-items: center; justify-content: center;">
-                    [Screenshot would go here]
-                </div>
-            </div>
-            <div class="view">
-                <h3>Isometric View</h3>
-                <div style="width: 300px; height: 300px; background: #eee; display: flex; align-items: center; justify-content: center;">
-                    [Screenshot would go here]
-                </div>
-            </div>
-        </div>
-        <div class="specs">
-            <h3>Specifications</h3>
-            <ul>
-                <li>Height: 610mm (24")</li>
-                <li>Base: 300 x 250mm</li>
-                <li>Weight: ~15 lbs</li>
-                <li>Material: 2020 Aluminum + 3D Printed Parts</li>
-            </ul>
-        </div>
-    </div>
+# Simpler approach: a print-ready HTML catalog
+def create_html_catalog(step_dir="hardware/step"):
+    """Render the parts catalog (docs/parts_catalog.html) from the STEP files
     
-    <div class="page-break"></div>
-    
-    <div class="part">
-        <h2>Base Plate</h2>
-        <div class="views">
-            <div class="view">
-                <h3>Top View</h3>
-                <div style="width: 300px; height: 300px; background: #eee; display: flex; align-items: center; justify-content: center;">
-                    [Screenshot would go here]
-                </div>
-            </div>
-            <div class="view">
-                <h3>Detail View</h3>
-                <div style="width: 300px; height: 300px; background: #eee; display: flex; align-items: center; justify-content: center;">
-                    [Screenshot would go here]
-                </div>
-            </div>
-        </div>
-        <div class="specs">
-            <h3>Specifications</h3>
-            <ul>
-                <li>Material: 6mm Aluminum</li>
-                <li>Size: 280 x 230mm</li>
-                <li>Motor Slots: Adjustable</li>
-                <li>Tactile Features: 3 dots indicate front</li>
-            </ul>
-        </div>
-    </div>
-</body>
-</html>'''
-    
-    with open("docs/parts_catalog.html", 'w') as f:
-        f.write(html)
-    
-    print("Created parts_catalog.html")
+    Only parts whose STEP files changed since the last run are re-rendered.
+    """
+    if update_catalog is None:
+        print("  Install CadQuery to render the catalog: pip install cadquery")
+        return None
+    rendered, reused, _ = update_catalog(step_dir)
+    print(f"Updated parts_catalog.html ({len(rendered)} parts rendered, {len(reused)} unchanged)")
     print("This can be printed to PDF from any browser")
+    return rendered
 
 if __name__ == "__main__":
     print("STEP to PDF Conversion Options")
@@ -288,21 +222,27 @@ if __name__ == "__main__":
         converter = StepToPdfConverter()
         converter.convert_all_step_files()
     else:
-        print("\nOption 1: FreeCAD Python")
+        print("\nOption 1: CadQuery drawings (no FreeCAD needed)")
+        if render_drawings is not None:
+            convert_with_cadquery()
+        else:
+            print("  Install CadQuery: pip install cadquery")
+        
+        print("\nOption 2: FreeCAD Python")
         print("  Run this script from FreeCAD's Python console")
         print("  Or install FreeCAD and run: freecad -c step_to_pdf.py")
         
-        print("\nOption 2: OpenSCAD")
+        print("\nOption 3: OpenSCAD")
         create_openscad_converter()
         
-        print("\nOption 3: HTML Catalog")
+        print("\nOption 4: HTML Catalog")
         create_html_catalog()
         
-        print("\nOption 4: Online Converters")
+        print("\nOption 5: Online Converters")
         print("  - https://www.greentoken.de/onlineconv/")
         print("  - https://cadexchanger.com/")
         print("  - https://www.convertio.co/step-pdf/")
         
-        print("\nOption 5: Command Line Tools")
+        print("\nOption 6: Command Line Tools")
         print("  - step2pdf (Linux package)")
         print("  - python-occ with reportlab")
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Dolly Robot - Reproducible STEP Writer
+OCC stamps every STEP file with the wall-clock time and names the product
+after a per-process translator counter, so the same part exported twice
+never gives the same bytes. In reproducible mode the header gets fixed
+author/organization fields and a fixed timestamp (SOURCE_DATE_EPOCH when
+set), the product is named after the part, and the entities are
+renumbered in a canonical order, one per line.
+"""
+
+import io
+import os
+import re
+import time
+
+from OCP.APIHeaderSection import APIHeaderSection_MakeHeader
+from OCP.Interface import Interface_Static
+from OCP.STEPControl import STEPControl_Writer, STEPControl_AsIs
+from OCP.TCollection import TCollection_HAsciiString
+from OCP.TopoDS import TopoDS_Shape
+
+from tessellation import to_shape
+
+STEP_HEADER = {
+    'author': 'Dolly Robot Project',
+    'organization': 'Dolly Robot',
+}
+
+# A quoted STEP string ('' escapes a quote) or an entity reference
+_TOKEN = re.compile(r"('(?:[^']|'')*')|#(\d+)")
+# One entity instance in the DATA section
+_ENTITY = re.compile(r"#(\d+)\s*=\s*((?:'(?:[^']|'')*'|[^';])*);")
+# OCC's line wrapping: a newline plus continuation indent, outside strings
+_WRAP = re.compile(r"('(?:[^']|'')*')|\n *")
+# OCC's product names: a per-process counter, plus .N for compound members
+_PRODUCT_NAME = re.compile(r"'Open CASCADE STEP translator [^' ]+ \d+((?:\.\d+)*)'")
+
+
+def build_timestamp():
+    """Header timestamp for reproducible files: SOURCE_DATE_EPOCH, or the epoch"""
+    epoch = int(os.environ.get('SOURCE_DATE_EPOCH', 0))
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(epoch))
+
+
+def _quote(text):
+    return "'" + text.replace("'", "''") + "'"
+
+
+def _references(body):
+    return [int(ref) for _, ref in _TOKEN.findall(body) if ref]
+
+
+def canonical_entities(data, name=None):
+    """Renumber a STEP file's entities in canonical order
+
+    Entities are numbered depth-first from the roots (entities nothing
+    refers to, in file order), following references in the order they
+    appear, so the numbering depends on the model's content rather than
+    on the order OCC happened to create the entities. Each entity is
+    written on one line. With a name, OCC's numbered product names become
+    name, name.1, name.2...
+    """
+    text = data.decode('latin-1')
+    start = text.index('\nDATA;\n') + len('\nDATA;\n')
+    end = text.index('ENDSEC;', start)
+
+    bodies = {}
+    for match in _ENTITY.finditer(text, start, end):
+        body = _WRAP.sub(lambda m: m.group(1) or '', match.group(2))
+        if name and body.startswith('PRODUCT('):
+            body = _PRODUCT_NAME.sub(lambda m: _quote(name + m.group(1)), body)
+        bodies[int(match.group(1))] = body
+    children = {number: _references(body) for number, body in bodies.items()}
+
+    referenced = {ref for refs in children.values() for ref in refs}
+    numbering = {}
+    for root in bodies:
+        if root in referenced:
+            continue
+        stack = [root]
+        while stack:
+            number = stack.pop()
+            if number in numbering:
+                continue
+            numbering[number] = len(numbering) + 1
+            stack.extend(reversed(children[number]))
+
+    def renumber(match):
+        return match.group(1) or f'#{numbering[int(match.group(2))]}'
+
+    order = sorted(numbering, key=numbering.get)
+    lines = [f'#{numbering[n]} = {_TOKEN.sub(renumber, bodies[n])};\n' for n in order]
+    return (text[:start] + ''.join(lines) + text[end:]).encode('latin-1')
+
+
+def step_bytes(shape, name, reproducible=True, header=STEP_HEADER, timestamp=None):
+    """Write a Workplane, cq.Shape or OCC shape as STEP; returns the file's bytes"""
+    if not isinstance(shape, TopoDS_Shape):
+        shape = to_shape(shape).wrapped
+    writer = STEPControl_Writer()
+    # Same settings as cq.exporters.export; process-wide, so not thread-safe
+    Interface_Static.SetIVal_s("write.surfacecurve.mode", 1)
+    Interface_Static.SetIVal_s("write.precision.mode", 0)
+    Interface_Static.SetCVal_s("xstep.cascade.unit", "MM")
+    Interface_Static.SetCVal_s("write.step.unit", "MM")
+    writer.Transfer(shape, STEPControl_AsIs)
+
+    if reproducible:
+        fields = APIHeaderSection_MakeHeader(writer.Model())
+        fields.SetName(TCollection_HAsciiString(name))
+        fields.SetTimeStamp(TCollection_HAsciiString(timestamp or build_timestamp()))
+        fields.SetAuthorValue(1, TCollection_HAsciiString(header['author']))
+        fields.SetOrganizationValue(1, TCollection_HAsciiString(header['organization']))
+
+    stream = io.BytesIO()
+    writer.WriteStream(stream)
+    data = stream.getvalue()
+    return canonical_entities(data, name) if reproducible else data
+
+
+def write_step(path, shape, name=None, reproducible=True):
+    """Write a shape to a STEP file; returns the path"""
+    name = name or os.path.splitext(os.path.basename(path))[0]
+    with open(path, 'wb') as f:
+        f.write(step_bytes(shape, name, reproducible))
+    return path
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Dolly Robot - Fast STL Writer
+Builds STL facet records as NumPy arrays instead of looping in Python.
+Binary files are written with a single tofile() call (or one per chunk),
+or streamed as byte chunks with iter_stl(). With canonical=True the
+facets are written in a stable, geometry-defined order, so an unchanged
+part always gives a byte-identical file.
+"""
+
+import numpy as np
+
+# Binary STL facet: normal, three vertices, attribute byte count (50 bytes)
+STL_FACET_DTYPE = np.dtype([
+    ('normal', '<f4', (3,)),
+    ('vertices', '<f4', (3, 3)),
+    ('attribute', '<u2'),
+])
+
+STL_HEADER_SIZE = 80
+
+# Facets per chunk when streaming (about 3 MB of binary records)
+STREAM_CHUNK = 65536
+
+ASCII_FACET = (
+    "facet normal %e %e %e\n"
+    "  outer loop\n"
+    "    vertex %e %e %e\n"
+    "    vertex %e %e %e\n"
+    "    vertex %e %e %e\n"
+    "  endloop\n"
+    "endfacet\n"
+)
+
+
+def facet_normals(corners):
+    """Unit normals for an (M, 3, 3) array of triangle corners"""
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    # Degenerate triangles get a zero normal, which slicers recompute anyway
+    np.divide(normals, lengths, out=normals, where=lengths > 0)
+    return normals
+
+
+def facet_records(vertices, triangles):
+    """Build the binary STL record array for a mesh"""
+    corners = np.asarray(vertices, dtype=np.float64)[np.asarray(triangles)]
+
+    records = np.zeros(len(corners), dtype=STL_FACET_DTYPE)
+    records['normal'] = facet_normals(corners)
+    records['vertices'] = corners
+    return records
+
+
+def canonical_triangles(vertices, triangles):
+    """Triangles in a stable order that depends only on the geometry
+
+    Each triangle starts at its lowest corner (x, then y, then z), keeping
+    its winding, and the triangles are sorted by their corner coordinates.
+    The order of faces in the B-rep and of vertices in the mesh no longer
+    matters.
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    triangles = np.asarray(triangles).reshape(-1, 3)
+    if len(triangles) == 0:
+        return triangles
+
+    # Rank vertices lexicographically by position (coincident vertices tie)
+    _, rank = np.unique(vertices, axis=0, return_inverse=True)
+    rank = rank.reshape(-1)
+
+    # Rotate each triangle to start at its lowest-ranked corner
+    first = np.argmin(rank[triangles], axis=1)
+    rotation = (first[:, None] + np.arange(3)) % 3
+    triangles = np.take_along_axis(triangles, rotation, axis=1)
+
+    keys = rank[triangles]
+    return triangles[np.lexsort(keys.T[::-1])]
+
+
+def _binary_header(name, count):
+    header = f"Dolly Robot STL - {name}".encode('ascii', 'replace')
+    header = header[:STL_HEADER_SIZE].ljust(STL_HEADER_SIZE, b' ')
+    return header + np.uint32(count).tobytes()
+
+
+def _ascii_facets(vertices, triangles):
+    corners = np.asarray(vertices, dtype=np.float64)[np.asarray(triangles)]
+    rows = np.hstack([facet_normals(corners), corners.reshape(-1, 9)])
+    return (ASCII_FACET * len(rows)) % tuple(rows.ravel())
+
+
+def write_stl(path, vertices, triangles, name="part", ascii=False, chunk_size=None,
+              canonical=False):
+    """Write a mesh to an STL file
+
+    vertices/triangles are the arrays returned by tessellation.tessellate().
+    With chunk_size set, facets are built and written chunk_size at a time
+    so very large meshes never need the full record array in memory.
+    canonical=True writes the facets in canonical_triangles() order.
+    Returns the number of facets written.
+    """
+    triangles = np.asarray(triangles).reshape(-1, 3)
+    if canonical:
+        triangles = canonical_triangles(vertices, triangles)
+    count = len(triangles)
+    step = chunk_size or max(count, 1)
+
+    if ascii:
+        with open(path, 'w') as f:
+            f.write(f"solid {name}\n")
+            for start in range(0, count, step):
+                f.write(_ascii_facets(vertices, triangles[start:start + step]))
+            f.write(f"endsolid {name}\n")
+        return count
+
+    with open(path, 'wb') as f:
+        f.write(_binary_header(name, count))
+        for start in range(0, count, step):
+            facet_records(vertices, triangles[start:start + step]).tofile(f)
+
+    return count
+
+
+def iter_stl(vertices, triangles, name="part", ascii=False, chunk_size=STREAM_CHUNK,
+             canonical=False):
+    """Yield an STL file as byte chunks, chunk_size facets at a time
+
+    Produces exactly the bytes write_stl() would write, for callers that
+    stream into archives or sockets instead of files.
+    """
+    triangles = np.asarray(triangles).reshape(-1, 3)
+    if canonical:
+        triangles = canonical_triangles(vertices, triangles)
+    count = len(triangles)
+    step = chunk_size or max(count, 1)
+
+    if ascii:
+        yield f"solid {name}\n".encode('ascii')
+        for start in range(0, count, step):
+            yield _ascii_facets(vertices, triangles[start:start + step]).encode('ascii')
+        yield f"endsolid {name}\n".encode('ascii')
+        return
+
+    yield _binary_header(name, count)
+    for start in range(0, count, step):
+        yield facet_records(vertices, triangles[start:start + step]).tobytes()
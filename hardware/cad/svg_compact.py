@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Dolly Robot - Compact SVG Paths
+Shrinks projected drawings before they are written: coordinates are
+rounded to a fixed precision, duplicate edges are dropped, connected
+segments are merged into long polylines, and every line group becomes
+a single <path>. Files can also be written gzipped as .svgz.
+"""
+
+import gzip
+
+import numpy as np
+
+# Default post-writer settings; precision is decimal places in model units
+COMPACT_OPTIONS = {'precision': 2, 'merge': True, 'dedupe': True, 'gzip': False}
+
+
+def _quantize(polylines, precision):
+    """Round polylines to integer grid points, dropping repeated points"""
+    grid = 10.0 ** precision
+    result = []
+    for polyline in polylines:
+        points = np.rint(np.asarray(polyline) * grid).astype(np.int64)
+        keep = np.ones(len(points), dtype=bool)
+        keep[1:] = np.any(points[1:] != points[:-1], axis=1)
+        points = points[keep]
+        if len(points) > 1:
+            result.append(points)
+    return result
+
+
+def _drop_collinear(points):
+    """Remove interior points that lie straight between their neighbours"""
+    if len(points) < 3:
+        return points
+    before = points[1:-1] - points[:-2]
+    after = points[2:] - points[1:-1]
+    cross = before[:, 0] * after[:, 1] - before[:, 1] * after[:, 0]
+    dot = np.einsum('ij,ij->i', before, after)
+    keep = np.ones(len(points), dtype=bool)
+    keep[1:-1] = (cross != 0) | (dot <= 0)
+    return points[keep]
+
+
+def _chains(polylines, dedupe):
+    """Merge segments that meet end to end into the longest simple chains"""
+    segments = np.concatenate([
+        np.stack([p[:-1], p[1:]], axis=1) for p in polylines
+    ])
+    nodes, ids = np.unique(segments.reshape(-1, 2), axis=0, return_inverse=True)
+    edges = ids.reshape(-1, 2)
+    if dedupe:
+        edges = np.unique(np.sort(edges, axis=1), axis=0)
+
+    adjacency = [[] for _ in range(len(nodes))]
+    for index, (a, b) in enumerate(edges.tolist()):
+        adjacency[a].append(index)
+        adjacency[b].append(index)
+    degree = np.bincount(edges.ravel(), minlength=len(nodes))
+    used = np.zeros(len(edges), dtype=bool)
+
+    def walk(node, index):
+        chain = [node]
+        while True:
+            used[index] = True
+            a, b = edges[index]
+            node = b if a == node else a
+            chain.append(node)
+            if degree[node] != 2:
+                break
+            following = [i for i in adjacency[node] if not used[i]]
+            if not following:
+                break
+            index = following[0]
+        return nodes[chain]
+
+    chains = []
+    # Open chains run between junctions/ends; what remains are closed loops
+    starts = np.flatnonzero(degree != 2).tolist() + np.unique(edges[:, 0]).tolist()
+    for node in starts:
+        for index in adjacency[node]:
+            if not used[index]:
+                chains.append(walk(node, index))
+    return chains
+
+
+def _number(value, precision):
+    if precision <= 0:
+        return str(int(value))
+    text = f"{value / 10.0 ** precision:.{precision}f}".rstrip('0').rstrip('.')
+    return '0' if text == '-0' else text
+
+
+def path_data(polylines, precision=2, merge=True, dedupe=True):
+    """Compact SVG path data for a set of (N, 2) polylines"""
+    polylines = _quantize(polylines, precision)
+    if not polylines:
+        return ''
+
+    if merge:
+        polylines = _chains(polylines, dedupe)
+    elif dedupe:
+        unique = {}
+        for points in polylines:
+            forward = points.tobytes()
+            backward = points[::-1].tobytes()
+            unique.setdefault(min(forward, backward), points)
+        polylines = list(unique.values())
+
+    parts = []
+    for points in polylines:
+        closed = len(points) > 2 and np.array_equal(points[0], points[-1])
+        points = _drop_collinear(points)
+        if closed:
+            points = points[:-1]
+        coords = [f"{_number(x, precision)} {_number(y, precision)}" for x, y in points]
+        parts.append('M' + coords[0] + 'L' + ' '.join(coords[1:]) + ('Z' if closed else ''))
+    return ''.join(parts)
+
+
+def gzip_svg(data):
+    """Gzip SVG bytes for a .svgz file (reproducible: no timestamp)"""
+    return gzip.compress(data, mtime=0)
+
+
+def svgz_path(path):
+    """The .svgz name that goes with an .svg path"""
+    return path + 'z' if path.endswith('.svg') else path + '.svgz'
+
+
+def write_svg(path, text, compress=False):
+    """Write SVG text, plus a gzipped .svgz copy if compress is set
+
+    Returns the paths written.
+    """
+    data = text.encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(data)
+    paths = [path]
+
+    if compress:
+        with open(svgz_path(path), 'wb') as f:
+            f.write(gzip_svg(data))
+        paths.append(svgz_path(path))
+    return paths
@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+Dolly Robot - SVG Drawing Gallery
+Builds docs/svg-viewer.html from the drawings that were actually
+exported: every SVG in the export manifest, plus any other SVG under
+hardware/svg (the assembly script writes its own). Each drawing gets a
+small PNG thumbnail, rasterized from its path data with NumPy and cached
+by the SVG's SHA-256, so regenerating the gallery only renders drawings
+that changed. The page embeds the drawing list as JSON, shows it a page
+at a time and only loads thumbnails as they scroll into view.
+"""
+
+import json
+import os
+import re
+from html import escape
+
+import numpy as np
+
+from export_manifest import ExportManifest, file_hash
+from file_index import find_files, open_index
+from png_render import png_bytes
+
+GALLERY_PAGE = 'docs/svg-viewer.html'
+SVG_DIR = 'hardware/svg'
+THUMB_DIR_NAME = '.thumbs'
+THUMB_SIZE = (240, 180)
+PAGE_SIZE = 24
+
+_PATH_DATA = re.compile(r'\bd\s*=\s*"([^"]*)"')
+_PATH_COMMAND = re.compile(r'([MLZ])([^MLZ]*)')
+_NUMBER = re.compile(r'-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+_ROOT_SIZE = re.compile(r'<svg\b[^>]*?\bwidth\s*=\s*"([\d.]+)[a-z]*"[^>]*?\bheight\s*=\s*"([\d.]+)[a-z]*"', re.S)
+
+
+def svg_polylines(text):
+    """The polylines of every path in an SVG, in file units
+
+    Reads the absolute M/L/Z commands the drawing exporters write.
+    """
+    polylines = []
+    for data in _PATH_DATA.findall(text):
+        current = []
+        for command, arguments in _PATH_COMMAND.findall(data):
+            numbers = [float(n) for n in _NUMBER.findall(arguments)]
+            points = np.array(numbers[:len(numbers) // 2 * 2], dtype=np.float64).reshape(-1, 2)
+            if command == 'M':
+                polylines.append(current)
+                current = [points]
+            elif command == 'L':
+                current.append(points)
+            elif current:
+                current.append(current[0][:1])
+        polylines.append(current)
+    polylines = [np.vstack(p) for p in polylines if p]
+    return [p for p in polylines if len(p) > 1]
+
+
+def svg_size(text):
+    """(width, height) of an SVG's root element, or None"""
+    match = _ROOT_SIZE.search(text[:4096])
+    return (float(match.group(1)), float(match.group(2))) if match else None
+
+
+def render_thumbnail(polylines, size=THUMB_SIZE, margin=8, supersample=2):
+    """Anti-aliased line drawing of polylines fitted into size, as an RGB image"""
+    width, height = size
+    big_w, big_h = width * supersample, height * supersample
+    coverage = np.zeros((big_h, big_w), dtype=bool)
+
+    if polylines:
+        points = np.vstack(polylines)
+        low, high = points.min(axis=0), points.max(axis=0)
+        span = np.maximum(high - low, 1e-9)
+        scale = min((big_w - 2 * margin * supersample) / span[0],
+                    (big_h - 2 * margin * supersample) / span[1])
+        offset = (np.array([big_w, big_h]) - span * scale) / 2
+
+        starts = np.vstack([p[:-1] for p in polylines])
+        ends = np.vstack([p[1:] for p in polylines])
+        # Drawings are y-up (the SVG flips them with a negative scale)
+        a = (starts - low) * scale + offset
+        b = (ends - low) * scale + offset
+        a[:, 1], b[:, 1] = big_h - a[:, 1], big_h - b[:, 1]
+
+        # Sample every segment about once per pixel
+        samples = np.ceil(np.abs(b - a).max(axis=1)).astype(np.int64) + 1
+        segment = np.repeat(np.arange(len(a)), samples)
+        first = np.repeat(np.cumsum(samples) - samples, samples)
+        t = (np.arange(samples.sum()) - first) / np.maximum(samples[segment] - 1, 1)
+        xy = a[segment] + (b[segment] - a[segment]) * t[:, None]
+        x = np.clip(np.rint(xy[:, 0]).astype(np.int64), 0, big_w - 1)
+        y = np.clip(np.rint(xy[:, 1]).astype(np.int64), 0, big_h - 1)
+        coverage[y, x] = True
+
+    ink = coverage.reshape(height, supersample, width, supersample).mean(axis=(1, 3))
+    shade = (255 - ink * 220).astype(np.uint8)
+    return np.repeat(shade[:, :, None], 3, axis=2)
+
+
+def thumbnail(svg_path, digest, thumb_dir=None):
+    """Path of a drawing's cached thumbnail, rendering it if needed"""
+    thumb_dir = thumb_dir or os.path.join(os.path.dirname(svg_path), THUMB_DIR_NAME)
+    path = os.path.join(thumb_dir, f'{digest[:16]}.png')
+    if not os.path.exists(path):
+        with open(svg_path, encoding='utf-8') as f:
+            image = render_thumbnail(svg_polylines(f.read()))
+        os.makedirs(thumb_dir, exist_ok=True)
+        temporary = f'{path}.{os.getpid()}.tmp'
+        with open(temporary, 'wb') as f:
+            f.write(png_bytes(image))
+        os.replace(temporary, path)
+    return path
+
+
+def gallery_entries(manifest_path='hardware/manifest.json', svg_dir=SVG_DIR):
+    """One dict per exported drawing: path, part, view, sizes and thumbnail"""
+    manifest = ExportManifest(manifest_path)
+    index = open_index()
+    exported = {path: entry for path, entry in manifest.outputs.items()
+                if entry['format'] == 'svg' and path.endswith('.svg') and os.path.exists(path)}
+    paths = sorted(set(exported) | set(find_files(svg_dir, ('.svg',))))
+
+    entries = []
+    used_thumbs = set()
+    for path in paths:
+        output = exported.get(path, {})
+        indexed = index.entry(path)
+        digest = indexed['sha256'] if indexed else file_hash(path)
+        with open(path, encoding='utf-8') as f:
+            head = f.read(4096)
+
+        stem = os.path.splitext(os.path.basename(path))[0]
+        part = output.get('part')
+        view = stem[len(part) + 1:] if part and stem.startswith(part + '_') else ''
+        if not part:
+            part, _, view = stem.rpartition('_') if '_' in stem else (stem, '', '')
+
+        thumb = thumbnail(path, digest)
+        used_thumbs.add(os.path.abspath(thumb))
+        svgz = path + 'z'
+        entries.append({
+            'path': path,
+            'part': part,
+            'view': view,
+            'bytes': os.path.getsize(path),
+            'uncompacted_bytes': output.get('uncompacted_bytes'),
+            'svgz_bytes': os.path.getsize(svgz) if os.path.exists(svgz) else None,
+            'drawing_size': svg_size(head),
+            'part_size': output.get('part_size'),
+            'sha256': digest,
+            'thumbnail': thumb,
+        })
+
+    _prune_thumbnails({os.path.dirname(t) for t in used_thumbs}, used_thumbs)
+    return entries
+
+
+def _prune_thumbnails(directories, used):
+    """Delete thumbnails of drawings that changed or no longer exist"""
+    for directory in directories:
+        for name in os.listdir(directory):
+            path = os.path.abspath(os.path.join(directory, name))
+            if name.endswith('.png') and path not in used:
+                os.remove(path)
+
+
+def write_gallery(page=GALLERY_PAGE, manifest_path='hardware/manifest.json', svg_dir=SVG_DIR,
+                  page_size=PAGE_SIZE):
+    """Write the gallery page; returns the number of drawings in it"""
+    entries = gallery_entries(manifest_path, svg_dir)
+    base = os.path.dirname(os.path.abspath(page))
+    for entry in entries:
+        for key in ('path', 'thumbnail'):
+            entry[key] = os.path.relpath(os.path.abspath(entry[key]), base).replace(os.sep, '/')
+
+    # </script> can't appear inside the embedded JSON
+    data = json.dumps(entries, separators=(',', ':')).replace('</', '<\\/')
+    html = (GALLERY_TEMPLATE
+            .replace('__DRAWINGS__', data)
+            .replace('__PAGE_SIZE__', str(int(page_size)))
+            .replace('__COUNT__', escape(str(len(entries)))))
+    os.makedirs(base, exist_ok=True)
+    with open(page, 'w', encoding='utf-8') as f:
+        f.write(html)
+    return len(entries)
+
+
+GALLERY_TEMPLATE = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Dolly Robot - SVG Technical Drawings</title>
+    <style>
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, sans-serif;
+            max-width: 1200px;
+            margin: 0 auto;
+            padding: 20px;
+            background: #f5f5f5;
+        }
+
+        .header {
+            background: #2563eb;
+            color: white;
+            padding: 30px;
+            border-radius: 10px;
+            text-align: center;
+            margin-bottom: 30px;
+        }
+
+        h1 {
+            margin: 0;
+            font-size: 2.5em;
+        }
+
+        .toolbar {
+            display: flex;
+            gap: 10px;
+            align-items: center;
+            flex-wrap: wrap;
+            margin-bottom: 20px;
+        }
+
+        .toolbar input {
+            flex: 1;
+            min-width: 200px;
+            padding: 8px 12px;
+            border: 1px solid #d1d5db;
+            border-radius: 6px;
+        }
+
+        .toolbar button {
+            padding: 8px 14px;
+            border: none;
+            border-radius: 6px;
+            background: #2563eb;
+            color: white;
+            cursor: pointer;
+        }
+
+        .toolbar button:disabled {
+            background: #9ca3af;
+            cursor: default;
+        }
+
+        .drawing-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fill, minmax(260px, 1fr));
+            gap: 20px;
+        }
+
+        .drawing-card {
+            background: white;
+            border-radius: 8px;
+            overflow: hidden;
+            box-shadow: 0 2px 5px rgba(0,0,0,0.1);
+        }
+
+        .drawing-header {
+            background: #f3f4f6;
+            padding: 12px 15px;
+            border-bottom: 1px solid #e5e7eb;
+        }
+
+        .drawing-header h3 {
+            margin: 0;
+            color: #374151;
+            font-size: 1.05em;
+        }
+
+        .drawing-content {
+            display: block;
+            aspect-ratio: 4 / 3;
+            background: white;
+        }
+
+        .drawing-content img {
+            width: 100%;
+            height: 100%;
+            object-fit: contain;
+        }
+
+        .drawing-meta {
+            padding: 10px 15px;
+            font-size: 0.85em;
+            color: #6b7280;
+            border-top: 1px solid #e5e7eb;
+        }
+
+        .drawing-meta a {
+            color: #2563eb;
+            margin-right: 10px;
+        }
+
+        .info {
+            background: #fef3c7;
+            border: 1px solid #fbbf24;
+            border-radius: 6px;
+            padding: 15px;
+            margin-bottom: 20px;
+        }
+
+        .viewer-options {
+            background: white;
+            padding: 20px;
+            border-radius: 8px;
+            margin-bottom: 20px;
+        }
+
+        .format-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+            gap: 15px;
+            margin-top: 15px;
+        }
+
+        .format-card {
+            border: 1px solid #e5e7eb;
+            border-radius: 6px;
+            padding: 15px;
+            text-align: center;
+        }
+
+        .format-card h4 {
+            margin: 0 0 10px 0;
+            color: #2563eb;
+        }
+
+        .format-card p {
+            margin: 5px 0;
+            font-size: 0.9em;
+            color: #6b7280;
+        }
+
+        .empty {
+            color: #6b7280;
+            text-align: center;
+            padding: 40px;
+        }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>🤖 Dolly Robot</h1>
+        <p>Technical Drawings Viewer - __COUNT__ drawings</p>
+    </div>
+
+    <div class="info">
+        <h3>📋 About These Drawings</h3>
+        <p>These SVG files are generated directly from CADQuery 3D models. They show accurate 2D projections of each part.</p>
+        <p>Click a thumbnail to open the full drawing. SVG files can be opened in any web browser, edited in Inkscape/Illustrator, or used in documentation.</p>
+    </div>
+
+    <div class="viewer-options">
+        <h2>Available Export Formats from CADQuery</h2>
+        <div class="format-grid">
+            <div class="format-card">
+                <h4>STEP</h4>
+                <p>CAD Exchange</p>
+                <p>✓ Full 3D geometry</p>
+                <p>✓ Editable in CAD</p>
+            </div>
+            <div class="format-card">
+                <h4>STL</h4>
+                <p>3D Printing</p>
+                <p>✓ Direct to slicer</p>
+                <p>✓ Mesh format</p>
+            </div>
+            <div class="format-card">
+                <h4>SVG</h4>
+                <p>2D Drawings</p>
+                <p>✓ Browser viewable</p>
+                <p>✓ Vector graphics</p>
+            </div>
+            <div class="format-card">
+                <h4>DXF</h4>
+                <p>Laser Cutting</p>
+                <p>✓ 2D profiles</p>
+                <p>✓ CAD compatible</p>
+            </div>
+            <div class="format-card">
+                <h4>VRML</h4>
+                <p>3D Visualization</p>
+                <p>✓ Color support</p>
+                <p>✓ Web viewable</p>
+            </div>
+            <div class="format-card">
+                <h4>AMF</h4>
+                <p>Advanced 3D Print</p>
+                <p>✓ Color/material</p>
+                <p>✓ Next-gen format</p>
+            </div>
+        </div>
+    </div>
+
+    <h2>SVG Drawing Gallery</h2>
+    <div class="toolbar">
+        <input id="search" type="search" placeholder="Filter by part or view...">
+        <button id="previous">◀ Previous</button>
+        <span id="page-label"></span>
+        <button id="next">Next ▶</button>
+    </div>
+
+    <div class="drawing-grid" id="drawingGrid"></div>
+
+    <script>
+        // Generated by hardware/cad/svg_gallery.py from the export manifest
+        const drawings = __DRAWINGS__;
+        const PAGE_SIZE = __PAGE_SIZE__;
+
+        const grid = document.getElementById('drawingGrid');
+        let shown = drawings;
+        let page = 0;
+
+        // Thumbnails load as their cards scroll into view
+        const observer = new IntersectionObserver(entries => {
+            entries.forEach(entry => {
+                if (entry.isIntersecting) {
+                    entry.target.src = entry.target.dataset.src;
+                    observer.unobserve(entry.target);
+                }
+            });
+        }, { rootMargin: '200px' });
+
+        function kilobytes(bytes) {
+            return bytes < 1024 ? `${bytes} B` : `${(bytes / 1024).toFixed(1)} KB`;
+        }
+
+        function card(drawing) {
+            const element = document.createElement('div');
+            element.className = 'drawing-card';
+            const title = `${drawing.part.replace(/_/g, ' ')}${drawing.view ? ' - ' + drawing.view : ''}`;
+            const facts = [kilobytes(drawing.bytes)];
+            if (drawing.uncompacted_bytes) facts[0] += ` (${kilobytes(drawing.uncompacted_bytes)} before compaction)`;
+            if (drawing.drawing_size) facts.push(`Sheet ${drawing.drawing_size.map(Math.round).join(' x ')}`);
+            if (drawing.part_size) facts.push(`Part ${drawing.part_size.map(v => Math.round(v * 10) / 10).join(' x ')} mm`);
+            const links = [`<a href="${drawing.path}" target="_blank">SVG</a>`];
+            if (drawing.svgz_bytes) links.push(`<a href="${drawing.path}z">SVGZ (${kilobytes(drawing.svgz_bytes)})</a>`);
+            element.innerHTML = `
+                <div class="drawing-header"><h3></h3></div>
+                <a class="drawing-content" href="${drawing.path}" target="_blank">
+                    <img data-src="${drawing.thumbnail}" alt="" width="240" height="180">
+                </a>
+                <div class="drawing-meta">${facts.join('<br>')}<br>${links.join('')}</div>
+            `;
+            element.querySelector('h3').textContent = title;
+            element.querySelector('img').alt = title;
+            observer.observe(element.querySelector('img'));
+            return element;
+        }
+
+        function render() {
+            const pages = Math.max(1, Math.ceil(shown.length / PAGE_SIZE));
+            page = Math.min(page, pages - 1);
+            observer.disconnect();
+            const cards = shown.slice(page * PAGE_SIZE, (page + 1) * PAGE_SIZE).map(card);
+            grid.replaceChildren(...cards);
+            if (!cards.length) {
+                grid.innerHTML = '<p class="empty">No drawings yet - run the CadQuery exporters with the svg format.</p>';
+            }
+            document.getElementById('page-label').textContent = `Page ${page + 1} of ${pages} (${shown.length} drawings)`;
+            document.getElementById('previous').disabled = page === 0;
+            document.getElementById('next').disabled = page >= pages - 1;
+        }
+
+        document.getElementById('search').addEventListener('input', event => {
+            const query = event.target.value.toLowerCase();
+            shown = drawings.filter(d => `${d.part} ${d.view} ${d.path}`.toLowerCase().includes(query));
+            page = 0;
+            render();
+        });
+        document.getElementById('previous').addEventListener('click', () => { page--; render(); window.scrollTo(0, 0); });
+        document.getElementById('next').addEventListener('click', () => { page++; render(); window.scrollTo(0, 0); });
+
+        render();
+    </script>
+</body>
+</html>'''
+
+
+# Regenerate the gallery: python svg_gallery.py, from the repository root
+if __name__ == "__main__":
+    count = write_gallery()
+    print(f"🖼️  Created: {GALLERY_PAGE} ({count} drawings)")
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Dolly Robot - Batched SVG Views
+Hidden-line projections of one shape from several directions.
+The shape is prepared once (serialized to B-rep) and every view is
+projected in parallel worker processes; each worker loads a shape at
+most once, however many of its views it projects.
+"""
+
+import hashlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import cadquery as cq
+from cadquery.occ_impl.shapes import TOLERANCE
+from cadquery.occ_impl.exporters.svg import (
+    SVG_TEMPLATE, AXES_TEMPLATE, PATHTEMPLATE, DISCRETIZATION_TOLERANCE,
+    guessUnitOfMeasure,
+)
+from OCP.BRepLib import BRepLib
+from OCP.BRepTools import BRepTools
+from OCP.GCPnts import GCPnts_QuasiUniformDeflection
+from OCP.HLRAlgo import HLRAlgo_Projector
+from OCP.HLRBRep import HLRBRep_Algo, HLRBRep_HLRToShape
+from OCP.TopTools import TopTools_FormatVersion
+from OCP.gp import gp_Ax2, gp_Pnt, gp_Dir
+
+from tessellation import to_shape
+from svg_compact import path_data, write_svg
+
+# Same defaults as cq.exporters.export(..., opt=...)
+DEFAULT_OPTIONS = {
+    "width": 800,
+    "height": 240,
+    "marginLeft": 200,
+    "marginTop": 20,
+    "projectionDir": (-1.75, 1.1, 5),
+    "showAxes": True,
+    "strokeWidth": -1.0,
+    "strokeColor": (0, 0, 0),
+    "hiddenColor": (160, 160, 160),
+    "showHidden": True,
+    "focus": None,
+}
+
+# Below this many faces a view projects faster than a worker starts,
+# so the views are projected in-process
+PARALLEL_MIN_FACES = 1000
+
+# Shapes already loaded in this worker process, by B-rep hash
+_worker_shapes = {}
+
+
+def _edge_polyline(edge):
+    """Discretize an edge into an (N, 2) array of projected points"""
+    curve = edge._geomAdaptor()
+    points = GCPnts_QuasiUniformDeflection(
+        curve, DISCRETIZATION_TOLERANCE, curve.FirstParameter(), curve.LastParameter()
+    )
+    if not points.IsDone() or points.NbPoints() == 0:
+        return None
+    coords = [points.Value(i + 1) for i in range(points.NbPoints())]
+    return np.array([(p.X(), p.Y()) for p in coords])
+
+
+def project(shape, direction, focus=None, hidden=True, x_direction=None):
+    """Hidden-line projection of a shape along one direction
+
+    Returns {'visible': [...], 'hidden': [...]} where each list holds one
+    (N, 2) polyline per projected edge. x_direction optionally fixes which
+    model direction points right in the view (it must be perpendicular to
+    direction); otherwise OCC picks one.
+    """
+    hlr = HLRBRep_Algo()
+    hlr.Add(shape.wrapped)
+
+    if x_direction is not None:
+        coordinate_system = gp_Ax2(gp_Pnt(), gp_Dir(*direction), gp_Dir(*x_direction))
+    else:
+        coordinate_system = gp_Ax2(gp_Pnt(), gp_Dir(*direction))
+    if focus is not None:
+        projector = HLRAlgo_Projector(coordinate_system, focus)
+    else:
+        projector = HLRAlgo_Projector(coordinate_system)
+
+    hlr.Projector(projector)
+    hlr.Update()
+    hlr.Hide()
+    shapes = HLRBRep_HLRToShape(hlr)
+
+    groups = {
+        'visible': [shapes.VCompound(), shapes.Rg1LineVCompound(), shapes.OutLineVCompound()],
+        'hidden': [shapes.HCompound(), shapes.OutLineHCompound()] if hidden else [],
+    }
+
+    result = {}
+    for kind, compounds in groups.items():
+        polylines = []
+        for compound in compounds:
+            if compound.IsNull():
+                continue
+            # Projected edges only have 2D curves until these are built
+            BRepLib.BuildCurves3d_s(compound, TOLERANCE)
+            for edge in cq.Shape.cast(compound).Edges():
+                polyline = _edge_polyline(edge)
+                if polyline is not None:
+                    polylines.append(polyline)
+        result[kind] = polylines
+    return result
+
+
+def _shape_to_brep(shape):
+    stream = io.BytesIO()
+    BRepTools.Write_s(
+        shape.wrapped, stream, False, False,
+        TopTools_FormatVersion.TopTools_FormatVersion_VERSION_1
+    )
+    return stream.getvalue()
+
+
+def _project_in_worker(key, brep, direction, focus, hidden):
+    shape = _worker_shapes.get(key)
+    if shape is None:
+        _worker_shapes.clear()
+        shape = _worker_shapes[key] = cq.Shape.importBrep(io.BytesIO(brep))
+    return project(shape, direction, focus, hidden)
+
+
+def _format_path(polyline):
+    x, y = polyline[0]
+    return f"M{x},{y} " + "".join(f"L{x},{y} " for x, y in polyline[1:])
+
+
+def render_svg(projection, options=None, uom="mm", compact=None):
+    """SVG text for one projection, laid out like cq.exporters.export
+
+    compact is an optional dict of svg_compact.path_data settings
+    (precision, merge, dedupe); each line group is then a single path.
+    """
+    d = dict(DEFAULT_OPTIONS)
+    if options:
+        d.update(options)
+
+    width = float(d["width"]) if d["width"] is not None else None
+    height = float(d["height"]) if d["height"] is not None else None
+    margin_left = float(d["marginLeft"])
+    margin_top = float(d["marginTop"])
+    stroke_width = float(d["strokeWidth"])
+
+    visible = projection['visible']
+    hidden = projection['hidden'] if d["showHidden"] else []
+
+    points = np.vstack(visible + projection['hidden'] or [np.zeros((1, 2))])
+    (xmin, ymin), (xmax, ymax) = points.min(axis=0), points.max(axis=0)
+    xlen, ylen = max(xmax - xmin, 1e-9), max(ymax - ymin, 1e-9)
+
+    # Fit to the given width and/or height
+    if width is None or height is None:
+        if width is None:
+            width = (height - 2.0 * margin_top) * (xlen / ylen) + 2.0 * margin_left
+        else:
+            height = (width - 2.0 * margin_left) * (ylen / xlen) + 2.0 * margin_top
+        unit_scale = (width - 2.0 * margin_left) / xlen
+    else:
+        unit_scale = min(width / xlen * 0.75, height / ylen * 0.75)
+
+    x_translate = -xmin + margin_left / unit_scale
+    y_translate = -ymax - margin_top / unit_scale
+    if stroke_width == -1.0:
+        stroke_width = 1.0 / unit_scale
+
+    axes = ""
+    if d["showAxes"] and tuple(d["projectionDir"]) == DEFAULT_OPTIONS["projectionDir"]:
+        axes = AXES_TEMPLATE % {
+            "unitScale": str(unit_scale), "textboxY": str(height - 30), "uom": uom
+        }
+
+    if compact:
+        settings = {k: compact[k] for k in ('precision', 'merge', 'dedupe') if k in compact}
+        hidden_content = path_data(hidden, **settings)
+        visible_content = path_data(visible, **settings)
+        hidden_content = PATHTEMPLATE % hidden_content if hidden_content else ""
+        visible_content = PATHTEMPLATE % visible_content if visible_content else ""
+    else:
+        hidden_content = "".join(PATHTEMPLATE % _format_path(p) for p in hidden)
+        visible_content = "".join(PATHTEMPLATE % _format_path(p) for p in visible)
+
+    return SVG_TEMPLATE % {
+        "unitScale": str(unit_scale),
+        "strokeWidth": str(stroke_width),
+        "strokeColor": ",".join(str(x) for x in d["strokeColor"]),
+        "hiddenColor": ",".join(str(x) for x in d["hiddenColor"]),
+        "hiddenContent": hidden_content,
+        "visibleContent": visible_content,
+        "xTranslate": str(x_translate),
+        "yTranslate": str(y_translate),
+        "width": str(width),
+        "height": str(height),
+        "textboxY": str(height - 30),
+        "uom": uom,
+        "axesIndicator": axes,
+    }
+
+
+class ViewProjector:
+    """Project many views of a shape, sharing one pool of worker processes"""
+
+    def __init__(self, processes=None, min_faces=PARALLEL_MIN_FACES):
+        self.processes = processes or os.cpu_count() or 1
+        self.min_faces = min_faces
+        self._pool = None
+
+        # Byte size each compacted file would have had without compaction
+        self.uncompacted_sizes = {}
+
+    def project_views(self, obj, directions, options=None):
+        """Project a shape along each direction with the same options"""
+        d = dict(DEFAULT_OPTIONS)
+        if options:
+            d.update(options)
+        shape = to_shape(obj)
+        focus = float(d["focus"]) if d.get("focus") else None
+        hidden = bool(d["showHidden"])
+
+        if (len(directions) < 2 or self.processes < 2
+                or len(shape.Faces()) < self.min_faces):
+            return [project(shape, tuple(direction), focus, hidden) for direction in directions]
+
+        brep = _shape_to_brep(shape)
+        key = hashlib.sha256(brep).hexdigest()
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.processes)
+        futures = [
+            self._pool.submit(_project_in_worker, key, brep, tuple(direction), focus, hidden)
+            for direction in directions
+        ]
+        return [future.result() for future in futures]
+
+    def render_views(self, obj, views, options=None, compact=None):
+        """SVG text for each (view_name, direction), projected together
+
+        Returns a list of (view_name, svg_text, uncompacted_bytes) where
+        uncompacted_bytes is None unless compact settings were given.
+        """
+        shape = to_shape(obj)
+        directions = [direction for _, direction in views]
+        projections = self.project_views(shape, directions, options)
+        uom = guessUnitOfMeasure(shape)
+
+        rendered = []
+        for (view_name, direction), projection in zip(views, projections):
+            view_options = dict(options or {}, projectionDir=direction)
+            svg = render_svg(projection, view_options, uom, compact)
+            full_size = None
+            if compact:
+                full_size = len(render_svg(projection, view_options, uom).encode('utf-8'))
+            rendered.append((view_name, svg, full_size))
+        return rendered
+
+    def export_views(self, obj, views, path_for, options=None, compact=None):
+        """Write one SVG per (view_name, direction); returns the paths
+
+        path_for(view_name) gives each file's path. compact is an optional
+        dict of svg_compact settings (see COMPACT_OPTIONS); with 'gzip'
+        set, a .svgz copy is written next to each .svg.
+        """
+        paths = []
+        for view_name, svg, full_size in self.render_views(obj, views, options, compact):
+            written = write_svg(path_for(view_name), svg, bool(compact and compact.get('gzip')))
+            if full_size is not None:
+                for path in written:
+                    self.uncompacted_sizes[path] = full_size
+            paths.extend(written)
+        return paths
+
+    def close(self):
+        """Shut down the worker processes"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Dolly Robot - Tessellation Helpers
+Turn CadQuery shapes into NumPy triangle meshes for the mesh exporters
+"""
+
+import cadquery as cq
+import numpy as np
+from OCP.BRepTools import BRepTools
+
+# Tessellation profiles by intended use.
+# Linear deflection is a fraction of the part's bounding-box diagonal,
+# clamped to [min, max] mm. Angular deflection is in radians.
+# max_triangles (if set) coarsens the mesh until it fits the budget.
+TESSELLATION_PROFILES = {
+    'print': {
+        'relative': 0.0002, 'min': 0.002, 'max': 0.05,
+        'angular': 0.3, 'max_triangles': None,
+    },
+    'web': {
+        'relative': 0.001, 'min': 0.01, 'max': 0.5,
+        'angular': 0.5, 'max_triangles': 200000,
+    },
+    'preview': {
+        'relative': 0.005, 'min': 0.05, 'max': 2.0,
+        'angular': 0.8, 'max_triangles': 50000,
+    },
+}
+
+
+def to_shape(obj):
+    """Return a single cq.Shape for a Workplane, Shape or list of shapes"""
+    if isinstance(obj, cq.Shape):
+        return obj
+    if isinstance(obj, cq.Workplane):
+        shapes = [v for v in obj.vals() if isinstance(v, cq.Shape)]
+    else:
+        shapes = list(obj)
+
+    if len(shapes) == 1:
+        return shapes[0]
+    return cq.Compound.makeCompound(shapes)
+
+
+def clear_mesh(obj):
+    """Drop any triangulation cached on a part's faces
+
+    Exporters that mesh the shape themselves (VRML, AMF, Three.js) keep an
+    existing finer mesh, so clear it to make their output independent of
+    which formats were exported before.
+    """
+    BRepTools.Clean_s(to_shape(obj).wrapped)
+
+
+def tessellate(obj, tolerance=0.001, angular_tolerance=0.1):
+    """Tessellate a part into (vertices, triangles) arrays
+
+    vertices is an (N, 3) float64 array, triangles an (M, 3) uint32
+    array of indices into vertices with outward (right-hand) winding.
+    """
+    shape = to_shape(obj)
+    # OCC keeps an existing finer triangulation, so drop it first or a
+    # coarse request after a fine one would return the fine mesh
+    clear_mesh(shape)
+    points, faces = shape.tessellate(tolerance, angular_tolerance)
+
+    vertices = np.array([p.toTuple() for p in points], dtype=np.float64)
+    triangles = np.array(faces, dtype=np.uint32)
+
+    return vertices.reshape(-1, 3), triangles.reshape(-1, 3)
+
+
+def vertex_normals(vertices, triangles):
+    """Area-weighted unit vertex normals for a triangle mesh"""
+    corners = vertices[triangles]
+    face_normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+
+    normals = np.zeros_like(vertices)
+    for k in range(3):
+        np.add.at(normals, triangles[:, k], face_normals)
+
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    np.divide(normals, lengths, out=normals, where=lengths > 0)
+    return normals
+
+
+def deflection_for(obj, profile='print', overrides=None):
+    """Linear and angular deflection for a part under a profile
+
+    overrides is an optional dict of profile keys to replace for this part,
+    e.g. {'angular': 0.05} for a small curved part, or {'linear': 0.01}
+    to pin the linear deflection outright.
+    """
+    settings = dict(TESSELLATION_PROFILES[profile])
+    settings.update(overrides or {})
+
+    if 'linear' in settings:
+        linear = settings['linear']
+    else:
+        diagonal = to_shape(obj).BoundingBox().DiagonalLength
+        linear = min(max(diagonal * settings['relative'], settings['min']), settings['max'])
+
+    return linear, settings['angular']
+
+
+def tessellate_for(obj, profile='print', overrides=None):
+    """Tessellate a part for a profile
+
+    Returns (vertices, triangles, info) where info records the deflections
+    used and the resulting triangle count.
+    """
+    settings = dict(TESSELLATION_PROFILES[profile])
+    settings.update(overrides or {})
+    linear, angular = deflection_for(obj, profile, overrides)
+
+    vertices, triangles = tessellate(obj, linear, angular)
+
+    # Coarsen until the mesh fits the profile's triangle budget
+    budget = settings.get('max_triangles')
+    while budget and len(triangles) > budget and linear < settings['max']:
+        linear = min(linear * 2, settings['max'])
+        angular = min(angular * 1.5, 1.0)
+        vertices, triangles = tessellate(obj, linear, angular)
+
+    info = {
+        'profile': profile,
+        'tolerance': linear,
+        'angular_tolerance': angular,
+        'triangles': int(len(triangles)),
+    }
+    return vertices, triangles, info
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Dolly Robot - Watch Mode
+Rebuilds parts while their CAD modules are being edited. The part
+modules in hardware/cad (dolly_*.py) are watched with the file index's
+watcher; when one is saved, only that module is reloaded and only the
+parts it defines are rebuilt and re-exported to the web mesh store -
+parts whose geometry didn't change are skipped through the export
+manifest's fingerprints. The model server runs in the same process and
+tells every open 3D viewer over its /api/live WebSocket which parts
+changed, so the page swaps them in place.
+"""
+
+import asyncio
+import importlib
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+
+import cadquery as cq
+
+from export_manifest import options_hash
+from file_index import FileIndex, INDEX_ROOT
+from model_server import DEFAULT_HOST, DEFAULT_PORT, HOME_PAGE, ModelServer
+from multi_format_export import DollyExporter
+from part_modules import MODULE_PREFIX, method_keys, part_builders
+
+CAD_DIR = os.path.join(INDEX_ROOT, 'cad')
+WATCH_INDEX = os.path.join(INDEX_ROOT, '.watch_index.json')
+
+# What the 3D viewer loads
+WEB_FORMATS = ('meshstore',)
+
+# Editors write a file in several steps; wait for them to finish
+SETTLE_SECONDS = 0.15
+
+def module_parts(module, cache=None):
+    """(parts, assemblies, errors, reused) defined by a part module (see part_builders)
+
+    parts is a list of (name, part, None), with numbered names for methods
+    returning several parts; assemblies maps names to (name, part,
+    instances). A create_*() method that raises is reported in errors
+    ({name: message}) without stopping the other parts.
+
+    With a cache dict, methods whose source (see method_keys) is unchanged
+    since the last call return their previous parts without running;
+    the names of those parts are in reused.
+    """
+    keys = method_keys(module) if cache is not None else {}
+    parts, assemblies, errors, reused = [], {}, {}, set()
+    for name, method, is_assembly in part_builders(module):
+        if is_assembly:
+            assemblies[name] = method()
+            continue
+
+        class_name = type(method.__self__).__name__
+        key = keys.get((class_name, method.__name__))
+        cache_key = (module.__name__, class_name, method.__name__)
+        hit = key is not None and cache.get(cache_key, (None,))[0] == key
+        if hit:
+            result = cache[cache_key][1]
+        else:
+            try:
+                result = method()
+            except Exception as error:
+                result = error
+            if key is not None:
+                cache[cache_key] = (key, result)
+        if isinstance(result, Exception):
+            errors[name] = f'{type(result).__name__}: {result}'
+            continue
+        results = result if isinstance(result, tuple) else (result,)
+        for number, part in enumerate(results, start=1):
+            if isinstance(part, (cq.Workplane, cq.Shape)):
+                part_name = name if len(results) == 1 else f'{name}_{number}'
+                parts.append((part_name, part, None))
+                if hit:
+                    reused.add(part_name)
+    return parts, assemblies, errors, reused
+
+
+class PartWatcher:
+    """Rebuild and re-export the parts of each part module that changes"""
+
+    def __init__(self, notify=None, formats=WEB_FORMATS, cad_dir=CAD_DIR):
+        self.notify = notify or (lambda message: None)
+        self.formats = list(formats)
+        self.exporter = DollyExporter()
+        # Parts built by each create_*() method, by source hash (see module_parts)
+        self.built_parts = {}
+        self.index = FileIndex(cad_dir, WATCH_INDEX, extensions=('.py',))
+        self.index.refresh()
+        self.index.save()
+        # Source hash each module was last built (or found) at, so saves
+        # that don't change the file don't trigger a rebuild
+        self.sources = {self._module(path): self.index.entry(path)['sha256']
+                      for path in self.index.query()}
+        self._pending = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = None
+        self.mode = None
+
+    def _module(self, path):
+        return os.path.splitext(os.path.basename(path))[0]
+
+    def start(self):
+        self.mode = self.index.watch(self._changed).mode
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._pending.put(None)
+        if self._thread is not None:
+            self._thread.join()
+        self.exporter.close()
+        self.index.close()
+
+    def _changed(self, changes):
+        for relative in changes['added'] + changes['changed']:
+            self._pending.put(self._module(relative))
+
+    def _run(self):
+        while not self._stop.is_set():
+            module_name = self._pending.get()
+            if module_name is None:
+                break
+            time.sleep(SETTLE_SECONDS)
+            # One build per module for a burst of changes
+            modules = {module_name}
+            while not self._pending.empty():
+                modules.add(self._pending.get())
+            modules.discard(None)
+            for name in sorted(modules):
+                entry = self.index.entry(os.path.join(self.index.root, f'{name}.py'))
+                if entry is None or self.sources.get(name) == entry['sha256']:
+                    continue
+                self.sources[name] = entry['sha256']
+                if name.startswith(MODULE_PREFIX):
+                    self.build(name)
+                else:
+                    print(f"  ℹ️  {name}.py changed - restart watch mode to use it")
+
+    def build(self, module_name):
+        """Rebuild one module's parts and notify viewers; returns the message"""
+        print(f"🔨 {module_name}.py changed - rebuilding its parts...")
+        self.notify({'type': 'building', 'module': module_name})
+        start = time.perf_counter()
+        manifest = self.exporter.manifest
+        try:
+            if module_name in sys.modules:
+                module = importlib.reload(sys.modules[module_name])
+            else:
+                module = importlib.import_module(module_name)
+            parts, assemblies, errors, reused = module_parts(module, self.built_parts)
+        except Exception as error:
+            traceback.print_exc()
+            message = {'type': 'error', 'module': module_name,
+                       'message': f'{type(error).__name__}: {error}'}
+            self.notify(message)
+            return message
+
+        layouts = {name: manifest.assemblies.get(name) for name in assemblies}
+        self.exporter.skipped = []
+        paths = []
+        exports = [(name, self.exporter.export_mesh_assembly, components)
+                   for name, components in assemblies.items()]
+        exports += [(name, self.exporter.export_all_formats, part) for name, part, _ in parts]
+        for name, export, obj in exports:
+            try:
+                paths += export(obj, name, self.formats)
+            except Exception as error:
+                errors[name] = f'{type(error).__name__}: {error}'
+        self.exporter.write_manifest()
+        # Saves are minutes apart; don't keep projection workers idle in between
+        self.exporter.close()
+
+        # Parts with freshly written files, each with a version for cache
+        # busting; parts whose method didn't rerun haven't changed
+        skipped = set(self.exporter.skipped)
+        hashes = {}
+        for path in paths:
+            if path not in skipped and manifest.outputs[path]['part'] not in reused:
+                entry = manifest.outputs[path]
+                hashes.setdefault(entry['part'], []).append(entry['sha256'])
+        changed = {part: options_hash(sorted(digests)) for part, digests in hashes.items()}
+        message = {
+            'type': 'parts',
+            'module': module_name,
+            'parts': changed,
+            'assemblies': sorted(name for name in assemblies
+                                 if manifest.assemblies.get(name) != layouts[name]),
+            'errors': errors,
+            'seconds': round(time.perf_counter() - start, 2),
+        }
+        total = len(parts) + sum(len(components) for components in assemblies.values())
+        print(f"  ✓ {len(changed)} of {total} parts changed in {message['seconds']}s"
+              + (f": {', '.join(changed)}" if changed else ''))
+        for name, error in errors.items():
+            print(f"  ⚠️  Could not build {name}: {error}")
+        self.notify(message)
+        return message
+
+
+def watch(host=DEFAULT_HOST, port=DEFAULT_PORT, formats=WEB_FORMATS):
+    """Serve the docs and rebuild edited parts until interrupted"""
+    server = ModelServer(host, port, log=False)
+    watcher = PartWatcher(server.notify, formats).start()
+    print(f"👀 Watching {len(watcher.sources)} modules in {CAD_DIR} "
+          f"({watcher.mode})")
+    print(f"   Open http://{host}:{port}{HOME_PAGE.replace('index.html', '3d-viewer.html')}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("\nWatch mode stopped")
+    finally:
+        watcher.stop()
+
+
+# python hardware/cad/watch_parts.py [port] [--public], from the repository root
+if __name__ == "__main__":
+    arguments = [a for a in sys.argv[1:] if not a.startswith('--')]
+    watch(host='0.0.0.0' if '--public' in sys.argv else DEFAULT_HOST,
+          port=int(arguments[0]) if arguments else DEFAULT_PORT)
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Dolly Robot - STEP Metadata Scanner
+Reads what a file browser needs to know about a STEP file - header
+fields, schema, products, units, entity counts and approximate bounds -
+without building any geometry. The HEADER section is parsed directly and
+the DATA section is scanned with regular expressions over a memory-mapped
+file. Results are cached by file size and modification time.
+"""
+
+import json
+import mmap
+import os
+import re
+from collections import Counter
+
+CACHE_DIR_NAME = '.step_cache'
+CACHE_FILE = 'metadata.json'
+
+# Bump when the scan result layout changes, to invalidate old caches
+SCAN_VERSION = 1
+
+_HEADER = re.compile(rb'HEADER\s*;(.*?)ENDSEC\s*;', re.S)
+_HEADER_ENTITY = re.compile(rb"([A-Z_][A-Z0-9_]*)\s*\(((?:'(?:[^']|'')*'|[^';])*)\)\s*;")
+_PARAM_TOKEN = re.compile(r"'((?:[^']|'')*)'|([(),])|([^'(),\s]+)")
+
+_DATA = re.compile(rb'\bDATA\s*;')
+# '#12 = NAME(' or '#12 = ( NAME(' for complex instances
+_INSTANCE = re.compile(rb'#\d+\s*=\s*(\(\s*)?([A-Z_][A-Z0-9_]*)')
+_PRODUCT = re.compile(rb"[=\s(]PRODUCT\s*\(\s*'((?:[^']|'')*)'")
+_SI_UNIT = re.compile(rb'SI_UNIT\s*\(\s*(\.[A-Z_]+\.|\$|\*)\s*,\s*\.([A-Z_]+)\.\s*\)')
+_CONVERTED_UNIT = re.compile(rb"CONVERSION_BASED_UNIT\s*\(\s*'((?:[^']|'')*)'")
+_POINT = re.compile(rb"CARTESIAN_POINT\s*\(\s*'(?:[^']|'')*'\s*,\s*\(([^)]*)\)\s*\)")
+
+_SI_PREFIXES = {'MILLI': 'mm', 'CENTI': 'cm', 'DECI': 'dm', 'KILO': 'km', None: 'm'}
+
+
+def _parse_params(text):
+    """Parse a Part 21 parameter list into nested Python lists of strings"""
+    stack = [[]]
+    for quoted, punctuation, word in _PARAM_TOKEN.findall(text):
+        if punctuation == '(':
+            stack.append([])
+        elif punctuation == ')':
+            inner = stack.pop()
+            stack[-1].append(inner)
+        elif punctuation == ',':
+            continue
+        elif word:
+            stack[-1].append(None if word == '$' else word)
+        else:
+            stack[-1].append(quoted.replace("''", "'"))
+    return stack[0]
+
+
+def parse_header(data):
+    """FILE_DESCRIPTION, FILE_NAME and FILE_SCHEMA fields from a STEP file"""
+    match = _HEADER.search(data)
+    if not match:
+        return {}
+    entities = {name.decode('ascii'): _parse_params(params.decode('latin-1'))
+                for name, params in _HEADER_ENTITY.findall(match.group(1))}
+
+    header = {}
+    description = entities.get('FILE_DESCRIPTION')
+    if description and len(description) >= 2:
+        header['description'] = description[0]
+        header['implementation_level'] = description[1]
+    file_name = entities.get('FILE_NAME')
+    if file_name and len(file_name) >= 7:
+        keys = ['name', 'timestamp', 'author', 'organization',
+                'preprocessor', 'originating_system', 'authorization']
+        header.update(zip(keys, file_name))
+    schema = entities.get('FILE_SCHEMA')
+    if schema and schema[0]:
+        header['schema'] = schema[0]
+    return header
+
+
+def _length_unit(data):
+    converted = [name.decode('latin-1').lower() for name in _CONVERTED_UNIT.findall(data)]
+    for name in ('inch', 'foot'):
+        if name in converted:
+            return name
+    for prefix, unit in _SI_UNIT.findall(data):
+        if unit == b'METRE':
+            prefix = prefix.strip(b'.').decode('ascii') if prefix.startswith(b'.') else None
+            return _SI_PREFIXES.get(prefix, prefix)
+    return None
+
+
+def _point_bounds(data):
+    """Bounds of the 3D CARTESIAN_POINTs (placements and control points)
+
+    Not the exact geometric bounding box - curved faces can bulge past
+    their control points - but close, and free to compute.
+    """
+    low = high = None
+    for coordinates in _POINT.findall(data):
+        values = coordinates.split(b',')
+        if len(values) != 3:
+            continue
+        point = [float(value) for value in values]
+        if low is None:
+            low, high = point, list(point)
+        else:
+            low = [min(a, b) for a, b in zip(low, point)]
+            high = [max(a, b) for a, b in zip(high, point)]
+    if low is None:
+        return None
+    return {'min': low, 'max': high, 'size': [b - a for a, b in zip(low, high)]}
+
+
+def scan_bytes(data):
+    """Scan a STEP file's contents (bytes or an mmap); returns a metadata dict"""
+    header = parse_header(data)
+    start = _DATA.search(data)
+    census = Counter()
+    complex_count = 0
+    if start:
+        for complex_open, name in _INSTANCE.findall(data, start.end()):
+            census[name.decode('ascii')] += 1
+            complex_count += bool(complex_open)
+
+    return {
+        'header': header,
+        'products': [name.decode('latin-1').replace("''", "'")
+                     for name in _PRODUCT.findall(data)],
+        'length_unit': _length_unit(data),
+        'entity_count': sum(census.values()),
+        'complex_entities': complex_count,
+        'entity_types': dict(census.most_common()),
+        'bounds': _point_bounds(data),
+    }
+
+
+def scan_step_file(path):
+    """Scan one STEP file through a read-only memory map"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return scan_bytes(b'')
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return scan_bytes(data)
+
+
+class StepMetadataScanner:
+    """Scan STEP files, reusing results for files that haven't changed"""
+
+    def __init__(self, cache_path=None):
+        self.cache_path = cache_path
+        self.entries = {}
+        self.dirty = False
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path) as f:
+                    cached = json.load(f)
+                if cached.get('version') == SCAN_VERSION:
+                    self.entries = cached['files']
+            except (OSError, ValueError, KeyError):
+                self.entries = {}
+
+    def scan(self, path):
+        """Metadata for one file, from the cache when size and mtime match"""
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        entry = self.entries.get(key)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['metadata']
+
+        metadata = scan_step_file(path)
+        metadata['size'] = stat.st_size
+        self.entries[key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                             'metadata': metadata}
+        self.dirty = True
+        return metadata
+
+    def scan_all(self, paths):
+        """{path: metadata} for many files; saves the cache afterwards"""
+        results = {path: self.scan(path) for path in paths}
+        self.save()
+        return results
+
+    def save(self):
+        if not (self.cache_path and self.dirty):
+            return
+        # Forget files that no longer exist
+        self.entries = {key: entry for key, entry in self.entries.items()
+                        if os.path.exists(key)}
+        os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+        temporary = f'{self.cache_path}.{os.getpid()}.tmp'
+        with open(temporary, 'w') as f:
+            json.dump({'version': SCAN_VERSION, 'files': self.entries}, f)
+        os.replace(temporary, self.cache_path)
+        self.dirty = False
+
+
+def default_cache_path(step_dir):
+    """Where a directory's scan results are kept (next to the BREP sidecars)"""
+    return os.path.join(step_dir, CACHE_DIR_NAME, CACHE_FILE)
+
+
+def summarize(metadata):
+    """One-line description of a scanned file"""
+    parts = [f"{metadata['size'] / 1024:.0f} KB",
+             f"{metadata['entity_count']} entities"]
+    schema = metadata['header'].get('schema')
+    if schema:
+        parts.append(schema[0].split()[0])
+    if metadata['length_unit']:
+        parts.append(metadata['length_unit'])
+    bounds = metadata['bounds']
+    if bounds:
+        parts.append(' x '.join(f"{size:.0f}" for size in bounds['size']))
+    if metadata['products']:
+        parts.append(f"product '{metadata['products'][0]}'")
+    return ', '.join(parts)
@@ -0,0 +1,27 @@
+"""Shape fingerprints must not change when a part is exported"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'hardware', 'cad'))
+
+from dolly_tactile_parts import TactileDesignParts  # noqa: E402
+from export_manifest import shape_fingerprint  # noqa: E402
+from multi_format_export import DollyExporter  # noqa: E402
+
+
+def test_fingerprint_survives_export(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    parts = TactileDesignParts()
+    part = parts.create_tactile_base_plate()
+    before = shape_fingerprint(part)
+
+    exporter = DollyExporter(manifest_path='hardware/manifest.json')
+    exporter.export_all_formats(part, 'tactile_base_plate', ['stl', 'meshstore'])
+    exporter.write_manifest()
+    assert shape_fingerprint(part) == before
+
+    # Exporting the same object again skips every output
+    exporter.skipped = []
+    paths = exporter.export_all_formats(part, 'tactile_base_plate', ['stl', 'meshstore'])
+    assert paths and sorted(exporter.skipped) == sorted(paths)
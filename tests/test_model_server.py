@@ -0,0 +1,169 @@
+"""The model server's handling of ranges, ETags and WebSocket frames"""
+
+import asyncio
+import os
+import struct
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'hardware', 'cad'))
+
+import model_server  # noqa: E402
+from model_server import (ModelServer, parse_range, read_websocket_frame,  # noqa: E402
+                          websocket_frame)
+
+DATA = bytes(range(100))
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('bytes=-10', (90, 99)),            # suffix: the last 10 bytes
+    ('bytes=-500', (0, 99)),            # suffix longer than the file
+    ('bytes=90-', (90, 99)),            # open-ended
+    ('bytes=10-19', (10, 19)),
+    ('bytes=95-500', (95, 99)),         # end past EOF is clamped
+    ('bytes=5-3', None),                # reversed: invalid, so ignored
+    ('bytes=100-', 'unsatisfiable'),    # starts past EOF
+    ('bytes=200-300', 'unsatisfiable'),
+    ('bytes=-0', 'unsatisfiable'),
+    ('bytes=0-1,5-6', None),            # multiple ranges: whole file
+    ('bytes=a-b', None),
+    ('bytes=--5', None),
+    ('items=0-5', None),
+])
+def test_parse_range(header, expected):
+    assert parse_range(header, len(DATA)) == expected
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    hardware = tmp_path / 'hardware'
+    (hardware / 'glb').mkdir(parents=True)
+    (hardware / 'glb' / 'part.glb').write_bytes(DATA)
+    monkeypatch.setattr(model_server, 'INDEX_ROOT', str(hardware))
+    return ModelServer(mounts={'/hardware/': str(hardware)},
+                       cache_dir=str(tmp_path / 'cache'), log=False)
+
+
+def exchange(server, talk):
+    """Run talk(reader, writer) against the server on a free port"""
+    async def run():
+        listener = await asyncio.start_server(server.handle, '127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            try:
+                return await asyncio.wait_for(talk(reader, writer), 10)
+            finally:
+                writer.close()
+    return asyncio.run(run())
+
+
+def get(server, path, **headers):
+    """(status, headers, body) of one request"""
+    async def talk(reader, writer):
+        lines = [f'GET {path} HTTP/1.1', 'Host: localhost', 'Connection: close']
+        lines += [f'{name.replace("_", "-")}: {value}' for name, value in headers.items()]
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        await writer.drain()
+        return await reader.read()
+
+    response = exchange(server, talk)
+    head, _, body = response.partition(b'\r\n\r\n')
+    status_line, *header_lines = head.decode('latin-1').split('\r\n')
+    fields = {name.lower(): value.strip() for name, _, value in
+              (line.partition(':') for line in header_lines)}
+    return int(status_line.split()[1]), fields, body
+
+
+def test_range_requests(server):
+    status, headers, body = get(server, '/hardware/glb/part.glb', Range='bytes=-10')
+    assert status == 206 and body == DATA[-10:]
+    assert headers['content-range'] == 'bytes 90-99/100'
+
+    status, _, body = get(server, '/hardware/glb/part.glb', Range='bytes=90-')
+    assert status == 206 and body == DATA[90:]
+
+    status, _, body = get(server, '/hardware/glb/part.glb', Range='bytes=5-3')
+    assert status == 200 and body == DATA
+
+    status, headers, _ = get(server, '/hardware/glb/part.glb', Range='bytes=100-')
+    assert status == 416 and headers['content-range'] == 'bytes */100'
+
+
+def test_matching_etag_is_not_modified(server):
+    status, headers, body = get(server, '/hardware/glb/part.glb')
+    assert status == 200 and body == DATA
+    status, _, body = get(server, '/hardware/glb/part.glb', If_None_Match=headers['etag'])
+    assert status == 304 and body == b''
+    status, _, _ = get(server, '/hardware/glb/part.glb', If_None_Match='"something-else"')
+    assert status == 200
+
+
+def test_bodies_are_refused_before_being_read(server):
+    async def talk(reader, writer):
+        writer.write(b'POST /hardware/glb/part.glb HTTP/1.1\r\nContent-Length: 100000\r\n\r\n')
+        await writer.drain()
+        return await reader.read()
+
+    assert exchange(server, talk).startswith(b'HTTP/1.1 405 ')
+
+
+def client_frame(payload, opcode=0x1, mask=b'\x12\x34\x56\x78'):
+    """A masked client frame (short payloads only)"""
+    masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return struct.pack('>BB', 0x80 | opcode, 0x80 | len(payload)) + mask + masked
+
+
+def read_server_frame(data):
+    """(opcode, payload) of an unmasked server frame"""
+    length = data[1] & 0x7F
+    offset = 2
+    if length == 126:
+        length, offset = struct.unpack('>H', data[2:4])[0], 4
+    return data[0] & 0x0F, data[offset:offset + length]
+
+
+def test_websocket_frames_round_trip():
+    async def parse(frame):
+        reader = asyncio.StreamReader()
+        reader.feed_data(frame)
+        return await read_websocket_frame(reader)
+
+    assert asyncio.run(parse(client_frame('héllo'.encode()))) == (0x1, 'héllo'.encode())
+    message = b'x' * 300
+    assert read_server_frame(websocket_frame(message)) == (0x1, message)
+
+
+async def upgrade(reader, writer):
+    writer.write(b'GET /api/live HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\n'
+                 b'Connection: Upgrade\r\nSec-WebSocket-Key: dGhlIHNhbXBsZSBub25jZQ==\r\n\r\n')
+    await writer.drain()
+    return await reader.readuntil(b'\r\n\r\n')
+
+
+def test_live_socket_pings_and_broadcasts(server):
+    async def talk(reader, writer):
+        handshake = await upgrade(reader, writer)
+        writer.write(client_frame(b'are you there', opcode=0x9))
+        await writer.drain()
+        pong = await reader.readexactly(2 + len(b'are you there'))
+        await server.broadcast({'built': ['part']})
+        frame = await reader.read(200)
+        return handshake, pong, frame
+
+    handshake, pong, frame = exchange(server, talk)
+    assert handshake.startswith(b'HTTP/1.1 101 ')
+    assert b's3pPLMBiTxaQ9kYGzzhZRbK+xOo=' in handshake
+    assert read_server_frame(pong) == (0xA, b'are you there')
+    assert read_server_frame(frame) == (0x1, b'{"built": ["part"]}')
+
+
+def test_unmasked_client_frame_closes_with_1002(server):
+    async def talk(reader, writer):
+        await upgrade(reader, writer)
+        writer.write(struct.pack('>BB', 0x81, 2) + b'hi')
+        await writer.drain()
+        return await reader.read()
+
+    assert read_server_frame(exchange(server, talk)) == (0x8, struct.pack('>H', 1002))
@@ -0,0 +1,36 @@
+"""Exporting the same part twice must give byte-identical STEP and STL files"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'hardware', 'cad'))
+
+from dolly_tactile_parts import TactileDesignParts  # noqa: E402
+from multi_format_export import DollyExporter  # noqa: E402
+
+NAME = 'tactile_base_plate'
+
+
+def export(directory, monkeypatch):
+    """{format: bytes} of a fresh part exported under directory"""
+    directory.mkdir()
+    monkeypatch.chdir(directory)
+    part = TactileDesignParts().create_tactile_base_plate()
+    DollyExporter().export_all_formats(part, NAME, ['step', 'stl'])
+    return {fmt: (directory / 'hardware' / fmt / f'{NAME}.{fmt}').read_bytes()
+            for fmt in ('step', 'stl')}
+
+
+def test_exports_are_byte_identical(tmp_path, monkeypatch):
+    monkeypatch.setenv('SOURCE_DATE_EPOCH', '1700000000')
+    first = export(tmp_path / 'first', monkeypatch)
+    second = export(tmp_path / 'second', monkeypatch)
+    assert first == second
+    assert b"'2023-11-14T22:13:20'" in first['step']
+
+    # Another epoch changes the STEP header's timestamp and nothing else
+    monkeypatch.setenv('SOURCE_DATE_EPOCH', '0')
+    third = export(tmp_path / 'third', monkeypatch)
+    assert third['stl'] == first['stl']
+    assert third['step'] != first['step']
+    assert third['step'].replace(b"'1970-01-01T00:00:00'", b"'2023-11-14T22:13:20'") == first['step']
@@ -0,0 +1,66 @@
+"""The NumPy STL writer must produce the binary layout CadQuery's exporter does"""
+
+import os
+import sys
+
+import cadquery as cq
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'hardware', 'cad'))
+
+from stl_writer import STL_FACET_DTYPE, iter_stl, write_stl  # noqa: E402
+from tessellation import tessellate  # noqa: E402
+
+TOLERANCE, ANGULAR = 0.01, 0.2
+
+
+def read_binary_stl(path):
+    """(header, triangle count, facet records) of a binary STL file"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    count = int(np.frombuffer(data[80:84], '<u4')[0])
+    assert len(data) == 84 + count * STL_FACET_DTYPE.itemsize
+    return data[:80], count, np.frombuffer(data[84:], STL_FACET_DTYPE)
+
+
+def by_triangle(records):
+    """{corners, starting at the lowest: normal} of the facets"""
+    facets = {}
+    for corners, normal in zip(records['vertices'], records['normal']):
+        rows = [tuple(corner) for corner in corners]
+        first = rows.index(min(rows))
+        facets[tuple(rows[first:] + rows[:first])] = normal
+    return facets
+
+
+def test_matches_cadquery_exporter(tmp_path):
+    part = (cq.Workplane('XY').box(20, 10, 5)
+            .faces('>Z').workplane().hole(4)
+            .edges('|Z').fillet(1))
+    vertices, triangles = tessellate(part, TOLERANCE, ANGULAR)
+
+    ours = tmp_path / 'ours.stl'
+    assert write_stl(str(ours), vertices, triangles, name='test') == len(triangles)
+    # cq meshes with the same BRepMesh settings, so it writes the same triangles
+    theirs = tmp_path / 'cadquery.stl'
+    cq.exporters.export(part, str(theirs), tolerance=TOLERANCE, angularTolerance=ANGULAR)
+
+    header, count, records = read_binary_stl(ours)
+    _, expected_count, expected = read_binary_stl(theirs)
+    assert header.startswith(b'Dolly Robot STL - test')
+    assert count == expected_count == len(triangles)
+    assert not records['attribute'].any()
+
+    np.testing.assert_array_equal(records['vertices'],
+                                  vertices[triangles].astype(np.float32))
+    facets, expected_facets = by_triangle(records), by_triangle(expected)
+    assert facets.keys() == expected_facets.keys()
+    for corners, normal in facets.items():
+        np.testing.assert_allclose(normal, expected_facets[corners], atol=1e-5)
+
+
+def test_streamed_bytes_match_file(tmp_path):
+    vertices, triangles = tessellate(cq.Workplane('XY').sphere(10), 0.1, 0.3)
+    path = tmp_path / 'sphere.stl'
+    write_stl(str(path), vertices, triangles, chunk_size=100)
+    assert b''.join(iter_stl(vertices, triangles, chunk_size=64)) == path.read_bytes()
@@ -6,9 +6,18 @@ Helps users view the generated STEP files using various methods
 
 import os
 import subprocess
+import sys
+import threading
 import webbrowser
 from pathlib import Path
 
+from step_metadata import StepMetadataScanner, default_cache_path, summarize
+
+# The shared part file index lives with the CAD tools
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "hardware", "cad"))
+from file_index import find_files
+import model_server
+
 class StepFileViewer:
     def __init__(self):
         self.step_dir = Path("hardware/step")
@@ -41,14 +50,24 @@ class StepFileViewer:
         }
     
     def find_step_files(self):
-        """Find all STEP files in the project"""
-        step_files = []
-        if self.step_dir.exists():
-            for file in self.step_dir.rglob("*.step"):
-                step_files.append(file)
-            for file in self.step_dir.rglob("*.STEP"):
-                step_files.append(file)
-        return step_files
+        """Find all STEP files in the project (from the shared file index)"""
+        if not self.step_dir.exists():
+            return []
+        return [Path(path) for path in find_files(str(self.step_dir), (".step", ".stp"))]
+    
+    def describe_step_files(self, step_files=None):
+        """Header and entity-count metadata for each STEP file, without loading geometry"""
+        if step_files is None:
+            step_files = self.find_step_files()
+        scanner = StepMetadataScanner(default_cache_path(self.step_dir))
+        return scanner.scan_all(step_files)
+    
+    def list_step_files(self):
+        """Print every STEP file with its metadata"""
+        metadata = self.describe_step_files()
+        for file, info in metadata.items():
+            print(f"  {file.name}: {summarize(info)}")
+        return metadata
     
     def open_with_freecad(self, filepath):
         """Try to open file with FreeCAD"""
@@ -70,6 +89,14 @@ class StepFileViewer:
             print(f"Note: {viewer.get('note', '')}")
             webbrowser.open(viewer['url'])
     
+    def serve_locally(self, port=model_server.DEFAULT_PORT):
+        """Serve the docs and exported models from this machine and open the 3D viewer page"""
+        url = f"http://{model_server.DEFAULT_HOST}:{port}/docs/interactive/3d-viewer.html"
+        print("\nStarting local model server (Ctrl+C to stop)...")
+        # Open the browser once the server has had a moment to start
+        threading.Timer(1.0, webbrowser.open, [url]).start()
+        model_server.serve(port=port)
+    
     def create_viewer_html(self):
         """Create an HTML page with all viewing options"""
         html = """<!DOCTYPE html>
@@ -384,9 +411,10 @@ python dolly_heavy_parts.py</code></pre>
             print("  python dolly_heavy_parts.py")
             return
         
+        metadata = self.describe_step_files(step_files)
         print(f"\n✅ Found {len(step_files)} STEP files:")
         for i, file in enumerate(step_files, 1):
-            print(f"  {i}. {file.name}")
+            print(f"  {i}. {file.name} ({summarize(metadata[file])})")
         
         print("\n📋 Viewing Options:")
         print("  1. Open with FreeCAD (if installed)")
@@ -394,10 +422,11 @@ python dolly_heavy_parts.py</code></pre>
         print("  3. ShareCAD (online)")
         print("  4. 3DViewer.net (online)")
         print("  5. Create viewer guide HTML")
+        print("  6. Serve models locally (offline)")
         print("  0. Exit")
         
         while True:
-            choice = input("\nSelect option (0-5): ")
+            choice = input("\nSelect option (0-6): ")
             
             if choice == "0":
                 break
@@ -419,7 +448,12 @@ python dolly_heavy_parts.py</code></pre>
                 self.create_viewer_html()
                 print("Opening viewer guide...")
                 webbrowser.open("file://" + os.path.abspath("docs/step-viewer-guide.html"))
+            elif choice == "6":
+                self.serve_locally()
 
 if __name__ == "__main__":
     viewer = StepFileViewer()
-    viewer.interactive_menu()
+    if "--list" in sys.argv:
+        viewer.list_step_files()
+    else:
+        viewer.interactive_menu()